@@ -0,0 +1,119 @@
+"""benchmark comparison module
+
+Usage: python -m benchmarks.compare before.json after.json
+"""
+
+import argparse
+import json
+
+from typing import Any, Dict
+
+def load(path: str) -> Dict[str, Any]:
+    """Load a results file
+
+    Args:
+        path (str): The file path
+
+    Returns:
+        Dict[str, Any]: The results
+    """
+
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def format_value(result: Dict[str, Any] | None, key: str) -> str:
+    """Format a measure of a case
+
+    Args:
+        result (Dict[str, Any] | None): The case result
+        key (str): The measure, `seconds` or `peak_memory`
+
+    Returns:
+        str: The measure, the error or "-" if it is missing
+    """
+
+    if result is None:
+        return "-"
+
+    if "error" in result:
+        return result["error"]
+
+    if result.get(key) is None:
+        return "-"
+
+    if key == "seconds":
+        return f"{result[key]:.6f}"
+
+    return str(result[key])
+
+def ratio(before: Dict[str, Any] | None, after: Dict[str, Any] | None, key: str) -> str:
+    """Return the after / before ratio of a measure
+
+    Args:
+        before (Dict[str, Any] | None): The case result before
+        after (Dict[str, Any] | None): The case result after
+        key (str): The measure
+
+    Returns:
+        str: The ratio, below 1 is an improvement, "-" if it cannot be computed
+    """
+
+    if not before or not after or not before.get(key) or after.get(key) is None:
+        return "-"
+
+    return f"{after[key] / before[key]:.2f}x"
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> str:
+    """Return a table of the cases measures before and after
+
+    Args:
+        before (Dict[str, Any]): The results before
+        after (Dict[str, Any]): The results after
+
+    Returns:
+        str: The table
+    """
+
+    names = list(before["results"])
+    names += [name for name in after["results"] if name not in before["results"]]
+
+    rows = [["case", "before (s)", "after (s)", "time", "memory"]]
+
+    for name in names:
+        old = before["results"].get(name)
+        new = after["results"].get(name)
+
+        rows.append([
+            name,
+            format_value(old, "seconds"),
+            format_value(new, "seconds"),
+            ratio(old, new, "seconds"),
+            ratio(old, new, "peak_memory"),
+        ])
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths))
+        )
+        for row in rows
+    )
+
+def main():
+    """Command line entry point
+    """
+
+    parser = argparse.ArgumentParser(description="Compare two bnfparser benchmark results")
+    parser.add_argument("before", help="results JSON file of the reference commit")
+    parser.add_argument("after", help="results JSON file of the compared commit")
+
+    args = parser.parse_args()
+    before, after = load(args.before), load(args.after)
+
+    print(f"{before.get('commit')} -> {after.get('commit')}")
+    print(compare(before, after))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""benchmark corpus module"""
+
+import random
+
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from bnfparser import Engine
+
+# Generates input records of about `size` bytes in total from a seeded generator
+InputGenerator = Callable[[int, random.Random], List[str]]
+
+@dataclass(frozen=True)
+class Corpus:
+    """A benchmarked grammar, its inputs generator and the engines able to parse it
+    """
+
+    name: str
+    grammar: str
+    generate: InputGenerator
+    engines: Tuple[Engine, ...]
+    # Largest parsed input, in bytes
+    max_size: int | None = None
+    # The random generator terminates, the recursive alternatives are not the most likely
+    generated: bool = True
+
+LIST = '''
+<list> ::= "[" <elements> "]"
+<elements> ::= (<element> | <element> "," <elements>)
+<element> ::= <number> | <string> | <list>
+<number> ::= <digit> | <digit> <number>
+<string> ::= """ <characters> """
+<characters> ::= <character> | <character> <characters>
+<character> ::= <letter> | <digit> | <symbol>
+<letter> ::= "a" | "b" | "c" | "z" | "A" | "B" | "C" | "Z"
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+<symbol> ::= "!" | "@" | "#" | "$" | "%" | "^" | "&" | "*" | "(" | ")" | "-" | "_" | "=" | "+"
+'''
+
+ARITHMETIC = '''
+<expr> ::= <expr> "+" <term> | <expr> "-" <term> | <term>
+<term> ::= <term> "*" <factor> | <term> "/" <factor> | <factor>
+<factor> ::= <number> | "(" <expr> ")"
+<number> ::= <digit> | <number> <digit>
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+'''
+
+JSON = '''
+<json> ::= <value>
+<value> ::= <object> | <array> | <string> | <number> | "true" | "false" | "null"
+<object> ::= "{" "}" | "{" <members> "}"
+<members> ::= <member> | <members> "," <member>
+<member> ::= <string> ":" <value>
+<array> ::= "[" "]" | "[" <values> "]"
+<values> ::= <value> | <values> "," <value>
+<string> ::= """ """ | """ <characters> """
+<characters> ::= <character> | <characters> <character>
+<character> ::= "a" | "b" | "c" | "d" | "e" | "x" | "y" | "z" | "_"
+<number> ::= <digits> | "-" <digits>
+<digits> ::= <digit> | <digits> <digit>
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+'''
+
+SENTENCE = '''
+<sentence> ::= <noun-phrase> <space> <verb-phrase>
+<noun-phrase> ::= <article> <space> <adjective> <space> <noun> | <article> <space> <noun> | <noun>
+<verb-phrase> ::= <verb> <space> <noun-phrase> | <verb>
+<article> ::= "the" | "a"
+<adjective> ::= "quick" | "lazy" | "happy" | "sad"
+<noun> ::= "fox" | "dog" | "cat" | "mouse"
+<verb> ::= "jumps" | "runs" | "sleeps" | "eats"
+<space> ::= " "
+'''
+
+# Rules of the synthetic grammar
+SYNTHETIC_RULES = 10_000
+
+def synthetic_grammar(rules: int=SYNTHETIC_RULES) -> str:
+    """Return a grammar with a rule by keyword, a sequence of keywords matches
+
+    Args:
+        rules (int, optional): The number of keyword rules. Defaults to SYNTHETIC_RULES.
+
+    Returns:
+        str: The grammar
+    """
+
+    keywords = " | ".join(f"<k{i}>" for i in range(rules))
+    lines = [
+        "<program> ::= <keyword> | <program> <keyword>",
+        f"<keyword> ::= {keywords}",
+    ]
+    lines += [f'<k{i}> ::= "k{i};"' for i in range(rules)]
+
+    return "\n".join(lines) + "\n"
+
+def generate_list(size: int, rng: random.Random) -> List[str]:
+    """Return a list of numbers, strings and small nested lists
+
+    Args:
+        size (int): The input size
+        rng (random.Random): The random generator
+
+    Returns:
+        List[str]: A single record
+    """
+
+    elements = []
+    length = 2
+
+    while length < size or not elements:
+        kind = rng.random()
+
+        if kind < 0.4:
+            element = str(rng.randint(0, 99999))
+        elif kind < 0.8:
+            element = '"' + "".join(rng.choices("abczABCZ019!@#-_=+", k=rng.randint(1, 8))) + '"'
+        else:
+            element = "[" + ",".join(str(rng.randint(0, 99)) for _ in range(rng.randint(1, 4))) + "]"
+
+        elements.append(element)
+        length += len(element) + 1
+
+    return ["[" + ",".join(elements) + "]"]
+
+def generate_arithmetic(size: int, rng: random.Random) -> List[str]:
+    """Return an arithmetic expression with some parenthesized terms
+
+    Args:
+        size (int): The input size
+        rng (random.Random): The random generator
+
+    Returns:
+        List[str]: A single record
+    """
+
+    parts = [str(rng.randint(0, 999))]
+    length = len(parts[0])
+
+    while length < size:
+        if rng.random() < 0.2:
+            operand = f"({rng.randint(0, 99)}+{rng.randint(0, 99)})"
+        else:
+            operand = str(rng.randint(0, 999))
+
+        part = rng.choice("+-*/") + operand
+        parts.append(part)
+        length += len(part)
+
+    return ["".join(parts)]
+
+def generate_json(size: int, rng: random.Random) -> List[str]:
+    """Return an array of small objects
+
+    Args:
+        size (int): The input size
+        rng (random.Random): The random generator
+
+    Returns:
+        List[str]: A single record
+    """
+
+    def string() -> str:
+        return '"' + "".join(rng.choices("abcdexyz_", k=rng.randint(0, 8))) + '"'
+
+    values = []
+    length = 2
+
+    while length < size or not values:
+        members = [
+            f'{string()}:{rng.randint(-999, 999)}',
+            f'{string()}:{string()}',
+            f'{string()}:[{rng.choice(("true", "false", "null"))},{rng.randint(0, 9)}]',
+        ]
+        value = "{" + ",".join(members[:rng.randint(0, 3)]) + "}"
+
+        values.append(value)
+        length += len(value) + 1
+
+    return ["[" + ",".join(values) + "]"]
+
+def generate_sentences(size: int, rng: random.Random) -> List[str]:
+    """Return sentences, one record by sentence
+
+    Args:
+        size (int): The input size
+        rng (random.Random): The random generator
+
+    Returns:
+        List[str]: The records
+    """
+
+    def noun_phrase() -> str:
+        noun = rng.choice(("fox", "dog", "cat", "mouse"))
+        kind = rng.randint(0, 2)
+
+        if kind == 0:
+            return noun
+
+        article = rng.choice(("the", "a"))
+
+        if kind == 1:
+            return f"{article} {noun}"
+
+        return f"{article} {rng.choice(('quick', 'lazy', 'happy', 'sad'))} {noun}"
+
+    records = []
+    length = 0
+
+    while length < size or not records:
+        verb = rng.choice(("jumps", "runs", "sleeps", "eats"))
+        verb_phrase = verb if rng.random() < 0.3 else f"{verb} {noun_phrase()}"
+        sentence = f"{noun_phrase()} {verb_phrase}"
+
+        records.append(sentence)
+        length += len(sentence)
+
+    return records
+
+def generate_keywords(size: int, rng: random.Random) -> List[str]:
+    """Return a sequence of keywords of the synthetic grammar
+
+    Args:
+        size (int): The input size
+        rng (random.Random): The random generator
+
+    Returns:
+        List[str]: A single record
+    """
+
+    keywords = []
+    length = 0
+
+    while length < size or not keywords:
+        keyword = f"k{rng.randrange(SYNTHETIC_RULES)};"
+        keywords.append(keyword)
+        length += len(keyword)
+
+    return ["".join(keywords)]
+
+CORPUS = (
+    Corpus(
+        "list",
+        LIST,
+        generate_list,
+        (Engine.BACKTRACKING, Engine.EARLEY, Engine.LALR, Engine.COMPILED, Engine.VM)
+    ),
+    Corpus(
+        "arithmetic",
+        ARITHMETIC,
+        generate_arithmetic,
+        (Engine.BACKTRACKING, Engine.EARLEY, Engine.LALR),
+        generated=False
+    ),
+    Corpus(
+        "json",
+        JSON,
+        generate_json,
+        (Engine.BACKTRACKING, Engine.EARLEY, Engine.LALR),
+        generated=False
+    ),
+    Corpus(
+        "sentence",
+        SENTENCE,
+        generate_sentences,
+        (Engine.BACKTRACKING, Engine.EARLEY, Engine.LALR, Engine.COMPILED, Engine.VM)
+    ),
+    Corpus(
+        "synthetic",
+        synthetic_grammar(),
+        generate_keywords,
+        # Every keyword alternative is tried, so the inputs stay small
+        (Engine.BACKTRACKING, Engine.EARLEY, Engine.LALR),
+        1_000
+    ),
+)
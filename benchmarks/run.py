@@ -0,0 +1,225 @@
+"""benchmark runner module
+
+Usage: python -m benchmarks.run [-o results.json] [--max-size BYTES] [--filter TEXT]
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tracemalloc
+
+from datetime import datetime, timezone
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from bnfparser import core, Engine
+from bnfparser.lexer import Lexer
+from bnfparser.parser import Parser
+from bnfparser.resolver import Resolver
+from bnfparser.generator import Generator
+
+from benchmarks.corpus import CORPUS, Corpus
+
+# Input sizes in bytes, from 10 B to 10 MB
+SIZES = (10, 1_000, 100_000, 10_000_000)
+
+# A run longer than this is not repeated, in seconds
+LONG_RUN = 1.0
+
+# Random strings generated by case
+GENERATED = 100
+
+# Results file format version
+VERSION = 1
+
+# Benchmark case, (name, function, input size in bytes)
+Case = Tuple[str, Callable[[], Any], int]
+
+def measure(function: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, Any]:
+    """Time a function, then measure its peak memory in another run
+
+    Args:
+        function (Callable[[], Any]): The benchmarked function
+        repeat (int): The maximum number of timed runs
+        memory (bool): Measure the peak memory with `tracemalloc`
+
+    Returns:
+        Dict[str, Any]: The result
+    """
+
+    times = []
+
+    try:
+        while len(times) < repeat and sum(times) < LONG_RUN:
+            start = perf_counter()
+            function()
+            times.append(perf_counter() - start)
+
+        peak = None
+
+        if memory:
+            tracemalloc.start()
+
+            try:
+                function()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    except (RecursionError, MemoryError, core.CoreError) as e:
+        return {"error": type(e).__name__}
+
+    return {
+        "seconds": min(times),
+        "median": median(times),
+        "runs": len(times),
+        "peak_memory": peak,
+    }
+
+def grammar_cases(corpus: Corpus) -> Iterator[Case]:
+    """Return the grammar pipeline cases, every step is measured alone
+
+    Args:
+        corpus (Corpus): The grammar
+
+    Yields:
+        Case: A case
+    """
+
+    size = len(corpus.grammar)
+    tokens = Lexer(corpus.grammar).scan()
+    expressions = Parser(tokens).parse()
+    environment = Resolver().resolve(expressions)
+    bnf = core.parse(corpus.grammar)
+
+    def generate():
+        random.seed(0)
+        generator = Generator(environment)
+
+        for _ in range(GENERATED):
+            generator.generate(expressions[0])
+
+    yield f"lex/{corpus.name}", lambda: Lexer(corpus.grammar).scan(), size
+    yield f"parse/{corpus.name}", lambda: Parser(tokens).parse(), size
+    yield f"resolve/{corpus.name}", lambda: Resolver().resolve(expressions), size
+    yield f"build/{corpus.name}", lambda: core.parse(corpus.grammar, cache=False), size
+    yield f"build_cached/{corpus.name}", lambda: core.parse(corpus.grammar), size
+
+    if corpus.generated:
+        yield f"generate/{corpus.name}", generate, size
+
+    # The compiled forms are built once, like with `Bnf`
+    yield f"compile/{corpus.name}", bnf.compile, size
+
+def input_cases(corpus: Corpus, max_size: int) -> Iterator[Case]:
+    """Return the input parsing cases, by engine and input size
+
+    Args:
+        corpus (Corpus): The grammar
+        max_size (int): The largest input size
+
+    Yields:
+        Case: A case
+    """
+
+    bnf = core.parse(corpus.grammar)
+
+    for size in SIZES:
+        if size > max_size or (corpus.max_size is not None and size > corpus.max_size):
+            break
+
+        records = corpus.generate(size, random.Random(size))
+        total = sum(len(record) for record in records)
+
+        for engine in corpus.engines:
+            def parse(engine: Engine=engine, records: List[str]=records):
+                for record in records:
+                    if bnf.parse_input(record, engine=engine) is None:
+                        raise core.CoreError("The generated input does not match")
+
+            yield f"parse_input/{corpus.name}/{engine.value}/{size}", parse, total
+
+def git_commit() -> str | None:
+    """Return the current commit of the repository
+
+    Returns:
+        str | None: The commit hash, None outside of a repository
+    """
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(max_size: int, repeat: int, memory: bool, selection: str) -> Dict[str, Any]:
+    """Run every selected case
+
+    Args:
+        max_size (int): The largest input size
+        repeat (int): The maximum number of timed runs by case
+        memory (bool): Measure the peak memory
+        selection (str): Only run the cases whose name contains it
+
+    Returns:
+        Dict[str, Any]: The results with the environment description
+    """
+
+    results = {}
+
+    for corpus in CORPUS:
+        cases = list(grammar_cases(corpus)) + list(input_cases(corpus, max_size))
+
+        for name, function, size in cases:
+            if selection not in name:
+                continue
+
+            result = measure(function, repeat, memory)
+            result["bytes"] = size
+            results[name] = result
+
+            if "error" in result:
+                print(f"{name:<45} {result['error']}", file=sys.stderr)
+            else:
+                print(f"{name:<45} {result['seconds']:>12.6f} s", file=sys.stderr)
+
+    return {
+        "version": VERSION,
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def main():
+    """Command line entry point
+    """
+
+    parser = argparse.ArgumentParser(description="Run the bnfparser benchmarks")
+    parser.add_argument("-o", "--output", default="benchmarks.json", help="results JSON file")
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=100_000,
+        help="largest parsed input in bytes, up to 10000000"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="maximum timed runs by case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--filter", default="", help="only run the cases containing it")
+
+    args = parser.parse_args()
+    results = run(args.max_size, args.repeat, not args.no_memory, args.filter)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
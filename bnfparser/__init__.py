@@ -1,14 +1,26 @@
 """__init__ module"""
 
-from .core import parse
+from .core import parse, grammar_cache
+from .input.engine import Engine
+from .input.budget import Budget
+from .input.profile import Profile
+from .input.events import EventHandler
+from .input.diagnostic import ParseFailure
 from .error import LexerError, ParserError, \
-    VisitorError, CoreError, BaseError
+    VisitorError, CoreError, ParseAbortedError, BaseError
 
 __all__ = [
     "parse",
+    "grammar_cache",
+    "Engine",
+    "Budget",
+    "Profile",
+    "EventHandler",
+    "ParseFailure",
     "LexerError",
     "ParserError",
     "VisitorError",
     "CoreError",
+    "ParseAbortedError",
     "BaseError",
 ]
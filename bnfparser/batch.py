@@ -0,0 +1,153 @@
+"""batch module"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, List, TypeVar, Generic
+
+from .input.input import Source
+
+T = TypeVar("T")
+
+# Inputs sent to a worker process at once
+CHUNK_SIZE = 64
+
+# Chunks queued by worker process, it bounds the memory used by the pending results
+CHUNKS_BY_WORKER = 2
+
+# Grammar and options of a worker process, sent once by the pool initializer
+_worker: Dict[str, Any] = {}
+
+class Batch(Generic[T]):
+    """Lazy iterator over the results of many inputs, it measures the time
+    spent on them to report the throughput
+    """
+
+    def __init__(self, results: Iterator[T]):
+        self.__results = results
+
+        self.records = 0
+        # Seconds spent producing the results, without the consumer time
+        self.elapsed = 0.0
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        start = perf_counter()
+
+        try:
+            ret = next(self.__results)
+        finally:
+            self.elapsed += perf_counter() - start
+
+        self.records += 1
+
+        return ret
+
+    @property
+    def throughput(self) -> float:
+        """Return the number of inputs handled per second
+
+        Returns:
+            float: The records per second, 0 before the first one
+        """
+
+        if self.elapsed == 0:
+            return 0.0
+
+        return self.records / self.elapsed
+
+def _init_worker(bnf: Any, memoize: bool, engine: Any):
+    """Store the grammar of the worker process
+
+    Args:
+        bnf (Bnf): The grammar
+        memoize (bool): Same as `Bnf.parse_input`
+        engine (Engine): Same as `Bnf.parse_input`
+    """
+
+    _worker["bnf"] = bnf
+    _worker["memoize"] = memoize
+    _worker["engine"] = engine
+
+def _parse_chunk(input_sources: List[Source]) -> List[Any]:
+    """Parse a chunk of inputs in a worker process
+
+    Args:
+        input_sources (List[Source]): The input sources
+
+    Returns:
+        List[InputTree | None]: The trees, without their packrat cache
+    """
+
+    trees = list(_worker["bnf"].parse_many(input_sources, _worker["memoize"], _worker["engine"]))
+
+    # The cache is only useful to reparse in the worker process
+    for tree in trees:
+        if tree is not None:
+            tree.memo = None
+
+    return trees
+
+def parse_parallel(
+    bnf: Any,
+    input_sources: Iterable[Source],
+    options: tuple,
+    workers: int,
+    ordered: bool
+) -> Iterator[Any]:
+    """Parse inputs by chunks over a pool of worker processes,
+    the grammar is pickled once by worker
+
+    Args:
+        bnf (Bnf): The grammar
+        input_sources (Iterable[Source]): The input sources
+        options (tuple): The memoize and engine options of `Bnf.parse_input`
+        workers (int): The number of worker processes
+        ordered (bool): Yield the trees in the input order, otherwise
+            as soon as their chunk is parsed
+
+    Yields:
+        InputTree | None: A tree, None if it doesnt match
+    """
+
+    sources = iter(input_sources)
+    chunks = iter(lambda: list(islice(sources, CHUNK_SIZE)), [])
+
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(bnf, *options))
+    pending: deque[Future] = deque()
+
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(_parse_chunk, chunk))
+
+            # Backpressure, the inputs are not read faster than they are parsed
+            while len(pending) >= workers * CHUNKS_BY_WORKER:
+                yield from _pop_done(pending, ordered)
+
+        while pending:
+            yield from _pop_done(pending, ordered)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+def _pop_done(pending: "deque[Future]", ordered: bool) -> List[Any]:
+    """Wait for a pending chunk then remove it
+
+    Args:
+        pending (deque[Future]): The pending chunks, in the input order
+        ordered (bool): Wait for the first chunk, otherwise for any chunk
+
+    Returns:
+        List[InputTree | None]: The chunk trees
+    """
+
+    if ordered:
+        return pending.popleft().result()
+
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    future = next(iter(done))
+    pending.remove(future)
+
+    return future.result()
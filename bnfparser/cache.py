@@ -0,0 +1,150 @@
+"""cache module"""
+
+import hashlib
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from .core import Bnf
+
+# Default number of cached grammars
+MAXSIZE = 128
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a `GrammarCache`"""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+def _check_maxsize(maxsize: int):
+    """Check a cache maximum size
+
+    Args:
+        maxsize (int): The maximum size
+
+    Raises:
+        ValueError: The maximum size is negative
+    """
+
+    if maxsize < 0:
+        raise ValueError(f"maxsize must be positive or 0, not {maxsize}")
+
+class GrammarCache:
+    """Thread safe LRU cache of the parsed grammars, keyed by the SHA-256
+    of their source. The least recently used grammar is evicted first.
+    """
+
+    def __init__(self, maxsize: int=MAXSIZE):
+        _check_maxsize(maxsize)
+
+        self.__lock = threading.Lock()
+        self.__entries: OrderedDict[bytes, "Bnf"] = OrderedDict()
+        self.__maxsize = maxsize
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    @property
+    def maxsize(self) -> int:
+        """Return the maximum number of cached grammars
+
+        Returns:
+            int: The maximum size, 0 if the cache is disabled
+        """
+
+        return self.__maxsize
+
+    def resize(self, maxsize: int):
+        """Change the maximum number of cached grammars, the least
+        recently used ones are evicted if needed
+
+        Args:
+            maxsize (int): The maximum size, 0 disables the cache
+
+        Raises:
+            ValueError: The maximum size is negative
+        """
+
+        _check_maxsize(maxsize)
+
+        with self.__lock:
+            self.__maxsize = maxsize
+            self.__evict()
+
+    def __evict(self):
+        """Remove the least recently used grammars above the maximum size,
+        the lock must be held
+        """
+
+        while len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+            self.__evictions += 1
+
+    def get(self, source: str, build: Callable[[str], "Bnf"]) -> "Bnf":
+        """Return the cached grammar of a source, it is built then cached
+        on a miss. The build runs without the lock, so concurrent misses
+        on the same source may build it twice.
+
+        Args:
+            source (str): The grammar source
+            build (Callable[[str], Bnf]): Build a grammar from its source
+
+        Returns:
+            Bnf: The grammar, shared by every caller
+        """
+
+        key = hashlib.sha256(source.encode()).digest()
+
+        with self.__lock:
+            bnf = self.__entries.get(key)
+
+            if bnf is not None:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+
+                return bnf
+
+            self.__misses += 1
+
+        bnf = build(source)
+
+        with self.__lock:
+            if self.__maxsize > 0:
+                self.__entries[key] = bnf
+                self.__entries.move_to_end(key)
+                self.__evict()
+
+        return bnf
+
+    def clear(self):
+        """Remove every grammar and reset the counters
+        """
+
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return the cache counters
+
+        Returns:
+            CacheStats: The counters
+        """
+
+        with self.__lock:
+            return CacheStats(
+                self.__hits,
+                self.__misses,
+                self.__evictions,
+                len(self.__entries),
+                self.__maxsize
+            )
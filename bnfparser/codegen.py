@@ -0,0 +1,312 @@
+"""codegen module"""
+
+import re
+
+from types import ModuleType
+from typing import List, Any, Dict, Tuple, Set
+
+from .expression import Visitor, Terminal, NonTerminal, \
+    Variable, Or, Assignment, Group, Expression
+from .resolver import Environment
+from .grammar import GrammarBuilder
+
+from .input.tree import InputTree
+from .input.node import InputNode, Nodekind
+
+INDENT_SEQUENCE = 4 * " "
+
+# Node built by a generated parser, a terminal value or (rule name, childrens)
+GeneratedNode = str | Tuple[str, List["GeneratedNode"]]
+
+HEADER = '''"""Generated by bnfparser, do not edit"""
+
+from bnfparser.codegen import build_tree
+
+START = {start!r}
+'''
+
+FOOTER = '''
+RULES = {{
+{rules}
+}}
+
+def match_length(source, start=START):
+    """Return the matched prefix size, -1 if it doesnt match"""
+
+    return RULES[start](source, 0, [], {{}})
+
+def parse(source, start=START):
+    """Return an InputTree, None if it doesnt match"""
+
+    childrens = []
+
+    if RULES[start](source, 0, childrens, {{}}) != len(source):
+        return None
+
+    return build_tree(childrens)
+'''
+
+def build_tree(childrens: List[GeneratedNode]) -> InputTree:
+    """Convert the nodes built by a generated parser into an `InputTree`
+
+    Args:
+        childrens (List[GeneratedNode]): The root childrens
+
+    Returns:
+        InputTree: The tree
+    """
+
+    tree = InputTree()
+    stack = [(tree.root, iter(childrens))]
+
+    while stack:
+        parent, nodes = stack[-1]
+        node = next(nodes, None)
+
+        if node is None:
+            stack.pop()
+            continue
+
+        if isinstance(node, str):
+            parent.childrens.append(InputNode(Nodekind.VALUE, node, parent))
+            continue
+
+        name, grandchildrens = node
+        child = InputNode(Nodekind.VARIABLE, name, parent)
+        parent.childrens.append(child)
+
+        stack.append((child, iter(grandchildrens)))
+
+    return tree
+
+def indent(lines: List[str]) -> List[str]:
+    """Indent code lines once
+
+    Args:
+        lines (List[str]): Code lines
+
+    Returns:
+        List[str]: Indented code lines
+    """
+
+    return [INDENT_SEQUENCE + line for line in lines]
+
+class CodeGenerator(Visitor):
+    """`Visitor` implementation that writes a Python module with one function
+    per rule. It has the same semantic as `InputParser`: an `Or` keeps its
+    longest alternative. But a left recursive rule called again at the same
+    position fails, its result is not grown, so `Bnf` rejects the left
+    recursive grammars with this engine.
+
+    Every function takes the source, the position, the list receiving the
+    built nodes and a dict used for the left recursion and the packrat cache.
+    It returns the new position, -1 if it doesnt match.
+    """
+
+    def __init__(self, memoize: bool=False):
+        self.__memoize = memoize
+
+        self.__functions: Dict[str, str] = {}
+        self.__left_recursive: Set[str] = set()
+        self.__rule_ids: Dict[str, int] = {}
+
+        # Name of the list receiving the nodes
+        self.__list = ""
+        self.__counter = 0
+
+    def __function_name(self, name: str) -> str:
+        """Return a unique Python function name for a rule
+
+        Args:
+            name (str): The rule name
+
+        Returns:
+            str: The function name
+        """
+
+        if name in self.__functions:
+            return self.__functions[name]
+
+        function = "rule_" + re.sub(r"\W", "_", name.strip("<>"))
+
+        while function in self.__functions.values():
+            function += "_"
+
+        self.__functions[name] = function
+
+        return function
+
+    def visit_terminal_expression(self, expression: Terminal) -> Any:
+        value = expression.value
+
+        if value == "":
+            return [f"{self.__list}.append('')"]
+
+        return [
+            f"if s.startswith({value!r}, p):",
+            f"    {self.__list}.append({value!r})",
+            f"    p += {len(value)}",
+            "else:",
+            "    p = -1",
+        ]
+
+    def visit_nonterminal_expression(self, expression: NonTerminal) -> Any:
+        lines = []
+
+        for e in expression.expressions:
+            # Inlined terminal, it leaves the sequence as soon as it fails
+            if isinstance(e, Terminal) and e.value != "":
+                lines += [
+                    f"if not s.startswith({e.value!r}, p):",
+                    "    p = -1",
+                    "    break",
+                    f"{self.__list}.append({e.value!r})",
+                    f"p += {len(e.value)}",
+                ]
+                continue
+
+            lines += self.__generate_expression(e)
+            lines += ["if p < 0:", "    break"]
+
+        # The sequence is a loop only to be left with `break`
+        return ["while True:"] + indent(lines + ["break"])
+
+    def visit_variable_expression(self, expression: Variable) -> Any:
+        function = self.__function_name(expression.name.lexeme)
+
+        return [f"p = {function}(s, p, {self.__list}, m)"]
+
+    def visit_or_expression(self, expression: Or) -> Any:
+        self.__counter += 1
+        n = self.__counter
+
+        parent_list = self.__list
+        self.__list = f"alt{n}"
+
+        lines = [f"start{n} = p", f"best{n} = -1", f"best_list{n} = None"]
+
+        for i, value in enumerate(expression.values):
+            if i > 0:
+                lines.append(f"p = start{n}")
+
+            lines.append(f"alt{n} = []")
+            lines += self.__generate_expression(value)
+            lines += [
+                f"if p > best{n}:",
+                f"    best{n} = p",
+                f"    best_list{n} = alt{n}",
+            ]
+
+        self.__list = parent_list
+
+        return lines + [
+            f"if best{n} >= 0:",
+            f"    {parent_list}.extend(best_list{n})",
+            f"    p = best{n}",
+            "else:",
+            "    p = -1",
+        ]
+
+    def visit_assignment_expression(self, expression: Assignment) -> Any:
+        name = expression.name.lexeme
+        key = f"({self.__rule_ids[name]}, p)"
+
+        self.__list = "childrens"
+        self.__counter = 0
+
+        body = ["childrens = []"]
+        body += self.__generate_expression(expression.expression)
+
+        if self.__memoize:
+            guard = [
+                f"k = {key}",
+                "if k in m:",
+                "    r = m[k]",
+                "    if r is None:",
+                "        return -1",
+                "    c.append(r[1])",
+                "    return r[0]",
+                "m[k] = None",
+            ]
+            body += [
+                "if p >= 0:",
+                f"    n = ({name!r}, childrens)",
+                "    c.append(n)",
+                "    m[k] = (p, n)",
+            ]
+        elif name in self.__left_recursive:
+            guard = [f"k = {key}", "if k in m:", "    return -1", "m[k] = None"]
+            body += ["del m[k]", "if p >= 0:", f"    c.append(({name!r}, childrens))"]
+        else:
+            guard = []
+            body += ["if p >= 0:", f"    c.append(({name!r}, childrens))"]
+
+        return [
+            f"def {self.__function_name(name)}(s, p, c, m):",
+            f"    \"\"\"{name}\"\"\"",
+            "",
+        ] + indent(guard + body + ["return p"])
+
+    def visit_group_statement(self, expression: Group) -> Any:
+        return self.__generate_expression(expression.expression)
+
+    def __generate_expression(self, expression: Expression) -> List[str]:
+        """Generate the code of the given `expression` with the right `Visitor` method
+
+        Args:
+            expression (Expression): An expression
+
+        Returns:
+            List[str]: Code lines
+        """
+
+        return expression.accept(self)
+
+    def generate(self, environment: Environment, start: str) -> str:
+        """Generate the Python module source
+
+        Args:
+            environment (Environment): Variables environment
+            start (str): Default start rule name
+
+        Returns:
+            str: The Python module source
+        """
+
+        grammar = GrammarBuilder().build(environment)
+
+        self.__functions = {}
+        self.__left_recursive = {
+            grammar.names[rule] for rule in grammar.left_recursive()
+        }
+        self.__rule_ids = {name.lexeme: i for i, name in enumerate(environment)}
+
+        lines = [HEADER.format(start=start)]
+
+        for name, expression in environment.items():
+            lines += [""] + self.__generate_expression(Assignment(name, expression))
+
+        rules = [
+            f"    {name!r}: {self.__function_name(name)},"
+            for name in self.__rule_ids
+        ]
+
+        lines.append(FOOTER.format(rules="\n".join(rules)))
+
+        return "\n".join(lines)
+
+def load(source: str, name: str="bnfparser_generated") -> ModuleType:
+    """Load a generated Python module source
+
+    Args:
+        source (str): The module source
+        name (str, optional): The module name. Defaults to "bnfparser_generated".
+
+    Returns:
+        ModuleType: The module
+    """
+
+    module = ModuleType(name)
+    exec(compile(source, "<" + name + ">", "exec"), module.__dict__) # pylint: disable=exec-used
+
+    return module
@@ -1,22 +1,53 @@
 """core module"""
 
-from typing import List
+# pylint: disable=too-many-lines
+
+from copy import copy
+from functools import partial
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Dict, Iterable, Tuple
 
 from .expression import Expression
 from .token import Token, TokenKind
 from .lexer import Lexer
 from .parser import Parser
 from .resolver import Resolver, Environment
+from .grammar import Grammar, GrammarBuilder, Conflict
+from .dispatch import DispatchBuilder
 from .error import CoreError
 from .expression import Variable
 
 from .generator import Generator
 from .printer import Printer
+from .codegen import CodeGenerator, load
+from .vm import ProgramCompiler, Program, VirtualMachine
+from .cache import GrammarCache
 
 from .input.tree import InputTree
+from .input.input import Input, Source
+from .input.memo import Memo
+from .input.budget import Budget
+from .input.profile import Profile
+from .input.events import EventHandler
+from .input.compact import CompactTree
 from .input.input_parser import InputParser
+from .input.earley import EarleyParser
+from .input.forest import Forest
+from .input.diagnostic import ParseFailure
+from .input.ll1 import LL1Table, LL1Parser
+from .input.lalr import LALRTable, LALRParser
+from .input.stream import PushParser
+from .input.engine import Engine
+
+# asyncio and concurrent.futures are only imported by the methods using them
+if TYPE_CHECKING:
+    import asyncio
+
+    from concurrent.futures import Executor
+
+    from .batch import Batch
 
-class Bnf:
+class Bnf: # pylint: disable=too-many-public-methods,too-many-instance-attributes
     """BNF controller
     """
 
@@ -24,10 +55,51 @@ class Bnf:
         self.__expressions = expressions
         self.__environment = environment
         self.__start = None
+        self.__grammar = None
+        # LL(1) parse table from the start rule
+        self.__ll1_table = None
+        # Compiled modules, keyed by the memoize option
+        self.__compiled: Dict[bool, ModuleType] = {}
+        # Members built on demand, shared with the copies: the parse tables
+        # by start rule, the parsing machine program, the UTF-8 terminals
+        self.__built: Dict[Any, Any] = {}
+        # Rules counters of the backtracking engine, disabled if None
+        self.__profile = None
+
+        # `Or` alternatives indexed by their first characters
+        self.__dispatch = DispatchBuilder(self.grammar).build(environment)
+
+        # Rules parsed by seed growing with the backtracking engine
+        self.__left_recursive = {
+            self.grammar.names[rule] for rule in self.grammar.left_recursive()
+        }
 
         # Default start expression (variable)
         self.set_start()
 
+    def __copy__(self) -> "Bnf":
+        # Every member is shared until the copy replaces it,
+        # like its start rule or its profile
+        ret = Bnf.__new__(Bnf)
+        ret.__dict__.update(self.__dict__)
+
+        return ret
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+
+        # The compiled modules cannot be pickled, they are compiled again on demand
+        state["_Bnf__compiled"] = {}
+
+        # Keyed by the `Or` ids, it is rebuilt for the unpickled expressions
+        del state["_Bnf__dispatch"]
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.__dispatch = DispatchBuilder(self.grammar).build(self.__environment)
+
     @property
     def expressions(self) -> List[Expression]:
         """Returne the BNF AST
@@ -38,6 +110,19 @@ class Bnf:
 
         return self.__expressions
 
+    @property
+    def grammar(self) -> Grammar:
+        """Return the flattened grammar, built on the first access
+
+        Returns:
+            Grammar: The flattened grammar
+        """
+
+        if self.__grammar is None:
+            self.__grammar = GrammarBuilder().build(self.__environment)
+
+        return self.__grammar
+
     def set_start(self, start: str="") -> "Bnf":
         """Setter for `self.__start`
 
@@ -62,8 +147,96 @@ class Bnf:
 
             self.__start = Variable(token_start)
 
+        # Detecting if the grammar is LL(1) from the start rule
+        key = ("ll1", self.__start.name.lexeme)
+
+        if key not in self.__built:
+            self.__built[key] = LL1Table(
+                self.grammar,
+                self.grammar.rules[self.__start.name.lexeme]
+            )
+
+        self.__ll1_table = self.__built[key]
+
+        return self
+
+    @property
+    def profile(self) -> Profile | None:
+        """Return the rules counters of the backtracking engine parses
+
+        Returns:
+            Profile | None: The counters, None if the profiling is disabled
+        """
+
+        return self.__profile
+
+    def set_profile(self, profile: Profile | None=None) -> "Bnf":
+        """Enable the rules profiling of the backtracking engine parses, the
+        counters are accumulated in `profile` (`report` and `table`). The
+        other engines are not profiled, `Engine.AUTO` always picks the
+        backtracking one while profiling. Without profile, there is no overhead.
+
+        Args:
+            profile (Profile | None, optional): The counters, it disables the
+                profiling if None. Defaults to None.
+
+        Returns:
+            self: Bnf
+        """
+
+        self.__profile = profile
+
         return self
 
+    @property
+    def ll1_conflicts(self) -> List[Conflict]:
+        """Return the LL(1) parse table conflicts from the start rule,
+        the grammar is LL(1) if there is none
+
+        Returns:
+            List[Conflict]: The conflicts
+        """
+
+        if self.__ll1_table is None:
+            return []
+
+        return self.__ll1_table.conflicts
+
+    @property
+    def lalr_table(self) -> LALRTable | None:
+        """Return the LALR(1) automaton from the start rule, built on the first access
+
+        Returns:
+            LALRTable | None: The automaton, None for an empty grammar
+        """
+
+        if self.__start is None:
+            return None
+
+        key = ("lalr", self.__start.name.lexeme)
+
+        if key not in self.__built:
+            self.__built[key] = LALRTable(
+                self.grammar,
+                self.grammar.rules[self.__start.name.lexeme]
+            )
+
+        return self.__built[key]
+
+    @property
+    def lalr_conflicts(self) -> List[Conflict]:
+        """Return the LALR(1) automaton conflicts from the start rule,
+        the grammar is LALR(1) if there is none
+
+        Returns:
+            List[Conflict]: The conflicts
+        """
+
+        if self.lalr_table is None:
+            return []
+
+        return self.lalr_table.conflicts
+
     def generate(self) -> str:
         """Generates a random expression
 
@@ -80,21 +253,723 @@ class Bnf:
 
         return Printer().print(self.__expressions)
 
-    def parse_input(self, input_source: str) -> InputTree | None:
+    def codegen(self, memoize: bool=False) -> str:
+        """Generate a Python module parsing inputs of this grammar, with one
+        function per rule. It can be saved then imported.
+
+        Args:
+            memoize (bool, optional): Generates a packrat parser. Defaults to False.
+
+        Raises:
+            CoreError: Empty grammar
+
+        Returns:
+            str: The Python module source
+        """
+
+        if self.__start is None:
+            raise CoreError("Cannot generate the code of an empty grammar")
+
+        return CodeGenerator(memoize)\
+            .generate(self.__environment, self.__start.name.lexeme)
+
+    def compile(self, memoize: bool=False) -> ModuleType:
+        """Generate then load a Python module parsing inputs of this grammar.
+        Its `parse(source)` function returns an `InputTree` or None.
+
+        Args:
+            memoize (bool, optional): Generates a packrat parser. Defaults to False.
+
+        Returns:
+            ModuleType: The module
+        """
+
+        return load(self.codegen(memoize))
+
+    @property
+    def program(self) -> Program:
+        """Return the parsing machine program, compiled on the first access.
+        It can be pickled and shared between processes.
+
+        Returns:
+            Program: The program
+        """
+
+        if "program" not in self.__built:
+            self.__built["program"] = ProgramCompiler().compile(self.__environment)
+
+        return self.__built["program"]
+
+    def __module(self, memoize: bool) -> ModuleType:
+        """Return the compiled module, compiled on the first call
+
+        Args:
+            memoize (bool): Is the packrat mode requested
+
+        Returns:
+            ModuleType: The module
+        """
+
+        if memoize not in self.__compiled:
+            self.__compiled[memoize] = self.compile(memoize)
+
+        return self.__compiled[memoize]
+
+    def __input(self, input_source: Source) -> Input:
+        """Wrap an input source, the terminals are encoded once for the
+        binary sources
+
+        Args:
+            input_source (Source): The input source
+
+        Returns:
+            Input: The input
+        """
+
+        if isinstance(input_source, str):
+            return Input(input_source)
+
+        if "terminals" not in self.__built:
+            self.__built["terminals"] = {
+                s: s.encode()
+                for p in self.grammar.productions for s in p.rhs
+                if isinstance(s, str)
+            }
+
+        return Input(input_source, self.__built["terminals"])
+
+    def __engine(
+        self,
+        engine: Engine,
+        memoize: bool,
+        input_source: Source,
+        budget: Budget | None=None
+    ) -> Engine:
+        """Resolve the automatic engine then check the options
+
+        Args:
+            engine (Engine): The requested engine
+            memoize (bool): Is the packrat mode requested
+            input_source (Source): The input source
+            budget (Budget | None, optional): The parse limits. Defaults to None.
+
+        Raises:
+            CoreError: Invalid options for the engine
+
+        Returns:
+            Engine: The engine to use
+        """
+
+        is_text = isinstance(input_source, str)
+
+        if engine == Engine.AUTO:
+            # Only the backtracking engine is profiled
+            if (
+                not memoize
+                and budget is None
+                and self.__profile is None
+                and is_text
+                and self.__ll1_table.is_ll1
+            ):
+                return Engine.LL1
+
+            return Engine.BACKTRACKING
+
+        if budget is not None and engine != Engine.BACKTRACKING:
+            raise CoreError("budget is only available with the backtracking engine")
+
+        if not is_text and engine != Engine.BACKTRACKING:
+            raise CoreError("Binary inputs are only available with the backtracking engine")
+
+        if memoize and not engine in (Engine.BACKTRACKING, Engine.COMPILED):
+            raise CoreError(
+                "memoize is only available with the backtracking and compiled engines"
+            )
+
+        if engine == Engine.LL1 and not self.__ll1_table.is_ll1:
+            raise CoreError(
+                "The grammar is not LL(1)\n"
+                + "\n".join(map(str, self.__ll1_table.conflicts))
+            )
+
+        if engine == Engine.LALR and not self.lalr_table.is_lalr:
+            raise CoreError(
+                "The grammar is not LALR(1)\n"
+                + "\n".join(map(str, self.lalr_table.conflicts))
+            )
+
+        if engine in (Engine.COMPILED, Engine.VM) and self.__left_recursive:
+            raise CoreError(
+                "The grammar is left recursive: "
+                + ", ".join(sorted(self.__left_recursive))
+            )
+
+        return engine
+
+    def parse_input(
+        self,
+        input_source: Source,
+        memoize: bool=False,
+        engine: Engine=Engine.AUTO,
+        budget: Budget | None=None
+    ) -> InputTree | None:
         """Parse an input source that is supposed to be built on `self.__expressions`
 
         Args:
-            input_source (str): Input source
+            input_source (Source): Input source, a binary one is UTF-8 encoded
+            memoize (bool, optional): Cache every rule result by input
+                position (packrat parsing), only for the backtracking and
+                compiled engines. Defaults to False.
+            engine (Engine, optional): The parsing engine, `Engine.AUTO` uses
+                the LL(1) engine if the grammar is LL(1), otherwise the backtracking
+                one. Defaults to Engine.AUTO.
+            budget (Budget | None, optional): The steps, time and cancellation
+                limits, only for the backtracking engine (the `Engine.AUTO` one).
+                Defaults to None.
+
+        Raises:
+            CoreError: Invalid options for the engine
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            InputTree | None: None if it doesnt match, otherwise, a tree is returned
+        """
+
+        return self.__parse(input_source, memoize, engine, budget)[0]
+
+    def parse_result(
+        self,
+        input_source: Source,
+        memoize: bool=False,
+        engine: Engine=Engine.AUTO,
+        budget: Budget | None=None
+    ) -> InputTree | ParseFailure:
+        """Same as `parse_input`, but a failure is described instead of
+        returning None. The furthest failure position and the terminals
+        expected there are tracked during the parse, the input is never
+        parsed again.
+
+        Args:
+            input_source (Source): Input source, a binary one is UTF-8 encoded
+            memoize (bool, optional): Same as `parse_input`. Defaults to False.
+            engine (Engine, optional): The backtracking or LL(1) engine, `Engine.AUTO`
+                picks one like `parse_input`. Defaults to Engine.AUTO.
+            budget (Budget | None, optional): Same as `parse_input`. Defaults to None.
+
+        Raises:
+            CoreError: Invalid options for the engine
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            InputTree | ParseFailure: The tree, otherwise, a falsy failure
+                with its line and column
+        """
+
+        if engine not in (Engine.AUTO, Engine.BACKTRACKING, Engine.LL1):
+            raise CoreError("Failures are only described by the backtracking and LL(1) engines")
+
+        tree, parser = self.__parse(input_source, memoize, engine, budget)
+
+        if tree is not None:
+            return tree
+
+        if parser is None:
+            return ParseFailure.at(input_source, 0, [])
+
+        return ParseFailure.at(input_source, *parser.failure)
+
+    def __parse(
+        self,
+        input_source: Source,
+        memoize: bool,
+        engine: Engine,
+        budget: Budget | None
+    ) -> Tuple[InputTree | None, Any]:
+        """Parse an input source with the engine parser
+
+        Args:
+            input_source (Source): Input source
+            memoize (bool): Same as `parse_input`
+            engine (Engine): Same as `parse_input`
+            budget (Budget | None): Same as `parse_input`
+
+        Returns:
+            Tuple[InputTree | None, Any]: The tree and the parser, None for the
+                compiled engine or without start rule
+        """
+
+        if self.__start is None:
+            return None, None
+
+        match self.__engine(engine, memoize, input_source, budget):
+            case Engine.BACKTRACKING:
+                parser = InputParser(
+                    self.__input(input_source),
+                    self.__environment,
+                    memoize,
+                    self.__dispatch,
+                    left_recursive=self.__left_recursive
+                )
+            case Engine.EARLEY:
+                parser = EarleyParser(input_source, self.grammar)
+            case Engine.LL1:
+                parser = LL1Parser(input_source, self.__ll1_table)
+            case Engine.LALR:
+                parser = LALRParser(input_source, self.lalr_table)
+            case Engine.VM:
+                parser = VirtualMachine(input_source, self.program)
+            case _:
+                parser = None
+
+        if parser is None:
+            tree = self.__module(memoize).parse(input_source, self.__start.name.lexeme)
+        elif isinstance(parser, InputParser):
+            tree = parser.parse_input(self.__start, budget, self.__profile)
+        else:
+            tree = parser.parse_input(self.__start)
+
+        # Every node knows its input span
+        if tree is not None:
+            tree.set_source(input_source)
+
+            # The packrat cache allows to reparse the edited tree
+            if isinstance(parser, InputParser):
+                tree.memo = parser.memo
+
+        return tree, parser
+
+    def reparse(self, tree: InputTree, input_source: Source) -> InputTree | None:
+        """Parse an edited input source, reusing the rules results of the tree
+        that did not examine the edited ranges. The edits must have been
+        recorded with `InputTree.edit`. The tree nodes can be shared with the
+        returned tree, so it should not be used anymore.
+
+        Only the trees parsed with the backtracking engine in packrat mode
+        (or reparsed) have these results, the other ones are fully parsed again.
+
+        Args:
+            tree (InputTree): The tree of the previous input
+            input_source (Source): The edited input source
 
         Returns:
             InputTree | None: None if it doesnt match, otherwise, a tree is returned
         """
 
-        return InputParser(input_source, self.__environment)\
-            .parse_input(self.__start)
+        if tree.memo is None or self.__start is None:
+            return self.parse_input(input_source, True, Engine.BACKTRACKING)
+
+        parser = InputParser(
+            self.__input(input_source),
+            self.__environment,
+            Memo(tree.memo, tree.edits),
+            self.__dispatch,
+            left_recursive=self.__left_recursive
+        )
+        new_tree = parser.parse_input(self.__start, None, self.__profile)
+
+        if new_tree is not None:
+            new_tree.set_source(input_source)
+            new_tree.memo = parser.memo
+
+        return new_tree
+
+    def parse_compact(self, input_source: str) -> CompactTree | None:
+        """Parse an input source with the parsing machine into a `CompactTree`,
+        a few flat arrays instead of one object per node. It can be converted
+        with `to_input_tree`.
+
+        Args:
+            input_source (str): Input source
+
+        Raises:
+            CoreError: Invalid options for the engine
+
+        Returns:
+            CompactTree | None: None if it doesnt match, otherwise, a tree is returned
+        """
+
+        if self.__start is None:
+            return None
+
+        self.__engine(Engine.VM, False, input_source)
+
+        return VirtualMachine(input_source, self.program).parse_compact(self.__start)
+
+    def parse_forest(self, input_source: str) -> Forest | None:
+        """Parse an input source with the Earley engine into every parse,
+        for the ambiguous grammars. The trees are shared in a packed forest,
+        they can be counted or built lazily one at a time.
+
+        Args:
+            input_source (str): Input source
+
+        Raises:
+            CoreError: Invalid options for the engine
+
+        Returns:
+            Forest | None: None if it doesnt match, otherwise, the forest is returned
+        """
+
+        if self.__start is None:
+            return None
+
+        self.__engine(Engine.EARLEY, False, input_source)
+
+        return EarleyParser(input_source, self.grammar).parse_forest(self.__start)
+
+    def parse_events(
+        self,
+        input_source: Source,
+        handler: EventHandler,
+        engine: Engine=Engine.AUTO,
+        budget: Budget | None=None
+    ) -> bool:
+        """Parse an input source without keeping its tree, the rules and
+        terminals matches are sent to a handler, like a SAX parser. The matches
+        of the backtracked alternatives are never sent.
+
+        The LL(1) engine sends every match as soon as it is predicted, in
+        constant memory. The backtracking engine sends the matches once no
+        alternative can backtrack them anymore, the subtrees of the
+        alternatives being tried are kept until then. An `Or` whose next
+        character leaves a single alternative is not kept. But with several
+        ones, like `<list> ::= ("[" <elements> "]") | "[" "]"` or a
+        repetition ended by an empty alternative, the whole subtree is kept
+        until the `Or` ends: for a start rule, until the parse ends.
+
+        Args:
+            input_source (Source): Input source, a binary one is UTF-8 encoded
+            handler (EventHandler): Receives the matches, in the input order
+            engine (Engine, optional): The backtracking or LL(1) engine, `Engine.AUTO`
+                picks one like `parse_input`. Defaults to Engine.AUTO.
+            budget (Budget | None, optional): Same as `parse_input`. Defaults to None.
+
+        Raises:
+            CoreError: Invalid options for the engine
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            bool: Is matched, the handler may have received the events
+                of a matched prefix otherwise
+        """
+
+        if self.__start is None:
+            return False
+
+        match self.__engine(engine, False, input_source, budget):
+            case Engine.BACKTRACKING:
+                parser = InputParser(
+                    self.__input(input_source),
+                    self.__environment,
+                    dispatch=self.__dispatch,
+                    left_recursive=self.__left_recursive
+                )
+
+                return parser.parse_events(self.__start, handler, budget, self.__profile)
+            case Engine.LL1:
+                return LL1Parser(input_source, self.__ll1_table).parse_events(self.__start, handler)
+            case _:
+                raise CoreError("Events are only available with the backtracking and LL(1) engines")
+
+    def push_parser(self, rules: List[str] | None=None) -> PushParser:
+        """Create an incremental parser, the input is pushed by chunks with
+        `feed` then `close`. It uses the LALR(1) automaton, so only the
+        next terminal characters are kept in memory.
+
+        Args:
+            rules (List[str] | None, optional): The rules whose completed nodes
+                are emitted, the start rule childrens rules if None. Defaults to None.
+
+        Raises:
+            CoreError: Empty grammar, unknown rule or the grammar is not LALR(1)
+
+        Returns:
+            PushParser: The parser
+        """
+
+        if self.__start is None:
+            raise CoreError("Cannot parse with an empty grammar")
+
+        self.__engine(Engine.LALR, False, "")
+
+        grammar = self.grammar
+
+        if rules is None:
+            emitted = grammar.children(self.lalr_table.start)
+        else:
+            for name in rules:
+                if not name in grammar.rules:
+                    raise CoreError(name + " is not in this environment")
+
+            emitted = {grammar.rules[name] for name in rules}
+
+        return PushParser(self.lalr_table, emitted)
+
+    def match_length(
+        self,
+        input_source: Source,
+        memoize: bool=False,
+        engine: Engine=Engine.AUTO,
+        budget: Budget | None=None
+    ) -> int:
+        """Match an input source prefix without building any tree
+
+        Args:
+            input_source (Source): Input source, a binary one is UTF-8 encoded
+            memoize (bool, optional): Cache every rule result by input
+                position (packrat parsing), only for the backtracking and
+                compiled engines. Defaults to False.
+            engine (Engine, optional): The parsing engine, only the backtracking,
+                compiled and vm ones, `Engine.AUTO` uses the backtracking one.
+                Defaults to Engine.AUTO.
+            budget (Budget | None, optional): Same as `parse_input`. Defaults to None.
+
+        Raises:
+            CoreError: Invalid options for the engine
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            int: The matched prefix size, -1 if it doesnt match
+        """
+
+        if self.__start is None:
+            return -1
+
+        if engine == Engine.AUTO:
+            engine = Engine.BACKTRACKING
+
+        match self.__engine(engine, memoize, input_source, budget):
+            case Engine.BACKTRACKING:
+                return InputParser(
+                    self.__input(input_source),
+                    self.__environment,
+                    memoize,
+                    self.__dispatch,
+                    False,
+                    self.__left_recursive
+                ).match_length(self.__start, budget, self.__profile)
+            case Engine.COMPILED:
+                return self.__module(memoize)\
+                    .match_length(input_source, self.__start.name.lexeme)
+            case Engine.VM:
+                return VirtualMachine(input_source, self.program)\
+                    .match_length(self.__start)
+            case _:
+                raise CoreError(
+                    "match_length is only available with the backtracking, "
+                    + "compiled and vm engines"
+                )
+
+    def matches(
+        self,
+        input_source: Source,
+        memoize: bool=False,
+        engine: Engine=Engine.AUTO,
+        budget: Budget | None=None
+    ) -> bool:
+        """Return if an input source matches the grammar, it is faster than
+        `parse_input` because no tree is built
+
+        Args:
+            input_source (Source): Input source, a binary one is UTF-8 encoded
+            memoize (bool, optional): Same as `match_length`. Defaults to False.
+            engine (Engine, optional): Same as `match_length`. Defaults to Engine.AUTO.
+            budget (Budget | None, optional): Same as `parse_input`. Defaults to None.
+
+        Raises:
+            CoreError: Invalid options for the engine
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            bool: Is matched
+        """
+
+        return self.match_length(input_source, memoize, engine, budget) == len(input_source)
+
+    def parse_many(
+        self,
+        input_sources: Iterable[Source],
+        memoize: bool=False,
+        engine: Engine=Engine.AUTO,
+        workers: int=0,
+        ordered: bool=True
+    ) -> "Batch[InputTree | None]":
+        """Lazily parse many input sources, the backtracking parser and its
+        state are created once then reused for every input. The returned
+        `Batch` reports the throughput.
+
+        With workers, the inputs are parsed by chunks in a pool of processes,
+        the grammar is sent once to every process. The trees are returned
+        without their packrat cache.
+
+        Args:
+            input_sources (Iterable[Source]): The input sources
+            memoize (bool, optional): Same as `parse_input`. Defaults to False.
+            engine (Engine, optional): Same as `parse_input`. Defaults to Engine.AUTO.
+            workers (int, optional): The number of worker processes, the
+                inputs are parsed in this process if 0. Defaults to 0.
+            ordered (bool, optional): Return the trees in the input order,
+                otherwise as soon as they are parsed, only with workers.
+                Defaults to True.
+
+        Raises:
+            CoreError: Invalid options for the engine, when the input is parsed
+
+        Returns:
+            Batch[InputTree | None]: The trees, None if it doesnt match
+        """
+
+        # Imported here, with concurrent.futures
+        from .batch import Batch, parse_parallel # pylint: disable=import-outside-toplevel
+
+        if workers > 0:
+            return Batch(parse_parallel(self, input_sources, (memoize, engine), workers, ordered))
+
+        parser = None
+
+        def parse_one(input_source: Source) -> InputTree | None:
+            nonlocal parser
+
+            if self.__start is None:
+                return None
+
+            if self.__engine(engine, memoize, input_source) != Engine.BACKTRACKING:
+                return self.parse_input(input_source, memoize, engine)
+
+            if parser is None:
+                parser = InputParser(
+                    self.__input(input_source),
+                    self.__environment,
+                    memoize,
+                    self.__dispatch,
+                    left_recursive=self.__left_recursive
+                )
+            else:
+                parser.set_source(self.__input(input_source))
+
+            tree = parser.parse_input(self.__start, None, self.__profile)
+
+            if tree is not None:
+                tree.set_source(input_source)
+                tree.memo = parser.memo
+
+            return tree
+
+        return Batch(map(parse_one, input_sources))
+
+    def parse_stream(
+        self,
+        reader: "asyncio.StreamReader",
+        delimiter: bytes=b"\n",
+        engine: Engine=Engine.AUTO,
+        executor: "Executor | None"=None,
+        max_pending: int=4
+    ) -> AsyncIterator[InputTree | None]:
+        """Parse the messages of an asyncio stream, `async for tree in
+        bnf.parse_stream(reader)`. The messages are decoded from UTF-8 then
+        parsed in an executor, the stream is not read further while
+        `max_pending` messages are not consumed.
+
+        Args:
+            reader (asyncio.StreamReader): The stream
+            delimiter (bytes, optional): The message separator. Defaults to b"\n".
+            engine (Engine, optional): Same as `parse_input`. Defaults to Engine.AUTO.
+            executor (Executor | None, optional): The parsing executor, a
+                dedicated thread if None. Defaults to None.
+            max_pending (int, optional): The maximum number of messages being
+                parsed. Defaults to 4.
+
+        Raises:
+            CoreError: Invalid options for the engine, when a message is parsed
+
+        Returns:
+            AsyncIterator[InputTree | None]: The trees in the stream order,
+                None if a message doesnt match
+        """
+
+        # Imported here, with asyncio
+        from .input.aio import parse_messages # pylint: disable=import-outside-toplevel
+
+        return parse_messages(
+            partial(self.__parse_message, engine),
+            reader,
+            delimiter,
+            executor,
+            max_pending
+        )
+
+    def __parse_message(self, engine: Engine, message: bytes) -> InputTree | None:
+        """Parse a stream message
+
+        Args:
+            engine (Engine): The parsing engine
+            message (bytes): The UTF-8 encoded message
+
+        Returns:
+            InputTree | None: None if it is not valid UTF-8 or if it doesnt match
+        """
+
+        try:
+            return self.parse_input(message.decode(), engine=engine)
+        except UnicodeDecodeError:
+            return None
+
+    def match_many(
+        self,
+        input_sources: Iterable[Source],
+        memoize: bool=False,
+        engine: Engine=Engine.AUTO
+    ) -> "Batch[bool]":
+        """Lazily check if many input sources match the grammar, like `matches`,
+        the backtracking parser and its state are created once then reused
+        for every input. The returned `Batch` reports the throughput.
+
+        Args:
+            input_sources (Iterable[Source]): The input sources
+            memoize (bool, optional): Same as `match_length`. Defaults to False.
+            engine (Engine, optional): Same as `match_length`. Defaults to Engine.AUTO.
+
+        Raises:
+            CoreError: Invalid options for the engine, when the input is matched
+
+        Returns:
+            Batch[bool]: Is matched, for every input in order
+        """
+
+        # Imported here, with concurrent.futures
+        from .batch import Batch # pylint: disable=import-outside-toplevel
+
+        parser = None
+
+        def match_one(input_source: Source) -> bool:
+            nonlocal parser
 
-def parse(source: str) -> Bnf:
-    """Parse a BNF grammar expression
+            if self.__start is None or engine not in (Engine.AUTO, Engine.BACKTRACKING):
+                return self.matches(input_source, memoize, engine)
+
+            self.__engine(Engine.BACKTRACKING, memoize, input_source)
+
+            if parser is None:
+                parser = InputParser(
+                    self.__input(input_source),
+                    self.__environment,
+                    memoize,
+                    self.__dispatch,
+                    False,
+                    self.__left_recursive
+                )
+            else:
+                parser.set_source(self.__input(input_source))
+
+            return parser.match_length(self.__start, None, self.__profile) == len(input_source)
+
+        return Batch(map(match_one, input_sources))
+
+# Grammars built by `parse`, shared by every thread
+grammar_cache = GrammarCache()
+
+def _build(source: str) -> Bnf:
+    """Build a BNF grammar from its source, without cache
 
     Args:
         source (str): An expression
@@ -116,3 +991,22 @@ def parse(source: str) -> Bnf:
     environment = r.resolve(expressions)
 
     return Bnf(expressions, environment)
+
+def parse(source: str, cache: bool=True) -> Bnf:
+    """Parse a BNF grammar expression. The built grammars are kept in
+    `grammar_cache`, a cached one is returned as a copy sharing its tables
+    and compiled parsers, so changing its start rule or its profile doesnt
+    affect the other callers.
+
+    Args:
+        source (str): An expression
+        cache (bool, optional): Use the grammars cache. Defaults to True.
+
+    Returns:
+        Bnf: BNF grammar controller
+    """
+
+    if not cache:
+        return _build(source)
+
+    return copy(grammar_cache.get(source, _build))
@@ -0,0 +1,125 @@
+"""dispatch module"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
+
+from .expression import Visitor, Terminal, NonTerminal, \
+    Variable, Or, Assignment, Group, Expression
+from .resolver import Environment
+from .grammar import Grammar
+
+# First characters of an expression and if it can match the empty string
+First = Tuple[Set[str], bool]
+
+@dataclass(frozen=True)
+class OrIndex:
+    """Alternatives of an `Or` expression by next input character,
+    the nullable alternatives are in every entry
+    """
+
+    by_first: Dict[str, Tuple[Expression, ...]]
+    nullable: Tuple[Expression, ...]
+
+    def alternatives(self, character: str) -> Tuple[Expression, ...]:
+        """Return the alternatives that can match before a character,
+        in their declaration order
+
+        Args:
+            character (str): The next input character, "" at the end of the input
+
+        Returns:
+            Tuple[Expression, ...]: The alternatives
+        """
+
+        return self.by_first.get(character, self.nullable)
+
+# `Or` expression id -> its index
+Dispatch = Dict[int, OrIndex]
+
+class DispatchBuilder(Visitor):
+    """`Visitor` implementation that indexes every `Or` expression of a
+    resolved environment with the first characters of its alternatives
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.__grammar = grammar
+        self.__dispatch: Dispatch = {}
+
+    def visit_terminal_expression(self, expression: Terminal) -> Any:
+        if expression.value == "":
+            return set(), True
+
+        return {expression.value[0]}, False
+
+    def visit_nonterminal_expression(self, expression: NonTerminal) -> Any:
+        first, nullable = set(), True
+
+        # Every expression is visited to index the nested `Or` ones
+        for e in expression.expressions:
+            e_first, e_nullable = self.__build_expression(e)
+
+            if nullable:
+                first |= e_first
+                nullable = e_nullable
+
+        return first, nullable
+
+    def visit_variable_expression(self, expression: Variable) -> Any:
+        rule = self.__grammar.rules[expression.name.lexeme]
+
+        return self.__grammar.first[rule], self.__grammar.nullable[rule]
+
+    def visit_or_expression(self, expression: Or) -> Any:
+        firsts: List[First] = [self.__build_expression(v) for v in expression.values]
+
+        first = set().union(*(f for f, _ in firsts))
+        nullable = tuple(
+            v for v, (_, v_nullable) in zip(expression.values, firsts) if v_nullable
+        )
+
+        by_first = {
+            character: tuple(
+                v for v, (v_first, v_nullable) in zip(expression.values, firsts)
+                if v_nullable or character in v_first
+            )
+            for character in first
+        }
+
+        self.__dispatch[id(expression)] = OrIndex(by_first, nullable)
+
+        return first, len(nullable) > 0
+
+    def visit_assignment_expression(self, expression: Assignment) -> Any:
+        return self.__build_expression(expression.expression)
+
+    def visit_group_statement(self, expression: Group) -> Any:
+        return self.__build_expression(expression.expression)
+
+    def __build_expression(self, expression: Expression) -> First:
+        """Index the given `expression` with the right `Visitor` method
+
+        Args:
+            expression (Expression): An expression
+
+        Returns:
+            First: The expression first characters and if it is nullable
+        """
+
+        return expression.accept(self)
+
+    def build(self, environment: Environment) -> Dispatch:
+        """Index every `Or` expression of the environment
+
+        Args:
+            environment (Environment): Variables environment
+
+        Returns:
+            Dispatch: The indexes, by `Or` expression id
+        """
+
+        self.__dispatch = {}
+
+        for expression in environment.values():
+            self.__build_expression(expression)
+
+        return self.__dispatch
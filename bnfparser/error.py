@@ -86,3 +86,20 @@ class ExpressionError(BaseError):
 class CoreError(BaseError):
     """Exception for a Core
     """
+
+class ParseAbortedError(BaseError):
+    """Exception for a parse stopped by its `Budget`, it reports how far it got
+    """
+
+    def __init__(self, reason: str, steps: int, position: int):
+        self.reason = reason
+        self.steps = steps
+        self.position = position
+
+        super().__init__(
+            f"Parse aborted ({reason}) after {steps} steps, "
+            + f"the input was examined up to the position {position}"
+        )
+
+    def __reduce__(self):
+        return self.__class__, (self.reason, self.steps, self.position)
@@ -0,0 +1,426 @@
+"""grammar module"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Set, Any
+
+from .expression import Visitor, Terminal, NonTerminal, \
+    Variable, Or, Assignment, Group, Expression
+from .resolver import Environment
+
+# A grammar symbol, a rule id (int) or a terminal (str)
+Symbol = int | str
+
+# Every possible symbols sequences of an expression
+Alternatives = List[List[Symbol]]
+
+@dataclass(frozen=True)
+class Production:
+    """Represents a flattened grammar production
+    """
+
+    lhs: int
+    rhs: Tuple[Symbol, ...]
+    # The right hand side with its empty terminals, they are tree nodes
+    symbols: Tuple[Symbol, ...]
+
+@dataclass(frozen=True)
+class Conflict:
+    """Represents a parse table conflict
+    """
+
+    kind: str
+    rule: str
+    lookahead: str
+    productions: Tuple[str, ...]
+
+    def __str__(self) -> str:
+        lookahead = "end of input" if self.lookahead == "" else repr(self.lookahead)
+
+        return f"{self.kind} conflict for {self.rule} on {lookahead}: " \
+            + " / ".join(self.productions)
+
+def cycles(edges: List[Set[int]]) -> Set[int]:
+    """Return the vertices belonging to a cycle of a directed graph,
+    using an iterative Tarjan strongly connected components search
+
+    Args:
+        edges (List[Set[int]]): Successors of every vertex
+
+    Returns:
+        Set[int]: The vertices on a cycle
+    """
+
+    index, lowlink = {}, {}
+    stack, on_stack = [], set()
+    ret = set()
+
+    def visit(vertex: int):
+        index[vertex] = lowlink[vertex] = len(index)
+        stack.append(vertex)
+        on_stack.add(vertex)
+        work.append((vertex, iter(edges[vertex])))
+
+    for root in range(len(edges)):
+        if root in index:
+            continue
+
+        work = []
+        visit(root)
+
+        while work:
+            vertex, successors = work[-1]
+            successor = next(successors, None)
+
+            if not successor is None:
+                if not successor in index:
+                    visit(successor)
+                elif successor in on_stack:
+                    lowlink[vertex] = min(lowlink[vertex], index[successor])
+
+                continue
+
+            work.pop()
+
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[vertex])
+
+            if lowlink[vertex] != index[vertex]:
+                continue
+
+            # Popping a strongly connected component
+            component = []
+
+            while not component or component[-1] != vertex:
+                component.append(stack.pop())
+                on_stack.discard(component[-1])
+
+            if len(component) > 1 or vertex in edges[vertex]:
+                ret.update(component)
+
+    return ret
+
+class Grammar: # pylint: disable=too-many-instance-attributes
+    """Flattened representation of a BNF environment, used by the
+    table driven engines. Nested `Or` and `Group` expressions are lifted
+    into hidden rules, empty terminals are removed from the productions
+    but kept in their `symbols`.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.hidden: List[bool] = []
+        self.productions: List[Production] = []
+        self.by_lhs: List[List[int]] = []
+        self.rules: Dict[str, int] = {}
+
+        # Rules that can derive the empty string
+        self.nullable: List[bool] = []
+        # For every nullable rule, a production deriving the empty string
+        self.empty_productions: List[int] = []
+        # First characters of every rule
+        self.first: List[Set[str]] = []
+
+    def add_rule(self, name: str, hidden: bool=False) -> int:
+        """Register a new rule
+
+        Args:
+            name (str): The rule name
+            hidden (bool, optional): Is the rule lifted from a nested expression. Defaults to False.
+
+        Returns:
+            int: The rule id
+        """
+
+        rule = len(self.names)
+
+        self.names.append(name)
+        self.hidden.append(hidden)
+        self.by_lhs.append([])
+        self.rules[name] = rule
+
+        return rule
+
+    def add_production(self, lhs: int, rhs: List[Symbol]):
+        """Register a new production for the rule `lhs`
+
+        Args:
+            lhs (int): The rule id
+            rhs (List[Symbol]): The symbols sequence, with its empty terminals
+        """
+
+        self.by_lhs[lhs].append(len(self.productions))
+        self.productions.append(
+            Production(lhs, tuple(s for s in rhs if s != ""), tuple(rhs))
+        )
+
+    def format_production(self, production: int) -> str:
+        """Return a BNF representation of a production
+
+        Args:
+            production (int): The production index
+
+        Returns:
+            str: The production as a BNF rule
+        """
+
+        p = self.productions[production]
+
+        symbols = [
+            self.names[s] if isinstance(s, int) else '"' + s + '"'
+            for s in p.rhs
+        ]
+
+        return self.names[p.lhs] + " ::= " + (" ".join(symbols) or '""')
+
+    def sequence_first(self, symbols: Tuple[Symbol, ...]) -> Tuple[Set[str], bool]:
+        """Return the first characters of a symbols sequence
+
+        Args:
+            symbols (Tuple[Symbol, ...]): The symbols sequence
+
+        Returns:
+            Tuple[Set[str], bool]: The first characters and
+                if the sequence is nullable
+        """
+
+        first = set()
+
+        for s in symbols:
+            if isinstance(s, str):
+                first.add(s[0])
+                return first, False
+
+            first |= self.first[s]
+
+            if not self.nullable[s]:
+                return first, False
+
+        return first, True
+
+    def reachable(self, start: int) -> List[int]:
+        """Return the rules reachable from a start rule
+
+        Args:
+            start (int): The start rule id
+
+        Returns:
+            List[int]: The rules ids, the start rule first
+        """
+
+        rules = [start]
+        seen = {start}
+
+        i = 0
+        while i < len(rules):
+            for p in self.by_lhs[rules[i]]:
+                for s in self.productions[p].rhs:
+                    if isinstance(s, int) and not s in seen:
+                        seen.add(s)
+                        rules.append(s)
+
+            i += 1
+
+        return rules
+
+    def children(self, rule: int) -> Set[int]:
+        """Return the rules producing the direct childrens of a rule node,
+        the hidden rules are looked through
+
+        Args:
+            rule (int): The rule id
+
+        Returns:
+            Set[int]: The children rules ids, without the rule itself
+        """
+
+        ret = set()
+        rules, seen = [rule], {rule}
+
+        while rules:
+            for p in self.by_lhs[rules.pop()]:
+                for s in self.productions[p].rhs:
+                    if isinstance(s, str) or s in seen:
+                        continue
+
+                    if self.hidden[s]:
+                        seen.add(s)
+                        rules.append(s)
+                    else:
+                        ret.add(s)
+
+        ret.discard(rule)
+
+        return ret
+
+    def left_recursive(self) -> Set[int]:
+        """Return the left recursive rules, a rule is left recursive if it can
+        be reached again without consuming any input. They are the rules on
+        the left corner graph cycles.
+
+        Returns:
+            Set[int]: The left recursive rules ids
+        """
+
+        # Left corner graph edges
+        edges = [set() for _ in self.names]
+
+        for p in self.productions:
+            for s in p.rhs:
+                if isinstance(s, str):
+                    break
+
+                edges[p.lhs].add(s)
+
+                if not self.nullable[s]:
+                    break
+
+        return cycles(edges)
+
+    def compute_first(self):
+        """Compute the first characters of every rule with a fixpoint
+        iteration, it needs the nullable rules
+        """
+
+        self.first = [set() for _ in self.names]
+
+        changed = True
+
+        while changed:
+            changed = False
+
+            for production in self.productions:
+                first, _ = self.sequence_first(production.rhs)
+                rule_first = self.first[production.lhs]
+
+                if not first <= rule_first:
+                    rule_first |= first
+                    changed = True
+
+    def compute_nullable(self):
+        """Compute the nullable rules with a fixpoint iteration, the first
+        production that made a rule nullable is kept so an empty derivation
+        never refers to itself
+        """
+
+        self.nullable = [False] * len(self.names)
+        self.empty_productions = [-1] * len(self.names)
+
+        changed = True
+
+        while changed:
+            changed = False
+
+            for index, production in enumerate(self.productions):
+                if self.nullable[production.lhs]:
+                    continue
+
+                if all(isinstance(s, int) and self.nullable[s] for s in production.rhs):
+                    self.nullable[production.lhs] = True
+                    self.empty_productions[production.lhs] = index
+                    changed = True
+
+class GrammarBuilder(Visitor):
+    """`Visitor` implementation that flattens a resolved environment
+    into a `Grammar`
+    """
+
+    def __init__(self):
+        self.__grammar = Grammar()
+        self.__rule_name = ""
+        self.__hidden_count = 0
+
+    def __hidden_rule(self, alternatives: Alternatives) -> int:
+        """Lift alternatives into a new hidden rule
+
+        Args:
+            alternatives (Alternatives): The rule alternatives
+
+        Returns:
+            int: The hidden rule id
+        """
+
+        self.__hidden_count += 1
+
+        name = self.__rule_name + "#" + str(self.__hidden_count)
+        rule = self.__grammar.add_rule(name, True)
+
+        for alternative in alternatives:
+            self.__grammar.add_production(rule, alternative)
+
+        return rule
+
+    def visit_terminal_expression(self, expression: Terminal) -> Any:
+        return [[expression.value]]
+
+    def visit_nonterminal_expression(self, expression: NonTerminal) -> Any:
+        sequence = []
+
+        for e in expression.expressions:
+            alternatives = self.__build_expression(e)
+
+            if len(alternatives) == 1:
+                sequence.extend(alternatives[0])
+            else:
+                sequence.append(self.__hidden_rule(alternatives))
+
+        return [sequence]
+
+    def visit_variable_expression(self, expression: Variable) -> Any:
+        return [[self.__grammar.rules[expression.name.lexeme]]]
+
+    def visit_or_expression(self, expression: Or) -> Any:
+        alternatives = []
+
+        for value in expression.values:
+            alternatives.extend(self.__build_expression(value))
+
+        return alternatives
+
+    def visit_assignment_expression(self, expression: Assignment) -> Any:
+        lhs = self.__grammar.rules[expression.name.lexeme]
+
+        self.__rule_name = expression.name.lexeme
+        self.__hidden_count = 0
+
+        for alternative in self.__build_expression(expression.expression):
+            self.__grammar.add_production(lhs, alternative)
+
+    def visit_group_statement(self, expression: Group) -> Any:
+        return self.__build_expression(expression.expression)
+
+    def __build_expression(self, expression: Expression) -> Alternatives:
+        """Flatten the given `expression` with the right `Visitor` method
+
+        Args:
+            expression (Expression): An expression
+
+        Returns:
+            Alternatives: The expression alternatives
+        """
+
+        return expression.accept(self)
+
+    def build(self, environment: Environment) -> Grammar:
+        """Flatten every rule of the environment
+
+        Args:
+            environment (Environment): Variables environment
+
+        Returns:
+            Grammar: The flattened grammar
+        """
+
+        self.__grammar = Grammar()
+
+        # Every rule id must exist before visiting the expressions
+        for name in environment:
+            self.__grammar.add_rule(name.lexeme)
+
+        for name, expression in environment.items():
+            self.__build_expression(Assignment(name, expression))
+
+        self.__grammar.compute_nullable()
+        self.__grammar.compute_first()
+
+        return self.__grammar
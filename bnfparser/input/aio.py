@@ -0,0 +1,85 @@
+"""asyncio stream module"""
+
+import asyncio
+
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, List
+
+async def read_messages(reader: asyncio.StreamReader, delimiter: bytes) -> AsyncIterator[bytes]:
+    """Split a stream into messages, a message can be longer than the reader limit.
+    The unterminated data at the end of the stream is the last message.
+
+    Args:
+        reader (asyncio.StreamReader): The stream
+        delimiter (bytes): The message separator, it is not part of the messages
+
+    Yields:
+        bytes: A message
+    """
+
+    # Pieces of a message longer than the reader limit
+    parts: List[bytes] = []
+
+    while True:
+        try:
+            data = await reader.readuntil(delimiter)
+        except asyncio.IncompleteReadError as e:
+            if parts or e.partial:
+                yield b"".join(parts) + e.partial
+
+            return
+        except asyncio.LimitOverrunError as e:
+            # The consumed bytes cannot contain the delimiter start
+            parts.append(await reader.readexactly(max(e.consumed, 1)))
+            continue
+
+        yield b"".join(parts) + data[:-len(delimiter)]
+        parts = []
+
+async def parse_messages(
+    parse: Callable[[bytes], Any],
+    reader: asyncio.StreamReader,
+    delimiter: bytes,
+    executor: Executor | None,
+    max_pending: int
+) -> AsyncIterator[Any]:
+    """Parse the messages of a stream in an executor, the event loop is never
+    blocked by a parse. The stream is not read while `max_pending` messages
+    are waiting to be parsed or consumed, so the sender is slowed down by
+    the transport flow control.
+
+    Args:
+        parse (Callable[[bytes], Any]): Parse a message
+        reader (asyncio.StreamReader): The stream
+        delimiter (bytes): The message separator
+        executor (Executor | None): The executor, a thread is used if None
+        max_pending (int): The maximum number of messages being parsed
+
+    Yields:
+        InputTree | None: A tree in the stream order, None if it doesnt match
+    """
+
+    loop = asyncio.get_running_loop()
+    owned = executor is None
+
+    if owned:
+        executor = ThreadPoolExecutor(1)
+
+    pending: deque[asyncio.Future] = deque()
+
+    try:
+        async for message in read_messages(reader, delimiter):
+            pending.append(loop.run_in_executor(executor, parse, message))
+
+            if len(pending) >= max_pending:
+                yield await pending.popleft()
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
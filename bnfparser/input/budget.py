@@ -0,0 +1,70 @@
+"""budget module"""
+
+from time import monotonic
+
+from ..error import ParseAbortedError
+
+# Steps between two deadline and cancellation checks
+CHECK_INTERVAL = 1024
+
+class Budget:
+    """Limits of a backtracking parse, a step is a rule call. It is also a
+    cancellation token, `cancel` can be called from another thread.
+    A budget can be reused, it is restarted by every parse.
+    """
+
+    def __init__(self, max_steps: int | None=None, timeout: float | None=None):
+        self.max_steps = max_steps
+        # Seconds
+        self.timeout = timeout
+
+        self.steps = 0
+        self.cancelled = False
+
+        self.__deadline = None
+        # Step count of the next check
+        self.__next_check = 0
+
+    def cancel(self):
+        """Abort the running parse at its next check, and the next ones
+        """
+
+        self.cancelled = True
+
+    def start(self):
+        """Reset the steps and the deadline
+        """
+
+        self.steps = 0
+        self.__deadline = None if self.timeout is None else monotonic() + self.timeout
+        self.__next_check = 0
+
+    def step(self, position: int):
+        """Count a step, the limits are checked every `CHECK_INTERVAL` steps
+        and at the maximum number of steps
+
+        Args:
+            position (int): The furthest examined input position
+
+        Raises:
+            ParseAbortedError: A limit is reached or the parse is cancelled
+        """
+
+        self.steps += 1
+
+        if self.steps < self.__next_check:
+            return
+
+        if self.cancelled:
+            raise ParseAbortedError("cancelled", self.steps, position)
+
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ParseAbortedError("max_steps", self.steps, position)
+
+        if self.__deadline is not None and monotonic() > self.__deadline:
+            raise ParseAbortedError("timeout", self.steps, position)
+
+        self.__next_check = self.steps + CHECK_INTERVAL
+
+        if self.max_steps is not None:
+            self.__next_check = min(self.__next_check, self.max_steps + 1)
@@ -0,0 +1,193 @@
+"""compact tree module"""
+
+from array import array
+from typing import List, Tuple, Iterator
+
+from .tree import InputTree
+from .node import InputNode, Nodekind
+
+class CompactNode:
+    """Lightweight view on a `CompactTree` node
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: "CompactTree", index: int):
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CompactNode) \
+            and self.tree is other.tree and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self) -> str:
+        return f"CompactNode({self.node_kind.value}, {self.value!r}, {self.start}, {self.end})"
+
+    @property
+    def node_kind(self) -> Nodekind:
+        """Return the node kind
+
+        Returns:
+            Nodekind: VARIABLE for a rule, VALUE for a terminal
+        """
+
+        if self.tree.symbols[self.index] >= 0:
+            return Nodekind.VARIABLE
+
+        return Nodekind.VALUE
+
+    @property
+    def value(self) -> str:
+        """Return the rule name or the terminal value
+
+        Returns:
+            str: The value
+        """
+
+        symbol = self.tree.symbols[self.index]
+
+        if symbol >= 0:
+            return self.tree.names[symbol]
+
+        return self.tree.constants[~symbol]
+
+    @property
+    def start(self) -> int:
+        """Return the input offset where the node starts
+
+        Returns:
+            int: The offset
+        """
+
+        return self.tree.starts[self.index]
+
+    @property
+    def end(self) -> int:
+        """Return the input offset where the node ends
+
+        Returns:
+            int: The offset
+        """
+
+        return self.tree.ends[self.index]
+
+    @property
+    def text(self) -> str:
+        """Return the matched input
+
+        Returns:
+            str: The matched input
+        """
+
+        return self.tree.source[self.start:self.end]
+
+    @property
+    def childrens(self) -> List["CompactNode"]:
+        """Return the children nodes
+
+        Returns:
+            List[CompactNode]: The childrens
+        """
+
+        return list(self.iter_childrens())
+
+    def iter_childrens(self) -> Iterator["CompactNode"]:
+        """Iterate over the children nodes without building a list
+
+        Yields:
+            CompactNode: A children
+        """
+
+        child = self.tree.first_childs[self.index]
+
+        while child >= 0:
+            yield CompactNode(self.tree, child)
+            child = self.tree.next_siblings[child]
+
+class CompactTree: # pylint: disable=too-many-instance-attributes
+    """Parse tree stored as parallel arrays, it holds a few flat buffers
+    instead of one object per node. The node 0 is the start rule node.
+
+    A symbol is a rule id (`names` index), or a negative terminal id,
+    `~symbol` is its `constants` index. A missing child or sibling is -1.
+    """
+
+    def __init__(self, source: str, names: Tuple[str, ...], constants: Tuple[str, ...]):
+        self.source = source
+        self.names = names
+        self.constants = constants
+
+        self.symbols = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.first_childs = array("i")
+        self.next_siblings = array("i")
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    @property
+    def root(self) -> CompactNode | None:
+        """Return the start rule node
+
+        Returns:
+            CompactNode | None: The node, None for an empty tree
+        """
+
+        if len(self) == 0:
+            return None
+
+        return CompactNode(self, 0)
+
+    def add(self, symbol: int, start: int, end: int=-1) -> int:
+        """Append a node without linking it
+
+        Args:
+            symbol (int): The node symbol
+            start (int): The input offset where the node starts
+            end (int, optional): The input offset where the node ends. Defaults to -1.
+
+        Returns:
+            int: The node index
+        """
+
+        self.symbols.append(symbol)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.first_childs.append(-1)
+        self.next_siblings.append(-1)
+
+        return len(self.symbols) - 1
+
+    def to_input_tree(self) -> InputTree:
+        """Convert into an `InputTree`
+
+        Returns:
+            InputTree: The tree
+        """
+
+        tree = InputTree()
+
+        if len(self) == 0:
+            return tree
+
+        stack = [(tree.root, 0)]
+
+        while stack:
+            parent, index = stack.pop()
+
+            # Siblings are linked in order, every one is created now
+            while index >= 0:
+                node = CompactNode(self, index)
+                child = InputNode(node.node_kind, node.value, parent)
+                parent.childrens.append(child)
+
+                stack.append((child, self.first_childs[index]))
+                index = self.next_siblings[index]
+
+        tree.set_source(self.source)
+
+        return tree
@@ -0,0 +1,179 @@
+"""diagnostic module"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Set, Tuple
+
+from ..expression import Visitor, Terminal, NonTerminal, \
+    Variable, Or, Assignment, Group, Expression
+from ..resolver import Environment
+
+from .input import Source
+
+# First terminals of an expression and if it can match the empty string
+First = Tuple[Set[str], bool]
+
+class LineIndex:
+    """Start offsets of the lines of a source, computed once to convert
+    offsets into lines and columns. Only the lines starting up to `end`
+    are indexed, the whole source if it is None.
+    """
+
+    def __init__(self, source: Source, end: int | None=None):
+        if end is None:
+            end = len(source)
+
+        if isinstance(source, memoryview):
+            obj = source.obj
+
+            # The viewed object is searched in place, unless the view is a part of it
+            if hasattr(obj, "find") and source.nbytes == len(obj):
+                source = obj
+            else:
+                source = source[:end].tobytes()
+
+        newline = "\n" if isinstance(source, str) else b"\n"
+
+        self.starts: List[int] = [0]
+        position = source.find(newline, 0, end)
+
+        while position >= 0:
+            self.starts.append(position + 1)
+            position = source.find(newline, position + 1, end)
+
+    def location(self, offset: int) -> Tuple[int, int]:
+        """Return the line and the column of an offset
+
+        Args:
+            offset (int): The offset, in bytes for a binary source
+
+        Returns:
+            Tuple[int, int]: The line and the column, from 1
+        """
+
+        line = bisect_right(self.starts, offset)
+
+        return line, offset - self.starts[line - 1] + 1
+
+class FirstTerminals(Visitor):
+    """`Visitor` implementation that computes the terminals an expression
+    can start with, it describes the alternatives that were not tried
+    """
+
+    def __init__(self, environment: Environment):
+        self.__environment = environment
+
+        # Rules being visited, a recursive call adds nothing
+        self.__visiting: Set[str] = set()
+        self.__rules: Dict[str, First] = {}
+
+    def visit_terminal_expression(self, expression: Terminal) -> Any:
+        if expression.value == "":
+            return set(), True
+
+        return {expression.value}, False
+
+    def visit_nonterminal_expression(self, expression: NonTerminal) -> Any:
+        first = set()
+
+        for e in expression.expressions:
+            e_first, nullable = self.__build_expression(e)
+            first |= e_first
+
+            if not nullable:
+                return first, False
+
+        return first, True
+
+    def visit_variable_expression(self, expression: Variable) -> Any:
+        name = expression.name
+
+        if name.lexeme in self.__rules:
+            return self.__rules[name.lexeme]
+
+        if name.lexeme in self.__visiting or not name in self.__environment:
+            return set(), False
+
+        self.__visiting.add(name.lexeme)
+        ret = self.__rules[name.lexeme] = self.__build_expression(self.__environment[name])
+        self.__visiting.discard(name.lexeme)
+
+        return ret
+
+    def visit_or_expression(self, expression: Or) -> Any:
+        first, nullable = set(), False
+
+        for e in expression.values:
+            e_first, e_nullable = self.__build_expression(e)
+            first |= e_first
+            nullable = nullable or e_nullable
+
+        return first, nullable
+
+    def visit_assignment_expression(self, expression: Assignment) -> Any:
+        return self.__build_expression(expression.expression)
+
+    def visit_group_statement(self, expression: Group) -> Any:
+        return self.__build_expression(expression.expression)
+
+    def __build_expression(self, expression: Expression) -> First:
+        """Visit the given `expression` with the right `Visitor` method
+
+        Args:
+            expression (Expression): An expression
+
+        Returns:
+            First: The expression first terminals and if it is nullable
+        """
+
+        return expression.accept(self)
+
+    def first(self, expression: Expression) -> Set[str]:
+        """Return the terminals an expression can start with
+
+        Args:
+            expression (Expression): An expression
+
+        Returns:
+            Set[str]: The terminals
+        """
+
+        return self.__build_expression(expression)[0]
+
+@dataclass(frozen=True)
+class ParseFailure:
+    """Furthest failure of a parse, it is falsy like a missing tree.
+    The column of a binary source is a byte column.
+    """
+
+    offset: int
+    line: int
+    column: int
+    # Terminals expected at the offset, "" is the end of the input.
+    # The LL(1) engine expects lookahead characters instead of terminals
+    expected: Tuple[str, ...]
+
+    @classmethod
+    def at(cls, source: Source, offset: int, expected: List[str]) -> "ParseFailure":
+        """Locate a failure in its source
+
+        Args:
+            source (Source): The parsed source
+            offset (int): The failure offset
+            expected (List[str]): What was expected at the offset
+
+        Returns:
+            ParseFailure: The failure
+        """
+
+        line, column = LineIndex(source, offset).location(offset)
+
+        return cls(offset, line, column, tuple(expected))
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __str__(self) -> str:
+        expected = ", ".join(repr(e) if e else "end of input" for e in self.expected)
+
+        return f"[line {self.line}] Error at column {self.column}: Expected {expected or 'nothing'}"
@@ -0,0 +1,515 @@
+"""earley module"""
+
+from typing import List, Dict, Tuple
+
+from ..grammar import Grammar
+from ..expression import Variable
+
+from .tree import InputTree
+from .node import InputNode, Nodekind
+from .forest import Forest, ForestNode, SymbolNode, IntermediateNode, TerminalNode, PackedNode
+
+# (production, dot, origin)
+Item = Tuple[int, int, int]
+
+# Back pointer causes, a positive one is the production of a completed item.
+# Below `LEO`, it is a deterministic reduction path whose bottom
+# completed item production is `LEO - cause`
+TERMINAL = -1
+NULLABLE = -2
+LEO = -3
+
+class EarleyParser:
+    """Earley parser working on a flattened `Grammar`. It handles every
+    context free grammar (left recursive, ambiguous) in O(n^3) time and
+    produces the same kind of tree as `InputParser`.
+
+    The empty rules are handled with the Aycock-Horspool prediction and
+    the right recursions are completed in linear time with the Joop Leo
+    optimization.
+    """
+
+    def __init__(self, source: str, grammar: Grammar):
+        self.__source = source
+        self.__grammar = grammar
+
+        # Earley sets, item -> (previous item position, cause)
+        self.__chart: List[Dict[Item, Tuple[int, int] | None] | None] = []
+        # Items waiting for a rule, per Earley set
+        self.__waiting: List[Dict[int, List[Item]] | None] = []
+        # Used to process each Earley set as a worklist
+        self.__queues: List[List[Item] | None] = []
+        # Deterministic reduction paths, per Earley set,
+        # rule -> (topmost item, completed item) | None
+        self.__leos: List[Dict[int, Tuple[Item, Item] | None] | None] = []
+        # The forest needs every completed item, the reduction paths are not skipped
+        self.__is_leo = True
+
+    def __add(self, position: int, item: Item, back: Tuple[int, int] | None):
+        """Add an item to an Earley set if it is not already in
+
+        Args:
+            position (int): The Earley set position
+            item (Item): The item
+            back (Tuple[int, int] | None): The back pointer
+        """
+
+        items = self.__chart[position]
+
+        if items is None:
+            items = self.__chart[position] = {}
+            self.__queues[position] = []
+
+        if not item in items:
+            items[item] = back
+            self.__queues[position].append(item)
+
+    def __complete(self, position: int, production: int, origin: int):
+        """Advance the items waiting for a completed rule
+
+        Args:
+            position (int): The Earley set position
+            production (int): The completed item production
+            origin (int): The completed item origin
+        """
+
+        lhs = self.__grammar.productions[production].lhs
+
+        # The last Earley set is completed without shortcut so
+        # the accepting item is always in it
+        if self.__is_leo and origin < position < len(self.__source):
+            leo = self.__leo(origin, lhs)
+
+            if not leo is None:
+                self.__add(position, leo[0], (origin, LEO - production))
+                return
+
+        for p, dot, item_origin in self.__waiting[origin].get(lhs, ()):
+            self.__add(position, (p, dot + 1, item_origin), (origin, production))
+
+    def __process(self, position: int):
+        """Predict, scan and complete every item of an Earley set
+
+        Args:
+            position (int): The Earley set position
+        """
+
+        productions = self.__grammar.productions
+        by_lhs = self.__grammar.by_lhs
+        nullable = self.__grammar.nullable
+
+        queue = self.__queues[position]
+        waiting = self.__waiting[position] = {}
+
+        i = 0
+        while i < len(queue):
+            item = queue[i]
+            i += 1
+
+            p, dot, origin = item
+            rhs = productions[p].rhs
+
+            # Complete
+            if dot == len(rhs):
+                self.__complete(position, p, origin)
+                continue
+
+            symbol = rhs[dot]
+
+            # Scan
+            if isinstance(symbol, str):
+                if self.__source.startswith(symbol, position):
+                    self.__add(
+                        position + len(symbol),
+                        (p, dot + 1, origin),
+                        (position, TERMINAL)
+                    )
+
+                continue
+
+            # Predict
+            if not symbol in waiting:
+                waiting[symbol] = []
+
+                for q in by_lhs[symbol]:
+                    self.__add(position, (q, 0, position), None)
+
+            waiting[symbol].append(item)
+
+            if nullable[symbol]:
+                self.__add(position, (p, dot + 1, origin), (position, NULLABLE))
+
+        # The queue is not needed anymore
+        self.__queues[position] = None
+
+    def __leo(self, origin: int, rule: int) -> Tuple[Item, Item] | None:
+        """Follow the deterministic reduction path of a rule completed
+        from the Earley set `origin`. Each step is cached, so a right
+        recursion is followed once.
+
+        Args:
+            origin (int): The Earley set position
+            rule (int): The completed rule id
+
+        Returns:
+            Tuple[Item, Item] | None: The topmost item and the item
+                completed by `rule`, if the path exists
+        """
+
+        productions = self.__grammar.productions
+
+        path = []
+        upper = None
+        position, lhs = origin, rule
+
+        while True:
+            leos = self.__leos[position]
+
+            if leos is None:
+                leos = self.__leos[position] = {}
+
+            if lhs in leos:
+                upper = leos[lhs]
+                break
+
+            # Guards against the unit rules cycles
+            leos[lhs] = None
+
+            items = self.__waiting[position].get(lhs, ())
+
+            if len(items) != 1:
+                break
+
+            p, dot, item_origin = items[0]
+
+            if dot + 1 != len(productions[p].rhs):
+                break
+
+            path.append((position, lhs, (p, dot + 1, item_origin)))
+            position, lhs = item_origin, productions[p].lhs
+
+        top = None if upper is None else upper[0]
+
+        for position, lhs, completed in reversed(path):
+            if top is None:
+                top = completed
+
+            self.__leos[position][lhs] = (top, completed)
+
+        return self.__leos[origin][rule]
+
+    def __expand_leo(self, position: int, origin: int, production: int):
+        """Write the back pointers of a deterministic reduction path
+        that has been skipped during the recognition
+
+        Args:
+            position (int): The Earley set position
+            origin (int): The bottom completed item origin
+            production (int): The bottom completed item production
+        """
+
+        productions = self.__grammar.productions
+        items = self.__chart[position]
+
+        while True:
+            top, completed = self.__leos[origin][productions[production].lhs]
+
+            if completed == top or not completed in items:
+                items[completed] = (origin, production)
+
+            if completed == top:
+                break
+
+            production, _, origin = completed
+
+    def __recognize(self, start: int) -> Item | None:
+        """Fill the Earley sets
+
+        Args:
+            start (int): Start rule id
+
+        Returns:
+            Item | None: The accepting item if the source matched
+        """
+
+        size = len(self.__source)
+
+        self.__chart = [None] * (size + 1)
+        self.__waiting = [None] * (size + 1)
+        self.__queues = [None] * (size + 1)
+        self.__leos = [None] * (size + 1)
+
+        for p in self.__grammar.by_lhs[start]:
+            self.__add(0, (p, 0, 0), None)
+
+        for position in range(size + 1):
+            if not self.__queues[position] is None:
+                self.__process(position)
+
+        last = self.__chart[size]
+
+        if last is None:
+            return None
+
+        for p in self.__grammar.by_lhs[start]:
+            item = (p, len(self.__grammar.productions[p].rhs), 0)
+
+            if item in last:
+                return item
+
+        return None
+
+    def __children(self, item: Item, position: int) -> List[str | int | Tuple[Item, int]]:
+        """Walk back the pointers of a completed item
+
+        Args:
+            item (Item): A completed item
+            position (int): Its Earley set position
+
+        Returns:
+            List[str | int | Tuple[Item, int]]: Terminals, empty rules
+                and completed items (with their position), ordered
+        """
+
+        productions = self.__grammar.productions
+
+        p, dot, origin = item
+        rhs = productions[p].rhs
+        children = []
+
+        while dot > 0:
+            previous, cause = self.__chart[position][(p, dot, origin)]
+
+            if cause <= LEO:
+                self.__expand_leo(position, previous, LEO - cause)
+                previous, cause = self.__chart[position][(p, dot, origin)]
+
+            dot -= 1
+
+            # A terminal or an empty rule
+            if cause in (TERMINAL, NULLABLE):
+                children.append(rhs[dot])
+            else:
+                children.append(((cause, len(productions[cause].rhs), previous), position))
+
+            position = previous
+
+        children.reverse()
+
+        # The empty terminals are not in the chart, they are added back
+        symbols = productions[p].symbols
+
+        if len(symbols) != len(rhs):
+            aligned = iter(children)
+            children = ["" if s == "" else next(aligned) for s in symbols]
+
+        return children
+
+    def __empty_children(self, rule: int) -> List[int | str]:
+        """Return the rules and the empty terminals of an empty derivation
+
+        Args:
+            rule (int): A nullable rule id
+
+        Returns:
+            List[int | str]: The rules ids and the empty terminals
+        """
+
+        production = self.__grammar.empty_productions[rule]
+
+        return list(self.__grammar.productions[production].symbols)
+
+    def __build_tree(self, start: int, accepted: Item) -> InputTree:
+        """Build the tree iteratively from the back pointers
+
+        Args:
+            start (int): Start rule id
+            accepted (Item): The accepting item
+
+        Returns:
+            InputTree: The tree
+        """
+
+        grammar = self.__grammar
+
+        tree = InputTree()
+        node = tree.add_and_forward(Nodekind.VARIABLE, grammar.names[start])
+
+        stack = [(node, iter(self.__children(accepted, len(self.__source))))]
+
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+
+            if child is None:
+                stack.pop()
+                continue
+
+            if isinstance(child, str):
+                node.childrens.append(InputNode(Nodekind.VALUE, child, node))
+                continue
+
+            if isinstance(child, int):
+                rule = child
+                grandchildren = self.__empty_children(rule)
+            else:
+                item, position = child
+                rule = grammar.productions[item[0]].lhs
+                grandchildren = self.__children(item, position)
+
+            # Hidden rules children belong to their parent
+            if not grammar.hidden[rule]:
+                parent = node
+                node = InputNode(Nodekind.VARIABLE, grammar.names[rule], parent)
+                parent.childrens.append(node)
+
+            stack.append((node, iter(grandchildren)))
+
+        return tree
+
+    def parse_input(self, start: Variable) -> InputTree | None:
+        """Produce an AST based on the grammar rules
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            InputTree | None: Return None if it doest match, otherwise, it returns the tree
+        """
+
+        rule = self.__grammar.rules[start.name.lexeme]
+        accepted = self.__recognize(rule)
+
+        if accepted is None:
+            return None
+
+        return self.__build_tree(rule, accepted)
+
+    def __completed(self) -> List[Dict[int, List[int]]]:
+        """Index the completed items
+
+        Returns:
+            List[Dict[int, List[int]]]: Per Earley set, rule -> origins
+        """
+
+        productions = self.__grammar.productions
+        ret = []
+
+        for items in self.__chart:
+            origins = {}
+
+            for p, dot, origin in items or ():
+                if dot == len(productions[p].rhs):
+                    origins.setdefault(productions[p].lhs, set()).add(origin)
+
+            ret.append({rule: sorted(values) for rule, values in origins.items()})
+
+        return ret
+
+    def __build_forest(self, start: int) -> Forest:
+        """Build the shared packed parse forest from the Earley sets, a node
+        is created once by rule (or production prefix) and input range
+
+        Args:
+            start (int): Start rule id
+
+        Returns:
+            Forest: The forest
+        """
+
+        grammar = self.__grammar
+        chart = self.__chart
+        completed = self.__completed()
+
+        nodes: Dict[tuple, ForestNode] = {}
+        # Nodes whose packed nodes are not computed yet
+        stack: List[Tuple[SymbolNode | IntermediateNode, tuple]] = []
+
+        def get(key: tuple) -> ForestNode:
+            node = nodes.get(key)
+
+            if node is not None:
+                return node
+
+            match key:
+                case ("symbol", rule, i, j):
+                    node = SymbolNode(grammar.names[rule], i, j, grammar.hidden[rule])
+                    stack.append((node, key))
+                case ("prefix", p, dot, i, j):
+                    node = IntermediateNode(p, dot, i, j)
+                    stack.append((node, key))
+                case (_, value, i, j):
+                    node = TerminalNode(value, i, j)
+
+            nodes[key] = node
+
+            return node
+
+        def packed(p: int, dot: int, i: int, j: int) -> List[PackedNode]:
+            # The last symbol of the prefix starts where the rest of the prefix ends
+            symbol = grammar.productions[p].rhs[dot - 1]
+
+            if isinstance(symbol, str):
+                splits = [j - len(symbol)] if self.__source.startswith(symbol, j - len(symbol)) else []
+                right = "terminal"
+            else:
+                splits = completed[j].get(symbol, ())
+                right = "symbol"
+
+            ret = []
+
+            for k in splits:
+                if k < i or chart[k] is None or not (p, dot - 1, i) in chart[k]:
+                    continue
+
+                if dot == 1 and k != i:
+                    continue
+
+                left = None if dot == 1 else get(("prefix", p, dot - 1, i, k))
+                ret.append(PackedNode(p, left, get((right, symbol, k, j))))
+
+            return ret
+
+        root = get(("symbol", start, 0, len(self.__source)))
+
+        while stack:
+            node, key = stack.pop()
+
+            if isinstance(node, IntermediateNode):
+                node.packed = packed(node.production, node.dot, node.start, node.end)
+                continue
+
+            for p in grammar.by_lhs[key[1]]:
+                size = len(grammar.productions[p].rhs)
+
+                if not (p, size, node.start) in (chart[node.end] or ()):
+                    continue
+
+                if size == 0:
+                    node.packed.append(PackedNode(p))
+                else:
+                    node.packed += packed(p, size, node.start, node.end)
+
+        return Forest(root, self.__source, grammar.productions)
+
+    def parse_forest(self, start: Variable) -> Forest | None:
+        """Produce every parse of the input as a shared packed parse forest
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            Forest | None: Return None if it doest match, otherwise, it returns the forest
+        """
+
+        self.__is_leo = False
+
+        try:
+            rule = self.__grammar.rules[start.name.lexeme]
+
+            if self.__recognize(rule) is None:
+                return None
+
+            return self.__build_forest(rule)
+        finally:
+            self.__is_leo = True
@@ -0,0 +1,15 @@
+"""engine module"""
+
+from enum import Enum
+
+class Engine(Enum):
+    """Represents every available input parsing engines
+    """
+
+    AUTO = "auto"
+    BACKTRACKING = "backtracking"
+    EARLEY = "earley"
+    LL1 = "ll1"
+    LALR = "lalr"
+    COMPILED = "compiled"
+    VM = "vm"
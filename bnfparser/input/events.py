@@ -0,0 +1,106 @@
+"""events module"""
+
+from typing import Any, List, Tuple
+
+from .tree import BaseInputTree
+from .node import InputNode, Nodekind
+
+class EventHandler:
+    """Receives the matches of `Bnf.parse_events`, every method does
+    nothing by default. The positions are character offsets, byte offsets
+    for a binary input.
+    """
+
+    def on_enter(self, rule: str, position: int):
+        """A rule match starts
+
+        Args:
+            rule (str): The rule name
+            position (int): The match start
+        """
+
+    def on_exit(self, rule: str, start: int, end: int):
+        """A rule match ends, after the events of its content
+
+        Args:
+            rule (str): The rule name
+            start (int): The match start
+            end (int): The match end, exclusive
+        """
+
+    def on_terminal(self, value: str, start: int, end: int):
+        """A terminal is matched
+
+        Args:
+            value (str): The terminal
+            start (int): The match start
+            end (int): The match end, exclusive
+        """
+
+class EventTree(BaseInputTree):
+    """Tree sending its nodes to an `EventHandler` instead of keeping them.
+    It is the bottom tree of `InputParser`, the nodes reaching it cannot be
+    backtracked anymore.
+    """
+
+    def __init__(self, handler: EventHandler, is_text: bool):
+        super().__init__()
+
+        self.__handler = handler
+        self.__is_text = is_text
+
+        # End of the last terminal
+        self.__position = 0
+        # Rules being matched, (name, start)
+        self.__rules: List[Tuple[str, int]] = []
+
+    def reset(self):
+        self.__position = 0
+        self.__rules.clear()
+
+    def __terminal(self, value: str):
+        """Send a terminal event
+
+        Args:
+            value (str): The terminal
+        """
+
+        start = self.__position
+
+        if self.__is_text or value.isascii():
+            self.__position += len(value)
+        else:
+            self.__position += len(value.encode())
+
+        self.__handler.on_terminal(value, start, self.__position)
+
+    def add_and_forward(self, node_kind: str, value: str) -> None:
+        self.__rules.append((value, self.__position))
+        self.__handler.on_enter(value, self.__position)
+
+    def add(self, node_kind: str, value: str) -> None:
+        if node_kind == Nodekind.VALUE:
+            self.__terminal(value)
+        else:
+            self.add_and_forward(node_kind, value)
+            self.back()
+
+    def back(self):
+        name, start = self.__rules.pop()
+        self.__handler.on_exit(name, start, self.__position)
+
+    def add_children(self, node: InputNode):
+        # A committed subtree, built while it could be backtracked
+        stack: List[Any] = [node]
+
+        while stack:
+            item = stack.pop()
+
+            if item is None:
+                self.back()
+            elif item.node_kind == Nodekind.VALUE:
+                self.__terminal(item.value)
+            else:
+                self.add_and_forward(item.node_kind, item.value)
+                stack.append(None)
+                stack.extend(reversed(item.childrens))
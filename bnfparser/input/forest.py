@@ -0,0 +1,250 @@
+"""forest module"""
+
+import math
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple, Union
+
+from ..grammar import Production
+from .tree import InputTree
+from .node import InputNode, Nodekind
+
+@dataclass(eq=False)
+class TerminalNode:
+    """A matched terminal"""
+    value: str
+    start: int
+    end: int
+
+@dataclass(eq=False)
+class PackedNode:
+    """A derivation of a `SymbolNode` or an `IntermediateNode`, the
+    production prefix `left` followed by its last symbol `right`"""
+    production: int
+    left: Union["IntermediateNode", None] = None
+    right: Union["SymbolNode", TerminalNode, None] = None
+
+@dataclass(eq=False)
+class SymbolNode:
+    """A rule matching the input range [start, end), one packed node by derivation"""
+    rule: str
+    start: int
+    end: int
+    # Hidden rules children belong to their parent in the trees
+    hidden: bool = False
+    packed: List[PackedNode] = field(default_factory=list)
+
+@dataclass(eq=False)
+class IntermediateNode:
+    """The first `dot` symbols of a production matching the input range [start, end)"""
+    production: int
+    dot: int
+    start: int
+    end: int
+    packed: List[PackedNode] = field(default_factory=list)
+
+ForestNode = SymbolNode | IntermediateNode | TerminalNode
+
+# The empty terminals are not in the forest, this node is added to the trees
+EMPTY_TERMINAL = TerminalNode("", 0, 0)
+
+def empty_terminals(production: Production) -> List[int]:
+    """Count the empty terminals of a production around its symbols
+
+    Args:
+        production (Production): The production
+
+    Returns:
+        List[int]: The empty terminals before each symbol of the right
+            hand side, then after the last one
+    """
+
+    counts = [0]
+
+    for symbol in production.symbols:
+        if symbol == "":
+            counts[-1] += 1
+        else:
+            counts.append(0)
+
+    return counts
+
+class Forest:
+    """Shared packed parse forest (SPPF) of every parse of an input, the
+    common subtrees are shared and each node packs its alternative
+    derivations, so its size is at most cubic in the input size.
+    """
+
+    def __init__(self, root: SymbolNode, source: str, productions: List[Production]):
+        self.root = root
+        self.source = source
+
+        # Per production, used to add the empty terminals to the trees
+        self.__empty_terminals = [empty_terminals(p) for p in productions]
+
+    def count(self) -> int | float:
+        """Count the parses without building them
+
+        Returns:
+            int | float: The number of trees, `math.inf` if a rule can
+                derive itself on the same input range
+        """
+
+        counts: Dict[int, int] = {}
+        # Nodes whose descendants are being counted
+        running = set()
+
+        stack: List[Tuple[ForestNode, bool]] = [(self.root, False)]
+
+        while stack:
+            node, is_expanded = stack.pop()
+
+            if id(node) in counts:
+                continue
+
+            if is_expanded:
+                running.discard(id(node))
+                counts[id(node)] = sum(
+                    self.__count(packed.left, counts) * self.__count(packed.right, counts)
+                    for packed in node.packed
+                )
+                continue
+
+            # Reached again from one of its descendants
+            if id(node) in running:
+                return math.inf
+
+            running.add(id(node))
+            stack.append((node, True))
+
+            for packed in node.packed:
+                for child in (packed.right, packed.left):
+                    if child is not None and not isinstance(child, TerminalNode):
+                        stack.append((child, False))
+
+        return counts[id(self.root)]
+
+    @staticmethod
+    def __count(node: ForestNode | None, counts: Dict[int, int]) -> int:
+        """Return the number of trees of a counted node
+
+        Args:
+            node (ForestNode | None): The node
+            counts (Dict[int, int]): The counted nodes
+
+        Returns:
+            int: The number of trees
+        """
+
+        if node is None or isinstance(node, TerminalNode):
+            return 1
+
+        return counts[id(node)]
+
+    def trees(self) -> Iterator[InputTree]:
+        """Lazily build every parse tree, one at a time. The trees where a
+        rule derives itself on the same input range are skipped, so there
+        are finitely many.
+
+        Yields:
+            InputTree: A tree, like the ones of `Bnf.parse_input`
+        """
+
+        # Packed node index and size of each ambiguous node, in the tree order
+        choices: List[int] = []
+        sizes: List[int] = []
+
+        while True:
+            tree = self.__build(choices, sizes)
+
+            if tree is not None:
+                tree.set_source(self.source)
+                yield tree
+
+            # Next combination, like an odometer
+            while choices and choices[-1] + 1 == sizes[-1]:
+                choices.pop()
+                sizes.pop()
+
+            if not choices:
+                return
+
+            choices[-1] += 1
+
+    def __build(self, choices: List[int], sizes: List[int]) -> InputTree | None:
+        """Build the tree of a combination, the first packed node is chosen
+        for the ambiguous nodes past the given choices
+
+        Args:
+            choices (List[int]): The packed nodes indexes, completed in place
+            sizes (List[int]): The ambiguous nodes sizes, completed in place
+
+        Returns:
+            InputTree | None: The tree, None if a rule derives itself
+        """
+
+        tree = InputTree()
+        depth = 0
+
+        # Nodes from the root to the current one
+        ancestors = set()
+
+        # An `None` node closes its parent
+        stack: List[Tuple[ForestNode | None, InputNode, ForestNode | None]] = [
+            (self.root, tree.root, None)
+        ]
+
+        while stack:
+            node, parent, closed = stack.pop()
+
+            if node is None:
+                ancestors.discard(id(closed))
+                continue
+
+            if isinstance(node, TerminalNode):
+                parent.childrens.append(InputNode(Nodekind.VALUE, node.value, parent))
+                continue
+
+            if id(node) in ancestors:
+                del choices[depth:], sizes[depth:]
+                return None
+
+            ancestors.add(id(node))
+            stack.append((None, parent, node))
+
+            index = 0
+
+            if len(node.packed) > 1:
+                if depth == len(choices):
+                    choices.append(0)
+                    sizes.append(len(node.packed))
+
+                index = choices[depth]
+                depth += 1
+
+            packed = node.packed[index]
+            empty = self.__empty_terminals[packed.production]
+
+            if isinstance(node, SymbolNode):
+                if not node.hidden:
+                    child = InputNode(Nodekind.VARIABLE, node.rule, parent)
+                    parent.childrens.append(child)
+                    parent = child
+
+                # The whole production, ended by its last empty terminals
+                dot = len(empty) - 1
+                stack += [(EMPTY_TERMINAL, parent, None)] * empty[dot]
+            else:
+                dot = node.dot
+
+            if packed.right is not None:
+                stack.append((packed.right, parent, None))
+
+            # The empty terminals before the last symbol of the prefix
+            if dot > 0:
+                stack += [(EMPTY_TERMINAL, parent, None)] * empty[dot - 1]
+
+            if packed.left is not None:
+                stack.append((packed.left, parent, None))
+
+        return tree
@@ -0,0 +1,36 @@
+"""graph module"""
+
+from typing import TYPE_CHECKING
+
+import graphviz
+
+if TYPE_CHECKING:
+    from .tree import BaseInputTree
+
+def build_graph(tree: "BaseInputTree") -> graphviz.Graph:
+    """Build a Graphviz graph with every node of a tree linked to its parent.
+    The links follow the childrens lists, the `parent` members of the nodes
+    spliced from a backtracking alternative can point to its temporary root.
+
+    Args:
+        tree (BaseInputTree): The tree
+
+    Returns:
+        graphviz.Graph: The graph
+    """
+
+    graph = graphviz.Graph()
+    # (parent, node), the root childrens have no parent in the graph
+    stack = [(None, node) for node in reversed(tree.root.childrens)]
+
+    while stack:
+        parent, node = stack.pop()
+
+        graph.node(node.name, node.value, **node.attrs)
+
+        if parent is not None:
+            graph.edge(parent.name, node.name)
+
+        stack.extend((node, child) for child in reversed(node.childrens))
+
+    return graph
@@ -1,18 +1,68 @@
 """input module"""
 
-class Input:
-    """Managed a string source that needs to be matched
+import mmap
+
+from typing import Dict, Set
+
+# Every supported input source, the binary ones are UTF-8 encoded
+Source = str | bytes | bytearray | memoryview | mmap.mmap
+
+class Input: # pylint: disable=too-many-instance-attributes
+    """Managed a string source that needs to be matched.
+    A binary source is matched with the UTF-8 encoded terminals and the
+    cursor is a byte offset, `memoryview` and `mmap` sources are never copied.
     """
 
-    def __init__(self, source: str):
-        self.__source = source
+    def __init__(self, source: Source, terminals: Dict[str, bytes] | None=None):
         self.current = 0
 
+        # Furthest position examined by a match attempt, exclusive
+        self.examined = 0
+
+        # Furthest position where a terminal failed to match, and these terminals
+        self.failure = 0
+        self.expected: Set[str] = set()
+
+        # Terminals encoded once per grammar
+        self.__terminals = terminals or {}
+
+        self.__is_text = isinstance(source, str)
+
+        # Slicing a `memoryview` doesnt copy the data
+        self.__is_view = isinstance(source, (memoryview, mmap.mmap))
+
+        if self.__is_view:
+            self.__source = memoryview(source).cast("B")
+        else:
+            self.__source = source
+
+    @property
+    def is_text(self) -> bool:
+        """Return if the source is a string, otherwise the cursor is a byte offset
+
+        Returns:
+            bool: Is a string
+        """
+
+        return self.__is_text
+
     def reset(self):
         """Reset that allow to match again
         """
 
         self.current = 0
+        self.examined = 0
+        self.failure = 0
+        self.expected = set()
+
+    def examine(self, position: int):
+        """Record that the input has been examined up to a position
+
+        Args:
+            position (int): The position, exclusive
+        """
+
+        self.examined = max(self.examined, position)
 
     def match(self, destination: str) -> bool:
         """Try to match a destination based on the current cursor
@@ -24,14 +74,77 @@ class Input:
             bool: Is matched
         """
 
-        size = len(destination)
-        ret = self.__source[self.current:self.current + size] == destination
+        if self.__is_text:
+            # No substring is allocated
+            ret = self.__source.startswith(destination, self.current)
+            size = len(destination)
+        else:
+            encoded = self.__terminals.get(destination)
+
+            if encoded is None:
+                encoded = destination.encode()
+
+            size = len(encoded)
+
+            if self.__is_view:
+                ret = self.__source[self.current:self.current + size] == encoded
+            else:
+                ret = self.__source.startswith(encoded, self.current)
+
+        self.examined = max(self.examined, self.current + size)
 
         if ret:
             self.current += size
+        elif self.current >= self.failure:
+            self.fail(destination)
 
         return ret
 
+    def fail(self, expected: str):
+        """Record a failed match at the current cursor, only the furthest
+        failures are kept
+
+        Args:
+            expected (str): What was expected, "" for the end of the source
+        """
+
+        if self.current > self.failure:
+            self.failure = self.current
+            self.expected = {expected}
+        elif self.current == self.failure:
+            self.expected.add(expected)
+
+    def peek(self) -> str:
+        """Return the character at the current cursor
+
+        Returns:
+            str: The next character, "" at the end of the source
+        """
+
+        self.examine(self.current + 1)
+
+        if self.__is_text:
+            return self.__source[self.current:self.current + 1]
+
+        if self.current >= len(self.__source):
+            return ""
+
+        byte = self.__source[self.current]
+
+        if byte < 0x80:
+            return chr(byte)
+
+        # UTF-8 character size from its leading byte
+        size = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+
+        self.examine(self.current + size)
+
+        try:
+            return bytes(self.__source[self.current:self.current + size]).decode()
+        except UnicodeDecodeError:
+            # An invalid character cannot start any terminal
+            return ""
+
     def is_full_match(self) -> bool:
         """Return if the source has been entirely matched
 
@@ -1,47 +1,193 @@
 """input_parser module"""
 
-from typing import Any
+from time import perf_counter
+from typing import Any, Dict, List, Set, Tuple
 from collections import deque
 
 from ..error import VisitorError
 from ..expression import Visitor, Terminal, NonTerminal, \
     Variable, Or, Assignment, Group, Expression
 from ..resolver import Environment
-
-from .tree import InputTree
-from .input import Input
-from .node import Nodekind
-
-class InputParser(Visitor):
+from ..token import Token
+from ..dispatch import Dispatch
+from ..grammar import GrammarBuilder
+
+from .tree import InputTree, NullTree
+from .input import Input, Source
+from .memo import Memo
+from .budget import Budget
+from .profile import Profile
+from .events import EventHandler, EventTree
+from .diagnostic import FirstTerminals
+from .node import InputNode, Nodekind
+
+class InputParser(Visitor): # pylint: disable=too-many-instance-attributes
     """`Visitor` implementation that produce a tree based on a given input.
     Assuming the input matches with the BNF grammar tree.
+
+    The left recursive rules are grown from a failing seed, as long as the
+    match gets longer, so `<e> ::= <e> "+" <t> | <t>` is left associative.
     """
 
-    def __init__(self, source: str, environment: Environment):
-        self.__input = Input(source)
+    def __init__(
+        self,
+        source: Source | Input,
+        environment: Environment,
+        memoize: bool | Memo=False,
+        dispatch: Dispatch | None=None,
+        build_tree: bool=True,
+        left_recursive: Set[str] | None=None
+    ): # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self.__input = source if isinstance(source, Input) else Input(source)
 
         # Variables environment
         self.__environment = environment
 
-        # Used for recursive grammar rules
-        self.__visited = {token: False for token in environment}
+        # Only these rules can be called again at the same position
+        if left_recursive is None:
+            grammar = GrammarBuilder().build(environment)
+            left_recursive = {grammar.names[rule] for rule in grammar.left_recursive()}
+
+        self.__left_recursive = left_recursive
+
+        # Growing left recursive rules, (rule name, position) -> (end or -1, node).
+        # The nested rules start after their parents, so the last one is the innermost
+        self.__seeds: Dict[Tuple[str, int], Tuple[int, InputNode | None]] = {}
+
+        # Without tree, the matching logic is the same but no node is created,
+        # even the trees of the alternatives are a single shared `NullTree`
+        if build_tree:
+            self.__new_tree = InputTree
+        else:
+            null_tree = NullTree()
+            self.__new_tree = lambda: null_tree
 
         # Used for backtracking without deepcopy the entire tree
-        self.__trees = deque([InputTree()])
+        self.__trees = deque([self.__new_tree()])
+
+        # Packrat cache, it can hold the results of a previous parse
+        if isinstance(memoize, Memo):
+            self.__memo = memoize
+        else:
+            self.__memo = Memo() if memoize else None
+
+        # `Or` alternatives by next character, every alternative is tried without it
+        self.__dispatch = dispatch
+
+        # Furthest position where `Or` alternatives were skipped by their
+        # first character and these `Or` expressions, by id
+        self.__skipped_at = -1
+        self.__skipped: Dict[int, Or] = {}
+
+        # Limits of the running parse, every rule call is a step
+        self.__budget = None
 
-    def __reset(self):
+        # Counters of the running parse, the rules running and their recursion depth
+        self.__profile = None
+        self.__profiled_rules: List[str] = []
+        self.__profiled_depths: Dict[str, int] = {}
+
+    def __reset(self, budget: Budget | None=None, profile: Profile | None=None):
         self.__input.reset()
         self.__trees[-1].reset()
+        self.__seeds.clear()
+        self.__skipped_at = -1
+        self.__skipped.clear()
+
+        self.__budget = budget
+
+        if budget is not None:
+            budget.start()
+
+        # The profiling visits shadow the class ones, nothing is checked without profile
+        if profile is not None:
+            self.visit_variable_expression = self.__profile_variable_expression
+            self.visit_or_expression = self.__profile_or_expression
+        elif self.__profile is not None:
+            del self.visit_variable_expression
+            del self.visit_or_expression
+
+        self.__profile = profile
+        self.__profiled_rules.clear()
+        self.__profiled_depths.clear()
+
+        if self.__memo is not None:
+            self.__memo.clear()
+
+    def __profile_variable_expression(self, expression: Variable) -> bool:
+        """Profiling version of `visit_variable_expression`
+
+        Args:
+            expression (Variable): The expression
+
+        Returns:
+            bool: Is matched
+        """
+
+        name = expression.name.lexeme
+        position = self.__input.current
+
+        depth = self.__profiled_depths.get(name, 0)
+        self.__profiled_depths[name] = depth + 1
+        self.__profiled_rules.append(name)
+
+        start = perf_counter()
+        ret = InputParser.visit_variable_expression(self, expression)
+        elapsed = perf_counter() - start
+
+        self.__profiled_rules.pop()
+        self.__profiled_depths[name] = depth
+
+        rule = self.__profile.rule(name)
+        rule.invocations += 1
+
+        if depth == 0:
+            rule.time += elapsed
+
+        if ret:
+            rule.matches += 1
+            rule.consumed += self.__input.current - position
+        else:
+            rule.failures += 1
+
+        return ret
+
+    def __profile_or_expression(self, expression: Or) -> bool:
+        """Profiling version of `visit_or_expression`
+
+        Args:
+            expression (Or): The expression
+
+        Returns:
+            bool: Is matched
+        """
+
+        tried = len(self.__alternatives(expression))
+        ret = InputParser.visit_or_expression(self, expression)
+
+        if self.__profiled_rules:
+            self.__profile.rule(self.__profiled_rules[-1]).backtracked += tried - 1 if ret else tried
+
+        return ret
+
+    def set_source(self, source: Source | Input):
+        """Change the input, the parser can be reused for many inputs.
+        The returned trees are never reused.
+
+        Args:
+            source (Source | Input): The new input
+        """
 
-    def __reset_visited(self):
-        for k in self.__visited:
-            self.__visited[k] = False
+        self.__input = source if isinstance(source, Input) else Input(source)
+        self.__trees = deque([self.__new_tree()])
+
+        if self.__memo is not None:
+            self.__memo = Memo()
 
     def visit_terminal_expression(self, expression: Terminal) -> Any:
         is_matched = self.__input.match(expression.value)
 
         if is_matched:
-            self.__reset_visited()
             self.__trees[-1].add(Nodekind.VALUE, expression.value)
 
         return is_matched
@@ -63,27 +209,195 @@ class InputParser(Visitor):
                 "Missing " + name.lexeme + " in the environment"
             )
 
-        if self.__visited[name]:
-            return False
+        if self.__budget is not None:
+            self.__budget.step(self.__input.examined)
+
+        if name.lexeme in self.__left_recursive:
+            return self.__parse_left_recursive_variable(name)
 
-        self.__visited[name] = True
-        value = self.__environment[name]
+        if self.__memo is not None:
+            return self.__parse_memoized_variable(name)
 
         self.__trees[-1].add_and_forward(Nodekind.VARIABLE, name.lexeme)
-        ret = self.__parse_expression(value)
+        ret = self.__parse_expression(self.__environment[name])
+        self.__trees[-1].back()
+
+        return ret
+
+    def __add_result(self, end: int, node: InputNode | None) -> bool:
+        """Add a rule result computed before
+
+        Args:
+            end (int): The end position, -1 if it doesnt match
+            node (InputNode | None): The rule node, None without tree
+
+        Returns:
+            bool: Is matched
+        """
+
+        if end < 0:
+            return False
+
+        self.__input.current = end
+
+        if node is not None:
+            node.parent = self.__trees[-1].current
+            self.__trees[-1].add_children(node)
+
+        return True
+
+    def __is_growing(self, position: int) -> bool:
+        """Return if a left recursive rule is growing at a position, the
+        results at this position may depend on its seed so they are not cached
+
+        Args:
+            position (int): The input position
+
+        Returns:
+            bool: Is growing
+        """
+
+        return bool(self.__seeds) and next(reversed(self.__seeds))[1] == position
+
+    def __parse_memoized_variable(self, name: Token) -> bool:
+        """Packrat version of `visit_variable_expression`, every rule result
+        at a given input position is computed once then reused
+
+        Args:
+            name (Token): The rule name
+
+        Returns:
+            bool: Is matched
+        """
+
+        position = self.__input.current
+        entry = self.__memo.get(name.lexeme, position)
+
+        if entry is not None:
+            end, node, examined = entry
+            self.__input.examine(examined)
+
+            return self.__add_result(end, node)
+
+        # Furthest position examined by this rule only
+        examined = self.__input.examined
+        self.__input.examined = position
+
+        node = self.__trees[-1].add_and_forward(Nodekind.VARIABLE, name.lexeme)
+        ret = self.__parse_expression(self.__environment[name])
         self.__trees[-1].back()
 
+        rule_examined = self.__input.examined
+        self.__input.examine(examined)
+
+        if not self.__is_growing(position):
+            end = self.__input.current if ret else -1
+            self.__memo.set(name.lexeme, position, (end, node if ret else None, rule_examined))
+
         return ret
 
+    def __parse_left_recursive_variable(self, name: Token) -> bool:
+        """Seed growing version of `visit_variable_expression` (Warth et al.).
+        The rule is parsed again as long as its result grows, a call at the
+        same position returns the previous result, the first one fails.
+
+        Args:
+            name (Token): The rule name
+
+        Returns:
+            bool: Is matched
+        """
+
+        position = self.__input.current
+        key = (name.lexeme, position)
+
+        if key in self.__seeds:
+            return self.__add_result(*self.__seeds[key])
+
+        if self.__memo is not None:
+            entry = self.__memo.get(name.lexeme, position)
+
+            if entry is not None:
+                end, node, examined = entry
+                self.__input.examine(examined)
+
+                return self.__add_result(end, node)
+
+        # Furthest position examined by this rule only
+        examined = self.__input.examined
+        self.__input.examined = position
+
+        self.__seeds[key] = (-1, None)
+
+        while True:
+            self.__input.current = position
+            self.__trees.append(self.__new_tree())
+
+            node = self.__trees[-1].add_and_forward(Nodekind.VARIABLE, name.lexeme)
+            ret = self.__parse_expression(self.__environment[name])
+
+            self.__trees.pop()
+
+            if not ret or self.__input.current <= self.__seeds[key][0]:
+                break
+
+            self.__seeds[key] = (self.__input.current, node)
+
+        end, node = self.__seeds.pop(key)
+
+        rule_examined = self.__input.examined
+        self.__input.examine(examined)
+
+        if self.__memo is not None and not self.__is_growing(position):
+            self.__memo.set(name.lexeme, position, (end, node, rule_examined))
+
+        return self.__add_result(end, node)
+
+    def __alternatives(self, expression: Or) -> List[Expression]:
+        """Return the alternatives of an `Or` that can match at the current position
+
+        Args:
+            expression (Or): The expression
+
+        Returns:
+            List[Expression]: The alternatives
+        """
+
+        if self.__dispatch is None:
+            return expression.values
+
+        return self.__dispatch[id(expression)].alternatives(self.__input.peek())
+
     def visit_or_expression(self, expression: Or) -> Any:
         steps, tree = -1, None
         initial_current = self.__input.current
 
-        for e in expression.values:
+        # Same as `__alternatives`, inlined
+        if self.__dispatch is None:
+            values = expression.values
+        else:
+            index = self.__dispatch[id(expression)]
+            values = index.alternatives(self.__input.peek())
+
+            # Only recorded, they are expanded in `failure`
+            if len(values) < len(expression.values) and initial_current >= self.__skipped_at:
+                if initial_current > self.__skipped_at:
+                    self.__skipped_at = initial_current
+                    self.__skipped.clear()
+
+                self.__skipped[id(expression)] = expression
+
+        # Nothing to compare, the nodes of a failure are discarded by an
+        # enclosing alternative or the parse fails. So they are added in
+        # place, and the events are sent at once without enclosing alternative
+        if len(values) == 1:
+            return self.__parse_expression(values[0])
+
+        for e in values:
             # Reset the input current cursor
             self.__input.current = initial_current
             # Add an empty tree to the stack
-            self.__trees.append(InputTree())
+            self.__trees.append(self.__new_tree())
 
             has_matched = self.__parse_expression(e)
 
@@ -106,8 +420,6 @@ class InputParser(Visitor):
         for children in tree.root.childrens:
             self.__trees[-1].add_children(children)
 
-        self.__reset_visited()
-
         return True
 
     def visit_assignment_expression(self, expression: Assignment) -> Any:
@@ -125,28 +437,139 @@ class InputParser(Visitor):
 
         return expression.accept(self)
 
-    def parse_input(self, start: Variable) -> InputTree | None:
+    def parse_input(
+        self,
+        start: Variable,
+        budget: Budget | None=None,
+        profile: Profile | None=None
+    ) -> InputTree | None:
         """Produce an AST based on the grammar rules
 
         Args:
             start (Variable): Grammar entry point rule
+            budget (Budget | None, optional): The parse limits. Defaults to None.
+            profile (Profile | None, optional): Receives the rules counters. Defaults to None.
+
+        Raises:
+            ParseAbortedError: A limit of the budget is reached
 
         Returns:
             InputTree | None: Return None if it doest match, otherwise, it returns the tree
         """
 
-        self.__reset()
-
-        # Insert first node
-        self.__trees[-1].add_and_forward(
-            Nodekind.VARIABLE,
-            start.name.lexeme
-        )
+        self.__reset(budget, profile)
 
         try:
-            if self.__parse_expression(start) and self.__input.is_full_match():
-                return self.__trees[-1]
+            # Called like any rule, so it can be left recursive
+            if self.__parse_expression(Variable(start.name)):
+                if self.__input.is_full_match():
+                    return self.__trees[-1]
+
+                # Only a prefix matched
+                self.__input.fail("")
         except VisitorError:
             return None
 
         return None
+
+    @property
+    def failure(self) -> Tuple[int, List[str]]:
+        """Return the furthest failure of the last parse, with the terminals
+        tried there and the first terminals of the alternatives skipped there
+
+        Returns:
+            Tuple[int, List[str]]: The failure position and what was expected
+                there, sorted, "" is the end of the input
+        """
+
+        position = max(self.__input.failure, self.__skipped_at)
+        expected = set()
+
+        if self.__input.failure == position:
+            expected |= self.__input.expected
+
+        if self.__skipped_at == position:
+            self.__input.current = position
+            character = self.__input.peek()
+            first_terminals = FirstTerminals(self.__environment)
+
+            for expression in self.__skipped.values():
+                tried = set(map(id, self.__dispatch[id(expression)].alternatives(character)))
+
+                for e in expression.values:
+                    if not id(e) in tried:
+                        expected |= first_terminals.first(e)
+
+        return position, sorted(expected)
+
+    def parse_events(
+        self,
+        start: Variable,
+        handler: EventHandler,
+        budget: Budget | None=None,
+        profile: Profile | None=None
+    ) -> bool:
+        """Match the input without keeping its tree, the rules and terminals
+        are sent to a handler once no alternative can backtrack them. Only the
+        subtrees of the alternatives being tried are built.
+
+        Args:
+            start (Variable): Grammar entry point rule
+            handler (EventHandler): Receives the matches, in the input order
+            budget (Budget | None, optional): The parse limits. Defaults to None.
+            profile (Profile | None, optional): Receives the rules counters. Defaults to None.
+
+        Raises:
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            bool: Is matched, the handler may have received the events
+                of a matched prefix otherwise
+        """
+
+        self.__trees = deque([EventTree(handler, self.__input.is_text)])
+
+        try:
+            return self.parse_input(start, budget, profile) is not None
+        finally:
+            self.__trees = deque([self.__new_tree()])
+
+    @property
+    def memo(self) -> Memo | None:
+        """Return the packrat cache
+
+        Returns:
+            Memo | None: The cache, None without the packrat mode
+        """
+
+        return self.__memo
+
+    def match_length(
+        self,
+        start: Variable,
+        budget: Budget | None=None,
+        profile: Profile | None=None
+    ) -> int:
+        """Match the grammar rules on the input prefix
+
+        Args:
+            start (Variable): Grammar entry point rule
+            budget (Budget | None, optional): The parse limits. Defaults to None.
+            profile (Profile | None, optional): Receives the rules counters. Defaults to None.
+
+        Raises:
+            ParseAbortedError: A limit of the budget is reached
+
+        Returns:
+            int: The matched prefix size, -1 if it doesnt match
+        """
+
+        self.__reset(budget, profile)
+
+        try:
+            if self.__parse_expression(Variable(start.name)):
+                return self.__input.current
+        except VisitorError:
+            return -1
+
+        return -1
@@ -0,0 +1,586 @@
+"""lalr module"""
+
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+from ..grammar import Grammar, Conflict, Symbol
+from ..expression import Variable
+
+from .tree import InputTree
+from .node import InputNode, Nodekind
+
+# Lookahead used at the end of the input
+END_OF_INPUT = ""
+
+# (production, dot)
+Item = Tuple[int, int]
+
+# Terminals of a state with an action grouped by length, longest first
+Expected = Tuple[Tuple[int, Dict[str, int]], ...]
+
+def columns(terminals: int) -> Iterator[int]:
+    """Return the columns of a terminals set
+
+    Args:
+        terminals (int): The terminals set, a bit by column
+
+    Yields:
+        int: A column, in increasing order
+    """
+
+    while terminals:
+        lowest = terminals & -terminals
+        yield lowest.bit_length() - 1
+        terminals ^= lowest
+
+class LALRTable: # pylint: disable=too-many-instance-attributes
+    """LALR(1) automaton of a flattened `Grammar` for a start rule.
+
+    The tables are sparse, so a grammar with many terminals fits in
+    memory. Per state, `actions` maps a terminal column to its action:
+    `s + 1` to shift then go to the state `s`, `-(p + 1)` to reduce the
+    production `p`, a missing column is an error. Reducing the augmented
+    production accepts the input. A state whose only action is the
+    reduction of a production reduces it by default, without reading the
+    lookahead, its `defaults` entry is the action and its row is empty.
+    Per state, `gotos` maps a rule to the next state.
+
+    The lookaheads are computed as terminals sets, a bit by column.
+    """
+
+    def __init__(self, grammar: Grammar, start: int):
+        self.grammar = grammar
+        self.start = start
+
+        # The augmented production is the last one
+        self.accept = len(grammar.productions)
+        self.__rhs: List[Tuple[Symbol, ...]] = \
+            [p.rhs for p in grammar.productions] + [(start,)]
+        self.lhs: List[int] = [p.lhs for p in grammar.productions] + [-1]
+        self.sizes = array("i", map(len, self.__rhs))
+
+        # Terminals columns, the end of the input is the first one
+        self.terminals: List[str] = [END_OF_INPUT]
+        self.__columns: Dict[str, int] = {END_OF_INPUT: 0}
+
+        for p in grammar.productions:
+            for s in p.rhs:
+                if isinstance(s, str) and not s in self.__columns:
+                    self.__columns[s] = len(self.terminals)
+                    self.terminals.append(s)
+
+        self.__first = self.__compute_first()
+
+        # LR(0) automaton
+        self.__kernels: List[Tuple[Item, ...]] = []
+        self.__transitions: List[Dict[Symbol, int]] = []
+
+        self.actions: List[Dict[int, int]] = []
+        self.defaults = array("i")
+        self.gotos: List[Dict[int, int]] = []
+        # Per state, the terminals having an action
+        self.expected: List[Expected] = []
+
+        self.conflicts: List[Conflict] = []
+        # Action cell (state, column) -> item that produced the action, for the conflicts
+        self.__cell_items: Dict[Tuple[int, int], Item] = {}
+
+        self.__build()
+
+    @property
+    def is_lalr(self) -> bool:
+        """Return if the grammar is LALR(1) from the start rule
+
+        Returns:
+            bool: Has no conflict
+        """
+
+        return len(self.conflicts) == 0
+
+    @property
+    def states(self) -> int:
+        """Return the automaton states count
+
+        Returns:
+            int: States count
+        """
+
+        return len(self.__kernels)
+
+    def parents(self, state: int, rule: int) -> List[Tuple[int, int]]:
+        """Return the rules of a state items expecting a rule next, they may
+        be the parent of a `rule` node reduced from this state
+
+        Args:
+            state (int): The state
+            rule (int): The rule id
+
+        Returns:
+            List[Tuple[int, int]]: The parent rules with their symbols count
+                before `rule`, -1 is the augmented start rule
+        """
+
+        return [
+            (self.lhs[p], dot)
+            for p, dot in self.__closure(self.__kernels[state])
+            if dot < len(self.__rhs[p]) and self.__rhs[p][dot] == rule
+        ]
+
+    def __compute_first(self) -> List[int]:
+        """Compute the first terminals of every rule
+
+        Returns:
+            List[int]: First terminals sets, per rule
+        """
+
+        grammar = self.grammar
+        first = [0] * len(grammar.names)
+
+        changed = True
+
+        while changed:
+            changed = False
+
+            for p in grammar.productions:
+                terminals, _ = self.__sequence_first(p.rhs, first)
+
+                if terminals & ~first[p.lhs]:
+                    first[p.lhs] |= terminals
+                    changed = True
+
+        return first
+
+    def __sequence_first(
+        self,
+        symbols: Tuple[Symbol, ...],
+        first: List[int] | None=None
+    ) -> Tuple[int, bool]:
+        """Return the first terminals of a symbols sequence
+
+        Args:
+            symbols (Tuple[Symbol, ...]): The symbols sequence
+            first (List[int] | None, optional): First terminals sets per rule. Defaults to None.
+
+        Returns:
+            Tuple[int, bool]: The first terminals set and if the sequence is nullable
+        """
+
+        if first is None:
+            first = self.__first
+
+        terminals = 0
+
+        for s in symbols:
+            if isinstance(s, str):
+                return terminals | 1 << self.__columns[s], False
+
+            terminals |= first[s]
+
+            if not self.grammar.nullable[s]:
+                return terminals, False
+
+        return terminals, True
+
+    def __closure(self, kernel: Tuple[Item, ...]) -> List[Item]:
+        """LR(0) closure of a kernel
+
+        Args:
+            kernel (Tuple[Item, ...]): Kernel items
+
+        Returns:
+            List[Item]: Every item of the state
+        """
+
+        items = list(kernel)
+        seen = set(kernel)
+
+        i = 0
+        while i < len(items):
+            p, dot = items[i]
+            i += 1
+
+            rhs = self.__rhs[p]
+
+            if dot == len(rhs) or isinstance(rhs[dot], str):
+                continue
+
+            for q in self.grammar.by_lhs[rhs[dot]]:
+                if not (q, 0) in seen:
+                    seen.add((q, 0))
+                    items.append((q, 0))
+
+        return items
+
+    def __build_automaton(self):
+        """Build the LR(0) states and transitions
+        """
+
+        indexes = {}
+
+        def state(kernel: Tuple[Item, ...]) -> int:
+            if not kernel in indexes:
+                indexes[kernel] = len(self.__kernels)
+                self.__kernels.append(kernel)
+                self.__transitions.append({})
+
+            return indexes[kernel]
+
+        state(((self.accept, 0),))
+
+        i = 0
+        while i < len(self.__kernels):
+            targets: Dict[Symbol, List[Item]] = {}
+
+            for p, dot in self.__closure(self.__kernels[i]):
+                rhs = self.__rhs[p]
+
+                if dot < len(rhs):
+                    targets.setdefault(rhs[dot], []).append((p, dot + 1))
+
+            for symbol, kernel in targets.items():
+                self.__transitions[i][symbol] = state(tuple(sorted(kernel)))
+
+            i += 1
+
+    def __lookahead_closure(self, kernel: Dict[Item, int]) -> Dict[Item, int]:
+        """LR(1) closure of a kernel, the lookaheads are sets
+
+        Args:
+            kernel (Dict[Item, int]): Kernel items lookaheads
+
+        Returns:
+            Dict[Item, int]: Every item of the state with its lookaheads
+        """
+
+        items = dict(kernel)
+        worklist = list(items)
+
+        while worklist:
+            p, dot = worklist.pop()
+            rhs = self.__rhs[p]
+
+            if dot == len(rhs) or isinstance(rhs[dot], str):
+                continue
+
+            lookaheads, nullable = self.__sequence_first(rhs[dot + 1:])
+
+            if nullable:
+                lookaheads |= items[(p, dot)]
+
+            for q in self.grammar.by_lhs[rhs[dot]]:
+                current = items.get((q, 0), 0)
+
+                if (q, 0) not in items or lookaheads & ~current:
+                    items[(q, 0)] = current | lookaheads
+                    worklist.append((q, 0))
+
+        return items
+
+    def __compute_lookaheads(self) -> List[Dict[Item, int]]:
+        """Propagate the lookaheads between the LR(0) states kernels
+        until a fixpoint is reached
+
+        Returns:
+            List[Dict[Item, int]]: Every item of every state with its lookaheads
+        """
+
+        kernels = [dict.fromkeys(kernel, 0) for kernel in self.__kernels]
+        # The end of the input is the first column
+        kernels[0][(self.accept, 0)] = 1
+
+        closures = [{} for _ in kernels]
+
+        changed = True
+
+        while changed:
+            changed = False
+
+            for state, kernel in enumerate(kernels):
+                closures[state] = self.__lookahead_closure(kernel)
+
+                for (p, dot), lookaheads in closures[state].items():
+                    rhs = self.__rhs[p]
+
+                    if dot == len(rhs):
+                        continue
+
+                    target = kernels[self.__transitions[state][rhs[dot]]]
+
+                    if lookaheads & ~target[(p, dot + 1)]:
+                        target[(p, dot + 1)] |= lookaheads
+                        changed = True
+
+        return closures
+
+    def __format_item(self, item: Item) -> str:
+        """Return a production representation, with the dot
+
+        Args:
+            item (Item): An item
+
+        Returns:
+            str: The production representation
+        """
+
+        p, dot = item
+
+        if p == self.accept:
+            return "<start> ::= " + self.grammar.names[self.start]
+
+        symbols = [
+            self.grammar.names[s] if isinstance(s, int) else '"' + s + '"'
+            for s in self.__rhs[p]
+        ]
+        symbols.insert(dot, ".")
+
+        return self.grammar.names[self.lhs[p]] + " ::= " + " ".join(symbols)
+
+    def __set_action(self, state: int, terminal: str, action: int, item: Item):
+        """Fill an action table cell, it records a conflict if the cell is
+        already used. Shifting is kept over reducing, the first production is
+        kept over the others.
+
+        Args:
+            state (int): The state
+            terminal (str): The lookahead terminal
+            action (int): The action
+            item (Item): The item that produced the action
+        """
+
+        row = self.actions[state]
+        index = (state, self.__columns[terminal])
+        other = row.get(index[1], 0)
+
+        if other == 0:
+            row[index[1]] = action
+            self.__cell_items[index] = item
+            return
+
+        if other == action:
+            return
+
+        if other > 0 or action > 0:
+            kind = "shift/reduce"
+        else:
+            kind = "reduce/reduce"
+
+        reduced = -action - 1 if action < 0 else -other - 1
+
+        self.conflicts.append(
+            Conflict(
+                kind,
+                self.grammar.names[self.lhs[reduced]],
+                terminal,
+                (
+                    self.__format_item(self.__cell_items[index]),
+                    self.__format_item(item)
+                )
+            )
+        )
+
+        if action > 0 or (other < 0 and action > other):
+            row[index[1]] = action
+            self.__cell_items[index] = item
+
+    def __build(self):
+        """Build the automaton then fill the action and goto tables
+        """
+
+        self.__build_automaton()
+
+        for state, closure in enumerate(self.__compute_lookaheads()):
+            self.__fill_state(state, closure)
+
+        self.__cell_items.clear()
+
+    def __fill_state(self, state: int, closure: Dict[Item, int]):
+        """Fill the action and goto tables rows of a state
+
+        Args:
+            state (int): The state
+            closure (Dict[Item, int]): The state items with their lookaheads
+        """
+
+        transitions = self.__transitions[state]
+
+        self.actions.append({})
+        self.gotos.append({s: t for s, t in transitions.items() if isinstance(s, int)})
+
+        reductions = [(p, dot) for p, dot in closure if dot == len(self.__rhs[p])]
+
+        # A single reduction without shift is done without the lookahead,
+        # an error is then found by the next states. Accepting needs the end of the input
+        if (
+            len(reductions) == 1
+            and reductions[0][0] != self.accept
+            and all(isinstance(s, int) for s in transitions)
+        ):
+            self.defaults.append(-reductions[0][0] - 1)
+            self.expected.append(())
+            return
+
+        self.defaults.append(0)
+
+        # Shifts first, so they are kept over the reductions
+        for (p, dot) in closure:
+            rhs = self.__rhs[p]
+
+            if dot < len(rhs) and isinstance(rhs[dot], str):
+                self.__set_action(state, rhs[dot], transitions[rhs[dot]] + 1, (p, dot))
+
+        for item in reductions:
+            terminals = sorted(self.terminals[c] for c in columns(closure[item]))
+
+            for terminal in terminals:
+                self.__set_action(state, terminal, -item[0] - 1, item)
+
+        by_length: Dict[int, Dict[str, int]] = {}
+
+        for column in sorted(self.actions[state]):
+            if column > 0:
+                terminal = self.terminals[column]
+                by_length.setdefault(len(terminal), {})[terminal] = column
+
+        self.expected.append(tuple(sorted(by_length.items(), reverse=True)))
+
+class LALRParser:
+    """Shift-reduce parser driven by a `LALRTable`, it produces the same
+    kind of tree as `InputParser` without any recursion.
+
+    The input is split on the fly, in each state the longest terminal
+    having an action is used as the lookahead.
+    """
+
+    def __init__(self, source: str, table: LALRTable):
+        self.__source = source
+        self.__table = table
+
+    def __lookahead(self, state: int, position: int) -> int | None:
+        """Return the lookahead terminal column at a position
+
+        Args:
+            state (int): The current state
+            position (int): The input position
+
+        Returns:
+            int | None: The terminal column, None if nothing matches
+        """
+
+        source = self.__source
+
+        if position >= len(source):
+            return 0
+
+        for length, group in self.__table.expected[state]:
+            column = group.get(source[position:position + length])
+
+            if column is not None:
+                return column
+
+        return None
+
+    def __reduce(self, production: int, states: List[int], values: List[List[InputNode]]):
+        """Pop the production symbols then push its rule
+
+        Args:
+            production (int): The reduced production
+            states (List[int]): The states stack
+            values (List[List[InputNode]]): The nodes stack
+        """
+
+        table = self.__table
+        grammar = table.grammar
+
+        size = table.sizes[production]
+        symbols = grammar.productions[production].symbols
+        children = []
+
+        # The empty terminals are not shifted, their nodes are added here
+        groups = iter(values[len(values) - size:])
+
+        for symbol in symbols:
+            if symbol == "":
+                children.append(InputNode(Nodekind.VALUE, ""))
+            else:
+                children.extend(next(groups))
+
+        if size > 0:
+            del states[-size:]
+            del values[-size:]
+
+        lhs = table.lhs[production]
+
+        # Hidden rules children belong to their parent
+        if grammar.hidden[lhs]:
+            values.append(children)
+        else:
+            node = InputNode(Nodekind.VARIABLE, grammar.names[lhs], None, children)
+
+            for child in children:
+                child.parent = node
+
+            values.append([node])
+
+        states.append(table.gotos[states[-1]][lhs])
+
+    def parse_input(self, start: Variable) -> InputTree | None:
+        """Produce an AST based on the grammar rules
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            InputTree | None: Return None if it doest match, otherwise, it returns the tree
+        """
+
+        table = self.__table
+
+        if table.grammar.rules[start.name.lexeme] != table.start:
+            return None
+
+        states = [0]
+        # Nodes produced by every stack symbol, hidden rules produce many
+        values: List[List[InputNode]] = []
+        position = 0
+
+        while True:
+            state = states[-1]
+            action = table.defaults[state]
+
+            # Default reduction, without the lookahead
+            if action < 0:
+                self.__reduce(-action - 1, states, values)
+                continue
+
+            column = self.__lookahead(state, position)
+
+            if column is None:
+                return None
+
+            action = table.actions[state].get(column, 0)
+
+            if action == 0:
+                return None
+
+            # Shift
+            if action > 0:
+                terminal = table.terminals[column]
+
+                states.append(action - 1)
+                values.append([InputNode(Nodekind.VALUE, terminal)])
+                position += len(terminal)
+                continue
+
+            # Reduce, the augmented production accepts the input
+            if -action - 1 == table.accept:
+                break
+
+            self.__reduce(-action - 1, states, values)
+
+        tree = InputTree()
+
+        for node in values[-1]:
+            node.parent = tree.root
+            tree.add_children(node)
+
+        return tree
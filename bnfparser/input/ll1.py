@@ -0,0 +1,287 @@
+"""ll1 module"""
+
+from typing import List, Dict, Set, Tuple
+
+from ..grammar import Grammar, Conflict
+from ..expression import Variable
+
+from .tree import InputTree
+from .events import EventHandler
+from .node import InputNode, Nodekind
+
+# Lookahead used at the end of the input
+END_OF_INPUT = ""
+
+class LL1Table:
+    """LL(1) parse table of a flattened `Grammar` for a start rule.
+    The lookahead is the next input character, only the rules reachable
+    from the start rule are in the table.
+    """
+
+    def __init__(self, grammar: Grammar, start: int):
+        self.grammar = grammar
+        self.start = start
+
+        # Per rule, lookahead -> production
+        self.table: List[Dict[str, int]] = [{} for _ in grammar.names]
+        # Per production, its right hand side reversed for the stack machine,
+        # the empty terminals are kept to build the same nodes as `InputParser`
+        self.reversed_rhs = [p.symbols[::-1] for p in grammar.productions]
+
+        self.conflicts: List[Conflict] = []
+
+        self.__build()
+
+    @property
+    def is_ll1(self) -> bool:
+        """Return if the grammar is LL(1) from the start rule
+
+        Returns:
+            bool: Has no conflict
+        """
+
+        return len(self.conflicts) == 0
+
+    def __follow(self, rules: List[int]) -> List[Set[str]]:
+        """Compute the follow characters of the reachable rules
+
+        Args:
+            rules (List[int]): The reachable rules ids
+
+        Returns:
+            List[Set[str]]: The follow characters, per rule
+        """
+
+        grammar = self.grammar
+
+        follow = [set() for _ in grammar.names]
+        follow[self.start].add(END_OF_INPUT)
+
+        changed = True
+
+        while changed:
+            changed = False
+
+            for lhs in rules:
+                for p in grammar.by_lhs[lhs]:
+                    rhs = grammar.productions[p].rhs
+
+                    for i, s in enumerate(rhs):
+                        if isinstance(s, str):
+                            continue
+
+                        first, nullable = grammar.sequence_first(rhs[i + 1:])
+
+                        if nullable:
+                            first |= follow[lhs]
+
+                        if not first <= follow[s]:
+                            follow[s] |= first
+                            changed = True
+
+        return follow
+
+    def __set(self, rule: int, lookahead: str, production: int):
+        """Fill a table cell, it records a conflict if the cell is already used
+
+        Args:
+            rule (int): The rule id
+            lookahead (str): The lookahead character
+            production (int): The production index
+        """
+
+        cell = self.table[rule]
+        other = cell.get(lookahead)
+
+        if other is None:
+            cell[lookahead] = production
+            return
+
+        if other == production:
+            return
+
+        grammar = self.grammar
+        firsts = (
+            grammar.sequence_first(grammar.productions[other].rhs)[0],
+            grammar.sequence_first(grammar.productions[production].rhs)[0]
+        )
+
+        if all(lookahead in first for first in firsts):
+            kind = "FIRST/FIRST"
+        else:
+            kind = "FIRST/FOLLOW"
+
+        self.conflicts.append(
+            Conflict(
+                kind,
+                grammar.names[rule],
+                lookahead,
+                (grammar.format_production(other), grammar.format_production(production))
+            )
+        )
+
+    def __build(self):
+        """Fill the parse table from the first and follow characters
+        """
+
+        grammar = self.grammar
+        rules = grammar.reachable(self.start)
+        follow = self.__follow(rules)
+
+        for rule in rules:
+            for p in grammar.by_lhs[rule]:
+                first, nullable = grammar.sequence_first(grammar.productions[p].rhs)
+
+                if nullable:
+                    first = first | follow[rule]
+
+                for lookahead in sorted(first):
+                    self.__set(rule, lookahead, p)
+
+class LL1Parser:
+    """Non backtracking predictive parser driven by a `LL1Table`,
+    it produces the same kind of tree as `InputParser`
+    """
+
+    def __init__(self, source: str, table: LL1Table):
+        self.__source = source
+        self.__table = table
+
+        # Position where the last parse failed and what was expected there
+        self.__failure: Tuple[int, List[str]] = (0, [])
+
+    @property
+    def failure(self) -> Tuple[int, List[str]]:
+        """Return where the last parse failed, nothing is backtracked so it
+        is the furthest position
+
+        Returns:
+            Tuple[int, List[str]]: The failure position and the expected
+                terminal or lookahead characters, sorted, "" is the end of the input
+        """
+
+        return self.__failure
+
+    def parse_input(self, start: Variable) -> InputTree | None:
+        """Produce an AST based on the grammar rules
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            InputTree | None: Return None if it doest match, otherwise, it returns the tree
+        """
+
+        grammar = self.__table.grammar
+        table = self.__table.table
+        reversed_rhs = self.__table.reversed_rhs
+        source = self.__source
+        size = len(source)
+
+        tree = InputTree()
+        node = tree.root
+        position = 0
+
+        # A `None` closes the current node
+        stack = [grammar.rules[start.name.lexeme]]
+
+        while stack:
+            symbol = stack.pop()
+
+            if symbol is None:
+                node = node.parent
+                continue
+
+            if isinstance(symbol, str):
+                if not source.startswith(symbol, position):
+                    self.__failure = (position, [symbol])
+                    return None
+
+                position += len(symbol)
+                node.childrens.append(InputNode(Nodekind.VALUE, symbol, node))
+                continue
+
+            lookahead = source[position] if position < size else END_OF_INPUT
+            production = table[symbol].get(lookahead)
+
+            if production is None:
+                self.__failure = (position, sorted(table[symbol]))
+                return None
+
+            # Hidden rules children belong to their parent
+            if not grammar.hidden[symbol]:
+                parent = node
+                node = InputNode(Nodekind.VARIABLE, grammar.names[symbol], parent)
+                parent.childrens.append(node)
+                stack.append(None)
+
+            stack.extend(reversed_rhs[production])
+
+        if position != size:
+            self.__failure = (position, [END_OF_INPUT])
+            return None
+
+        return tree
+
+    def parse_events(self, start: Variable, handler: EventHandler) -> bool:
+        """Match the input without building its tree, every rule and terminal
+        is sent to a handler as soon as it is predicted, nothing is backtracked
+
+        Args:
+            start (Variable): Grammar entry point rule
+            handler (EventHandler): Receives the matches, in the input order
+
+        Returns:
+            bool: Is matched, the handler may have received the events
+                of a matched prefix otherwise
+        """
+
+        grammar = self.__table.grammar
+        table = self.__table.table
+        source = self.__source
+        size = len(source)
+
+        position = 0
+
+        # Rules being matched, (name, start)
+        rules = []
+
+        # A `None` closes the last rule
+        stack = [grammar.rules[start.name.lexeme]]
+
+        while stack:
+            symbol = stack.pop()
+
+            if symbol is None:
+                name, rule_start = rules.pop()
+                handler.on_exit(name, rule_start, position)
+                continue
+
+            if isinstance(symbol, str):
+                if not source.startswith(symbol, position):
+                    self.__failure = (position, [symbol])
+                    return False
+
+                handler.on_terminal(symbol, position, position + len(symbol))
+                position += len(symbol)
+                continue
+
+            lookahead = source[position] if position < size else END_OF_INPUT
+            production = table[symbol].get(lookahead)
+
+            if production is None:
+                self.__failure = (position, sorted(table[symbol]))
+                return False
+
+            if not grammar.hidden[symbol]:
+                rules.append((grammar.names[symbol], position))
+                handler.on_enter(grammar.names[symbol], position)
+                stack.append(None)
+
+            stack.extend(self.__table.reversed_rhs[production])
+
+        if position != size:
+            self.__failure = (position, [END_OF_INPUT])
+            return False
+
+        return True
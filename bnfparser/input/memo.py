@@ -0,0 +1,126 @@
+"""memo module"""
+
+from typing import Dict, List, Tuple
+
+from .node import InputNode
+
+# Rule result, (end position or -1, node, furthest examined position)
+Entry = Tuple[int, InputNode | None, int]
+
+# Replaced input range, (start, old end, new end)
+Edit = Tuple[int, int, int]
+
+# Beyond this number of chained caches, the previous results are dropped
+MAX_CHAIN_SIZE = 16
+
+class Memo:
+    """Packrat cache of the backtracking engine, (rule name, input position) -> `Entry`.
+
+    It can be built over the cache of a previous parse and the edits made
+    to its input since. A previous result is reused if the rule never
+    examined the edited range, its positions are shifted when it is after
+    the edits.
+    """
+
+    def __init__(self, previous: "Memo | None"=None, edits: List[Edit] | None=None):
+        self.entries: Dict[Tuple[str, int], Entry] = {}
+
+        self.__previous = previous
+        self.__edits = edits or []
+
+        if previous is not None and previous.chain_size >= MAX_CHAIN_SIZE:
+            self.__previous = None
+
+    @property
+    def chain_size(self) -> int:
+        """Return the number of chained caches
+
+        Returns:
+            int: The chain size
+        """
+
+        if self.__previous is None:
+            return 1
+
+        return self.__previous.chain_size + 1
+
+    def clear(self):
+        """Remove the entries of this parse, the previous ones are kept
+        """
+
+        self.entries.clear()
+
+    def get(self, name: str, position: int) -> Entry | None:
+        """Return a rule result at a position
+
+        Args:
+            name (str): The rule name
+            position (int): The input position
+
+        Returns:
+            Entry | None: The result, None if it is unknown
+        """
+
+        entry = self.entries.get((name, position))
+
+        if entry is not None or self.__previous is None:
+            return entry
+
+        entry = self.__reuse(name, position)
+
+        if entry is not None:
+            self.entries[(name, position)] = entry
+
+        return entry
+
+    def set(self, name: str, position: int, entry: Entry):
+        """Store a rule result at a position
+
+        Args:
+            name (str): The rule name
+            position (int): The input position
+            entry (Entry): The result
+        """
+
+        self.entries[(name, position)] = entry
+
+    def __reuse(self, name: str, position: int) -> Entry | None:
+        """Look for a result of the previous parse still valid after the edits
+
+        Args:
+            name (str): The rule name
+            position (int): The input position
+
+        Returns:
+            Entry | None: The shifted result, None if there is none
+        """
+
+        # Position before the edits
+        old = position
+
+        for start, old_end, new_end in reversed(self.__edits):
+            if old >= new_end:
+                old -= new_end - old_end
+            elif old >= start:
+                return None
+
+        entry = self.__previous.get(name, old)
+
+        if entry is None:
+            return None
+
+        end, node, examined = entry
+
+        for start, old_end, new_end in self.__edits:
+            if examined <= start:
+                continue
+
+            if old < old_end:
+                return None
+
+            delta = new_end - old_end
+            old += delta
+            examined += delta
+            end = end + delta if end >= 0 else end
+
+        return end, node, examined
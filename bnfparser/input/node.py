@@ -23,6 +23,9 @@ class BaseInputNode:
     value: str = ""
     parent: Union["InputNode", None] = None
     childrens: List["InputNode"] = field(default_factory=list)
+    # Input offsets of the matched text
+    start: int = 0
+    end: int = 0
 
     def __str__(self) -> str:
         ret = (self.node_kind, self.value)
@@ -0,0 +1,96 @@
+"""profile module"""
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict
+
+# Columns of `Profile.table`, (counter, header)
+COLUMNS = (
+    ("invocations", "calls"),
+    ("matches", "matches"),
+    ("failures", "failures"),
+    ("consumed", "consumed"),
+    ("backtracked", "backtracked"),
+    ("time", "time (s)"),
+)
+
+@dataclass
+class RuleProfile:
+    """Counters of a rule
+    """
+
+    invocations: int = 0
+    matches: int = 0
+    failures: int = 0
+    # Input characters (bytes for a binary input) matched by the rule
+    consumed: int = 0
+    # `Or` alternatives tried by the rule then discarded
+    backtracked: int = 0
+    # Seconds spent in the rule and its nested rules, a recursive call is counted once
+    time: float = 0.0
+
+class Profile:
+    """Per rule counters of the backtracking engine parses, they are
+    accumulated until `clear` is called. It is not thread safe.
+    """
+
+    def __init__(self):
+        self.rules: Dict[str, RuleProfile] = {}
+
+    def rule(self, name: str) -> RuleProfile:
+        """Return the counters of a rule, created on the first call
+
+        Args:
+            name (str): The rule name
+
+        Returns:
+            RuleProfile: The counters
+        """
+
+        ret = self.rules.get(name)
+
+        if ret is None:
+            ret = self.rules[name] = RuleProfile()
+
+        return ret
+
+    def clear(self):
+        """Remove every counter
+        """
+
+        self.rules.clear()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Return the counters of every rule, the slowest first
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The counters by rule name
+        """
+
+        rules = sorted(self.rules.items(), key=lambda item: item[1].time, reverse=True)
+
+        return {name: asdict(rule) for name, rule in rules}
+
+    def table(self) -> str:
+        """Return the report as a text table
+
+        Returns:
+            str: The table
+        """
+
+        rows = [["rule"] + [header for _, header in COLUMNS]]
+
+        for name, counters in self.report().items():
+            rows.append([name] + [
+                f"{counters[key]:.6f}" if key == "time" else str(counters[key])
+                for key, _ in COLUMNS
+            ])
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        )
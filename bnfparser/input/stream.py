@@ -0,0 +1,349 @@
+"""stream module"""
+
+from typing import Dict, List, Set, Iterable, Iterator, Tuple
+
+from ..error import CoreError
+from .lalr import LALRTable
+from .tree import InputTree
+from .node import InputNode, Nodekind
+
+class PushParser: # pylint: disable=too-many-instance-attributes
+    """Incremental shift-reduce parser driven by a `LALRTable`, the input is
+    pushed by chunks. It never backtracks, so only the characters that can
+    still be part of the next terminal are kept.
+
+    The completed nodes of the emitted rules are returned as soon as they
+    are reduced, they can no longer change. A right recursive rule is only
+    reduced at the end of its repetition, its repeated rule should be
+    emitted instead. In the final tree the outermost emitted nodes are
+    replaced by nodes without childrens, so they are not kept in memory.
+    The nodes nested in an emitted rule keep their childrens.
+    """
+
+    def __init__(self, table: LALRTable, rules: Set[int]):
+        self.__table = table
+        self.__rules = rules
+
+        self.__states = [0]
+        # Nodes produced by every stack symbol, hidden rules produce many
+        self.__values: List[List[InputNode]] = []
+
+        # `LALRTable.parents` results, by (state, rule)
+        self.__parents: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # Per stack state, the rules known to have no emitted ancestor
+        # when they start at this state
+        self.__outermost: List[Set[int]] = [set()]
+
+        # Unconsumed input window, `offset` is its position in the whole input
+        self.__buffer = ""
+        self.__position = 0
+        self.__offset = 0
+
+        self.__ready: List[InputNode] = []
+        self.__closed = False
+        self.__failed = False
+        self.__tree = None
+
+    @property
+    def failed(self) -> bool:
+        """Return if the input cannot match anymore
+
+        Returns:
+            bool: Has failed
+        """
+
+        return self.__failed
+
+    @property
+    def tree(self) -> InputTree | None:
+        """Return the final tree once the parser is closed
+
+        Returns:
+            InputTree | None: None if it doesnt match or if it is not closed
+        """
+
+        return self.__tree
+
+    def __lookahead(self, state: int) -> int | None:
+        """Return the lookahead terminal column at the current position
+
+        Args:
+            state (int): The current state
+
+        Returns:
+            int | None: The terminal column, -1 if nothing matches,
+                None if more input is needed
+        """
+
+        buffer, position = self.__buffer, self.__position
+        rest = len(buffer) - position
+
+        if rest == 0:
+            return 0 if self.__closed else None
+
+        for length, group in self.__table.expected[state]:
+            if rest >= length:
+                column = group.get(buffer[position:position + length])
+
+                if column is not None:
+                    return column
+            elif not self.__closed and any(t.startswith(buffer[position:]) for t in group):
+                # A longer terminal could still match
+                return None
+
+        return -1
+
+    def __pop_children(self, production: int, position: int) -> List[InputNode]:
+        """Pop the production symbols, the empty terminals are not shifted
+        so their nodes are added here. The production ends at the current
+        position, each of them starts where the next symbol starts
+
+        Args:
+            production (int): The reduced production
+            position (int): The current position
+
+        Returns:
+            List[InputNode]: The production childrens
+        """
+
+        table = self.__table
+        values = self.__values
+
+        size = table.sizes[production]
+        groups = reversed(values[len(values) - size:])
+        children = []
+
+        for symbol in reversed(table.grammar.productions[production].symbols):
+            if symbol == "":
+                children.append(InputNode(Nodekind.VALUE, "", None, [], position, position))
+                continue
+
+            group = next(groups)
+            children.extend(reversed(group))
+
+            if group:
+                position = group[0].start
+
+        children.reverse()
+
+        if size > 0:
+            del self.__states[-size:]
+            del values[-size:]
+            del self.__outermost[len(self.__states):]
+
+        return children
+
+    def __is_nested(self, rule: int) -> bool:
+        """Return if an emitted rule may be an ancestor of a `rule` node just
+        reduced, the parent rules are walked back on the states stack.
+        The rules found without emitted ancestor are kept for the next calls
+
+        Args:
+            rule (int): The reduced rule id
+
+        Returns:
+            bool: May be nested in an emitted rule
+        """
+
+        states, outermost = self.__states, self.__outermost
+        outermost += [set() for _ in range(len(states) - len(outermost))]
+
+        visited = {(rule, len(states) - 1)}
+        stack = list(visited)
+
+        while stack:
+            symbol, index = stack.pop()
+
+            if symbol in outermost[index]:
+                continue
+
+            key = (states[index], symbol)
+
+            if key not in self.__parents:
+                self.__parents[key] = self.__table.parents(*key)
+
+            for lhs, dot in self.__parents[key]:
+                if lhs in self.__rules:
+                    return True
+
+                parent = (lhs, index - dot)
+
+                if lhs >= 0 and parent not in visited:
+                    visited.add(parent)
+                    stack.append(parent)
+
+        # None of the walked rules has an emitted ancestor
+        for symbol, index in visited:
+            outermost[index].add(symbol)
+
+        return False
+
+    def __reduce(self, production: int):
+        """Pop the production symbols then push its rule
+
+        Args:
+            production (int): The reduced production
+        """
+
+        table = self.__table
+        grammar = table.grammar
+        states, values = self.__states, self.__values
+
+        position = self.__offset + self.__position
+        children = self.__pop_children(production, position)
+
+        lhs = table.lhs[production]
+
+        # Hidden rules children belong to their parent
+        if grammar.hidden[lhs]:
+            values.append(children)
+        else:
+            start = children[0].start if children else position
+            end = children[-1].end if children else position
+
+            node = InputNode(Nodekind.VARIABLE, grammar.names[lhs], None, children, start, end)
+
+            for child in children:
+                child.parent = node
+
+            if lhs in self.__rules:
+                self.__ready.append(node)
+
+                # An emitted ancestor needs the childrens
+                if not self.__is_nested(lhs):
+                    node = InputNode(Nodekind.VARIABLE, node.value, None, [], start, end)
+
+            values.append([node])
+
+        states.append(table.gotos[states[-1]][lhs])
+
+    def __accept(self):
+        """Build the final tree
+        """
+
+        tree = InputTree()
+
+        for node in self.__values[-1]:
+            node.parent = tree.root
+            tree.add_children(node)
+
+        tree.root.end = self.__offset + self.__position
+
+        self.__tree = tree
+
+    def __run(self) -> List[InputNode]:
+        """Shift and reduce as long as the lookahead is known
+
+        Returns:
+            List[InputNode]: The emitted nodes
+        """
+
+        table = self.__table
+
+        self.__ready = []
+
+        while not self.__failed and self.__tree is None:
+            state = self.__states[-1]
+
+            # Default reduction, without the lookahead
+            if table.defaults[state] < 0:
+                self.__reduce(-table.defaults[state] - 1)
+                continue
+
+            column = self.__lookahead(state)
+
+            if column is None:
+                break
+
+            action = table.actions[state].get(column, 0) if column >= 0 else 0
+
+            if action == 0:
+                self.__failed = True
+                break
+
+            # Shift
+            if action > 0:
+                terminal = table.terminals[column]
+                start = self.__offset + self.__position
+
+                self.__states.append(action - 1)
+                self.__values.append([
+                    InputNode(Nodekind.VALUE, terminal, None, [], start, start + len(terminal))
+                ])
+                self.__position += len(terminal)
+                continue
+
+            # Reduce, the augmented production accepts the input
+            if -action - 1 == table.accept:
+                self.__accept()
+            else:
+                self.__reduce(-action - 1)
+
+        # Only the unconsumed input is kept
+        self.__offset += self.__position
+        self.__buffer = self.__buffer[self.__position:]
+        self.__position = 0
+
+        return self.__ready
+
+    def feed(self, chunk: str) -> List[InputNode]:
+        """Push the next input chunk
+
+        Args:
+            chunk (str): The input chunk, the binary chunks read from a pipe
+                or a socket must be decoded first, with an incremental decoder
+
+        Raises:
+            CoreError: The chunk is binary
+
+        Returns:
+            List[InputNode]: The nodes completed by this chunk
+        """
+
+        if not isinstance(chunk, str):
+            raise CoreError("Binary inputs are only available with the backtracking engine")
+
+        if self.__closed or self.__failed:
+            return []
+
+        self.__buffer += chunk
+
+        return self.__run()
+
+    def close(self) -> List[InputNode]:
+        """Mark the end of the input, the final tree is then available with `tree`
+
+        Returns:
+            List[InputNode]: The last completed nodes
+        """
+
+        if self.__closed:
+            return []
+
+        self.__closed = True
+
+        if self.__failed:
+            return []
+
+        ready = self.__run()
+
+        if self.__tree is None:
+            self.__failed = True
+
+        return ready
+
+    def iterparse(self, chunks: Iterable[str]) -> Iterator[InputNode]:
+        """Push every chunk of an iterable then close the parser
+
+        Args:
+            chunks (Iterable[str]): The input chunks, a file can be read with
+                `iter(lambda: f.read(size), "")`
+
+        Yields:
+            InputNode: A completed node
+        """
+
+        for chunk in chunks:
+            yield from self.feed(chunk)
+
+        yield from self.close()
@@ -1,8 +1,12 @@
 """input tree module"""
 
-import graphviz
+from typing import TYPE_CHECKING, Any, List
 
-from .node import InputNode
+from .node import InputNode, Nodekind
+from .memo import Memo, Edit
+
+if TYPE_CHECKING:
+    import graphviz
 
 class BaseInputTree:
     """Represents the input AST
@@ -12,6 +16,14 @@ class BaseInputTree:
         self.root = InputNode()
         self.current = self.root
 
+        # Parsed input, the nodes text is sliced from it on demand
+        self.source = ""
+
+        # Packrat cache of the parse and the input edits made since,
+        # used to reparse only the edited regions
+        self.memo: Memo | None = None
+        self.edits: List[Edit] = []
+
     def reset(self):
         """Reset the tree members
         """
@@ -22,12 +34,15 @@ class BaseInputTree:
     def __create_node(self, node_kind: str, value: str) -> InputNode:
         return InputNode(node_kind, value, self.current)
 
-    def add_and_forward(self, node_kind: str, value: str):
+    def add_and_forward(self, node_kind: str, value: str) -> InputNode:
         """Call `self.add` the move the current cursor on the new added node
 
         Args:
             node_kind (str): The node type
             value (str): The node value
+
+        Returns:
+            InputNode: Returns the added node
         """
 
         # Add the node
@@ -36,6 +51,8 @@ class BaseInputTree:
         # Go forward on the node
         self.current = node
 
+        return node
+
     def add_children(self, node: InputNode):
         """Add a children to the current node
 
@@ -62,6 +79,67 @@ class BaseInputTree:
 
         return node
 
+    def set_source(self, source: Any):
+        """Set the parsed input then compute every node span from the
+        terminals sizes, the values are never copied from the input.
+        The spans of a binary input are byte offsets.
+
+        Args:
+            source (Any): The parsed input, a string or a binary one
+        """
+
+        self.source = source
+        is_text = isinstance(source, str)
+
+        position = 0
+        stack = [(self.root, iter(self.root.childrens))]
+
+        while stack:
+            node, childrens = stack[-1]
+            child = next(childrens, None)
+
+            if child is None:
+                node.end = position
+                stack.pop()
+                continue
+
+            child.start = position
+
+            if child.node_kind == Nodekind.VALUE:
+                if is_text or child.value.isascii():
+                    position += len(child.value)
+                else:
+                    position += len(child.value.encode())
+
+                child.end = position
+            else:
+                stack.append((child, iter(child.childrens)))
+
+    def edit(self, start: int, old_end: int, new_end: int):
+        """Record an input edit, the range [start, old_end) is replaced with
+        the new range [start, new_end). The edits are applied by `Bnf.reparse`,
+        the nodes spans are not updated.
+
+        Args:
+            start (int): The edit start position
+            old_end (int): The replaced range end, in the parsed input
+            new_end (int): The new range end, in the edited input
+        """
+
+        self.edits.append((start, old_end, new_end))
+
+    def text(self, node: InputNode) -> Any:
+        """Return the input matched by a node
+
+        Args:
+            node (InputNode): A node of this tree
+
+        Returns:
+            Any: The matched input, a slice of the source
+        """
+
+        return self.source[node.start:node.end]
+
     def _debug(self):
         """BFS print to debug the tree
         """
@@ -96,49 +174,38 @@ class BaseInputTree:
 
         self.current = parent
 
-class InputTree(graphviz.Graph, BaseInputTree):
-    """Graphviz controller inheriting `BaseTreeInput`
-
-    Args:
-        graphviz (graphviz.Graph): graphviz.Graph
-        BaseInputTree (BaseInputTree): BaseInputTree
+class NullTree(BaseInputTree):
+    """Tree ignoring every node, used to match an input without building
+    its tree
     """
 
-    def build_graph(self):
-        """Link every node with Graphviz"""
-
-        def dfs(node: InputNode):
-            """Link every node with Graphviz
+    def reset(self):
+        return
 
-            Args:
-                node (Node): Node
-            """
+    def add_and_forward(self, node_kind: str, value: str) -> None:
+        return None
 
-            if node.parent is None:
-                for children in node.childrens:
-                    dfs(children)
+    def add_children(self, node: InputNode):
+        return
 
-                return
+    def add(self, node_kind: str, value: str) -> None:
+        return None
 
-            # Parent
-            self.node(
-                node.name,
-                node.value,
-                **node.attrs,
-            )
+    def back(self):
+        return
 
-            # Childrens
-            for children in node.childrens:
-                self.node(
-                    children.name,
-                    children.value,
-                    **children.attrs,
-                )
+class InputTree(BaseInputTree):
+    """Plain input tree, it can be exported as a Graphviz graph
+    """
 
-                self.edge(node.name, children.name)
+    def build_graph(self) -> "graphviz.Graph":
+        """Link every node with Graphviz, it is imported on the first call
 
-                dfs(children)
+        Returns:
+            graphviz.Graph: The graph
+        """
 
-        dfs(self.root)
+        # Imported here, graphviz is only needed to render a tree
+        from .graph import build_graph # pylint: disable=import-outside-toplevel
 
-        return self
+        return build_graph(self)
@@ -0,0 +1,515 @@
+"""vm module"""
+
+from array import array
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import List, Any, Dict, Tuple, Set, Iterator
+
+from .expression import Visitor, Terminal, NonTerminal, \
+    Variable, Or, Assignment, Group, Expression
+from .resolver import Environment
+from .grammar import GrammarBuilder
+
+from .input.tree import InputTree
+from .input.node import InputNode, Nodekind
+from .input.compact import CompactTree
+
+class Opcode(IntEnum):
+    """Represents every parsing machine instructions, each one has
+    an integer argument
+    """
+
+    # Match a single character, the argument is a constant index
+    CHAR = 0
+    # Match a string, the argument is a constant index
+    STRING = 1
+    # Call the rule at the argument address
+    CALL = 2
+    RETURN = 3
+    # Push a choice frame, the argument is the next alternative address
+    CHOICE = 4
+    # Set the next alternative address of the choice frame
+    RETRY = 5
+    # Record the alternative end, then backtrack to the next alternative
+    COMMIT = 6
+    # Pop the choice frame and keep its longest alternative
+    LONGEST = 7
+    FAIL = 8
+    # Fail if the rule (argument) is already running at this position
+    GUARD = 9
+    # Captures delimiting a rule (argument) node
+    OPEN = 10
+    CLOSE = 11
+    END = 12
+
+# Plain integers for the interpreter loop, comparing enum members is slow
+CHAR, STRING, CALL, RETURN, CHOICE, RETRY, COMMIT, LONGEST, \
+    FAIL, GUARD, OPEN, CLOSE, END = map(int, Opcode)
+
+@dataclass(frozen=True)
+class Program:
+    """Compiled grammar, the instructions are (opcode, argument) pairs
+    stored in a flat `array`, it is cheap to cache and to pickle
+    """
+
+    code: array
+    constants: Tuple[str, ...]
+    names: Tuple[str, ...]
+    entries: Dict[str, int]
+
+    def disassemble(self) -> str:
+        """Return a readable listing of the instructions
+
+        Returns:
+            str: The listing
+        """
+
+        labels = {address: name for name, address in self.entries.items()}
+        lines = []
+
+        for address in range(0, len(self.code), 2):
+            opcode, argument = Opcode(self.code[address]), self.code[address + 1]
+
+            if address in labels:
+                lines.append(labels[address] + ":")
+
+            if opcode in (Opcode.CHAR, Opcode.STRING):
+                operand = repr(self.constants[argument])
+            elif opcode in (Opcode.GUARD, Opcode.OPEN):
+                operand = self.names[argument]
+            elif opcode in (Opcode.CALL, Opcode.CHOICE, Opcode.RETRY):
+                operand = str(argument)
+            else:
+                operand = ""
+
+            lines.append(f"{address:>6}  {opcode.name:<8}{operand}")
+
+        return "\n".join(lines)
+
+class ProgramCompiler(Visitor):
+    """`Visitor` implementation that compiles a grammar into a `Program`.
+    It has the same semantic as `InputParser`: an `Or` keeps its longest
+    alternative. But a left recursive rule called again at the same
+    position fails, its result is not grown, so `Bnf` rejects the left
+    recursive grammars with this engine.
+    """
+
+    def __init__(self):
+        self.__code = []
+        self.__constants: Dict[str, int] = {}
+        self.__rules: Dict[str, int] = {}
+        self.__left_recursive = set()
+
+        # CALL instructions addresses waiting for their rule address
+        self.__calls: List[Tuple[int, str]] = []
+
+    def __emit(self, opcode: Opcode, argument: int=0) -> int:
+        """Append an instruction
+
+        Args:
+            opcode (Opcode): The opcode
+            argument (int, optional): The argument. Defaults to 0.
+
+        Returns:
+            int: The instruction address
+        """
+
+        address = len(self.__code)
+        self.__code += [opcode, argument]
+
+        return address
+
+    def __patch(self, address: int, argument: int):
+        """Set the argument of an emitted instruction
+
+        Args:
+            address (int): The instruction address
+            argument (int): The argument
+        """
+
+        self.__code[address + 1] = argument
+
+    def __constant(self, value: str) -> int:
+        """Return the index of a constant string
+
+        Args:
+            value (str): The string
+
+        Returns:
+            int: Its index
+        """
+
+        if not value in self.__constants:
+            self.__constants[value] = len(self.__constants)
+
+        return self.__constants[value]
+
+    def visit_terminal_expression(self, expression: Terminal) -> Any:
+        opcode = Opcode.CHAR if len(expression.value) == 1 else Opcode.STRING
+
+        self.__emit(opcode, self.__constant(expression.value))
+
+    def visit_nonterminal_expression(self, expression: NonTerminal) -> Any:
+        for e in expression.expressions:
+            self.__compile_expression(e)
+
+    def visit_variable_expression(self, expression: Variable) -> Any:
+        address = self.__emit(Opcode.CALL)
+
+        self.__calls.append((address, expression.name.lexeme))
+
+    def visit_or_expression(self, expression: Or) -> Any:
+        previous = self.__emit(Opcode.CHOICE)
+
+        for i, value in enumerate(expression.values):
+            if i > 0:
+                address = self.__emit(Opcode.RETRY)
+                self.__patch(previous, address)
+                previous = address
+
+            self.__compile_expression(value)
+            self.__emit(Opcode.COMMIT)
+
+        self.__patch(previous, self.__emit(Opcode.LONGEST))
+
+    def visit_assignment_expression(self, expression: Assignment) -> Any:
+        name = expression.name.lexeme
+        rule = self.__rules[name]
+
+        if name in self.__left_recursive:
+            self.__emit(Opcode.GUARD, rule)
+
+        self.__emit(Opcode.OPEN, rule)
+        self.__compile_expression(expression.expression)
+        self.__emit(Opcode.CLOSE)
+        self.__emit(Opcode.RETURN)
+
+    def visit_group_statement(self, expression: Group) -> Any:
+        self.__compile_expression(expression.expression)
+
+    def __compile_expression(self, expression: Expression):
+        """Compile the given `expression` with the right `Visitor` method
+
+        Args:
+            expression (Expression): An expression
+        """
+
+        expression.accept(self)
+
+    def compile(self, environment: Environment) -> Program:
+        """Compile every rule of the environment
+
+        Args:
+            environment (Environment): Variables environment
+
+        Returns:
+            Program: The program
+        """
+
+        grammar = GrammarBuilder().build(environment)
+
+        self.__code = []
+        self.__constants = {}
+        self.__calls = []
+        self.__rules = {name.lexeme: i for i, name in enumerate(environment)}
+        self.__left_recursive = {
+            grammar.names[rule] for rule in grammar.left_recursive()
+        }
+
+        # The start rule returns on this instruction
+        self.__emit(Opcode.END)
+
+        entries = {}
+
+        for name, expression in environment.items():
+            entries[name.lexeme] = len(self.__code)
+            self.__compile_expression(Assignment(name, expression))
+
+        for address, name in self.__calls:
+            self.__patch(address, entries[name])
+
+        return Program(
+            array("i", self.__code),
+            tuple(self.__constants),
+            tuple(self.__rules),
+            entries
+        )
+
+class VirtualMachine:
+    """Parsing machine running a `Program` in a single loop with an
+    explicit backtracking stack, rules calls dont create Python frames.
+    It produces the same kind of tree as `InputParser`.
+    """
+
+    def __init__(self, source: str, program: Program):
+        self.__source = source
+        self.__program = program
+
+        # Rule ids (open), -1 (close), matched terminals and the
+        # captures lists of the longest alternatives
+        self.__captures: List[Any] = []
+
+    def __run(self, entry: int) -> int: # pylint: disable=too-many-statements,too-many-branches
+        """Run the program from a rule address
+
+        Args:
+            entry (int): The rule address
+
+        Returns:
+            int: The matched prefix size, -1 if it doesnt match
+        """
+
+        code, constants = self.__program.code, self.__program.constants
+        source = self.__source
+        size = len(source)
+
+        # Every choice alternative has its own captures list
+        captures = self.__captures = []
+        # Left recursive rules running, (rule, position)
+        running = set()
+
+        # Call frames [return address, running key] and choice frames
+        # [next alternative, position, parent captures, best position, best captures]
+        stack: List[List[Any]] = [[0, None]]
+
+        pc, position = entry, 0
+
+        while True:
+            opcode, argument = code[pc], code[pc + 1]
+
+            if opcode == CHAR:
+                value = constants[argument]
+
+                if position < size and source[position] == value:
+                    captures.append(value)
+                    position += 1
+                    pc += 2
+                    continue
+            elif opcode == STRING:
+                value = constants[argument]
+
+                if source.startswith(value, position):
+                    captures.append(value)
+                    position += len(value)
+                    pc += 2
+                    continue
+            elif opcode == CALL:
+                stack.append([pc + 2, None])
+                pc = argument
+                continue
+            elif opcode == RETURN:
+                frame = stack.pop()
+                pc = frame[0]
+
+                if not frame[1] is None:
+                    running.discard(frame[1])
+
+                continue
+            elif opcode == OPEN:
+                captures.append(argument)
+                pc += 2
+                continue
+            elif opcode == CLOSE:
+                captures.append(-1)
+                pc += 2
+                continue
+            elif opcode == CHOICE:
+                stack.append([argument, position, captures, -1, None])
+                captures = []
+                pc += 2
+                continue
+            elif opcode == RETRY:
+                stack[-1][0] = argument
+                pc += 2
+                continue
+            elif opcode == COMMIT:
+                frame = stack[-1]
+
+                if position > frame[3]:
+                    frame[3] = position
+                    frame[4] = captures
+
+                captures = []
+                position = frame[1]
+                pc = frame[0]
+                continue
+            elif opcode == LONGEST:
+                frame = stack.pop()
+                captures = frame[2]
+
+                if frame[3] >= 0:
+                    position = frame[3]
+                    captures.append(frame[4])
+                    pc += 2
+                    continue
+            elif opcode == GUARD:
+                if not (argument, position) in running:
+                    stack[-1][1] = (argument, position)
+                    running.add(stack[-1][1])
+                    pc += 2
+                    continue
+            elif opcode == END:
+                return position
+
+            # Failure, backtracking to the last choice frame
+            frame = self.__backtrack(stack, running)
+
+            if frame is None:
+                return -1
+
+            pc, position = frame[0], frame[1]
+            captures = []
+
+    @staticmethod
+    def __backtrack(stack: List[List[Any]], running: Set[Tuple[int, int]]) -> List[Any] | None:
+        """Pop the call frames up to the last choice frame
+
+        Args:
+            stack (List[List[Any]]): The machine stack
+            running (Set[Tuple[int, int]]): The left recursive rules running
+
+        Returns:
+            List[Any] | None: The choice frame, None if there is none
+        """
+
+        while stack:
+            frame = stack[-1]
+
+            if len(frame) > 2:
+                return frame
+
+            stack.pop()
+
+            if not frame[1] is None:
+                running.discard(frame[1])
+
+        return None
+
+    def __iter_captures(self) -> Iterator[int | str]:
+        """Iterate over the captures, the alternatives lists are flattened
+
+        Yields:
+            int | str: A rule id (open), -1 (close) or a terminal
+        """
+
+        stack = [iter(self.__captures)]
+
+        while stack:
+            capture = next(stack[-1], None)
+
+            if capture is None:
+                stack.pop()
+            elif isinstance(capture, list):
+                stack.append(iter(capture))
+            else:
+                yield capture
+
+    def __build_tree(self) -> InputTree:
+        """Build the tree from the captures
+
+        Returns:
+            InputTree: The tree
+        """
+
+        names = self.__program.names
+
+        tree = InputTree()
+        node = tree.root
+
+        for capture in self.__iter_captures():
+            if isinstance(capture, str):
+                node.childrens.append(InputNode(Nodekind.VALUE, capture, node))
+            elif capture < 0:
+                node = node.parent
+            else:
+                child = InputNode(Nodekind.VARIABLE, names[capture], node)
+                node.childrens.append(child)
+                node = child
+
+        return tree
+
+    def __build_compact_tree(self) -> CompactTree:
+        """Build the compact tree from the captures
+
+        Returns:
+            CompactTree: The tree
+        """
+
+        constants = self.__program.constants
+        terminals = {value: ~i for i, value in enumerate(constants)}
+
+        tree = CompactTree(self.__source, self.__program.names, constants)
+        first_childs, next_siblings, ends = \
+            tree.first_childs, tree.next_siblings, tree.ends
+
+        position = 0
+        # Opened nodes, [index, last child]
+        stack = [[-1, -1]]
+
+        for capture in self.__iter_captures():
+            if isinstance(capture, int) and capture < 0:
+                index = stack.pop()[0]
+                ends[index] = position
+                continue
+
+            if isinstance(capture, str):
+                index = tree.add(terminals[capture], position, position + len(capture))
+                position += len(capture)
+            else:
+                index = tree.add(capture, position)
+
+            parent = stack[-1]
+
+            if parent[1] >= 0:
+                next_siblings[parent[1]] = index
+            elif parent[0] >= 0:
+                first_childs[parent[0]] = index
+
+            parent[1] = index
+
+            if isinstance(capture, int):
+                stack.append([index, -1])
+
+        return tree
+
+    def match_length(self, start: Variable) -> int:
+        """Return the size of the input prefix matching the grammar
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            int: The matched prefix size, -1 if it doesnt match
+        """
+
+        return self.__run(self.__program.entries[start.name.lexeme])
+
+    def parse_input(self, start: Variable) -> InputTree | None:
+        """Produce an AST based on the grammar rules
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            InputTree | None: Return None if it doest match, otherwise, it returns the tree
+        """
+
+        if self.match_length(start) != len(self.__source):
+            return None
+
+        return self.__build_tree()
+
+    def parse_compact(self, start: Variable) -> CompactTree | None:
+        """Same as `parse_input` but the tree is a `CompactTree`
+
+        Args:
+            start (Variable): Grammar entry point rule
+
+        Returns:
+            CompactTree | None: Return None if it doest match, otherwise, it returns the tree
+        """
+
+        if self.match_length(start) != len(self.__source):
+            return None
+
+        return self.__build_compact_tree()
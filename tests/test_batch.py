@@ -0,0 +1,96 @@
+"""test batch module"""
+
+import pickle
+import unittest
+
+from bnfparser import core, Engine
+
+from .test_input_parser import BNF_EXPRESSIONS, BNF_LL1, dump
+
+class TestBatch(unittest.TestCase):
+    """Controller for the batch parsing tests
+    """
+
+    def test_parse_many(self):
+        """Test parsing many inputs with the same parser
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+            sources = ok + ko
+
+            for memoize in (False, True):
+                batch = bnf.parse_many(iter(sources), memoize)
+                trees = list(batch)
+
+                self.assertEqual(batch.records, len(sources))
+                self.assertGreater(batch.throughput, 0)
+
+                for source, tree in zip(sources, trees):
+                    expected = bnf.parse_input(source, memoize)
+
+                    if expected is None:
+                        self.assertIsNone(tree)
+                    else:
+                        self.assertEqual(dump(tree.root), dump(expected.root))
+
+            self.assertEqual(
+                list(bnf.match_many(sources)),
+                [True] * len(ok) + [False] * len(ko)
+            )
+            self.assertEqual(
+                list(bnf.match_many(sources, engine=Engine.VM)),
+                [True] * len(ok) + [False] * len(ko)
+            )
+
+        bnf = core.parse(BNF_LL1[0])
+        batch = bnf.parse_many(["[1]", "[2]"], engine=Engine.LALR)
+
+        self.assertEqual([dump(tree.root) for tree in batch], [
+            dump(bnf.parse_input("[1]").root),
+            dump(bnf.parse_input("[2]").root)
+        ])
+
+    def test_pickled_bnf(self):
+        """Test parsing with an unpickled grammar
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+            bnf.parse_input(ok[0], engine=Engine.COMPILED)
+            unpickled = pickle.loads(pickle.dumps(bnf))
+
+            for engine in (Engine.BACKTRACKING, Engine.COMPILED, Engine.VM):
+                for source in ok:
+                    self.assertEqual(
+                        dump(unpickled.parse_input(source, engine=engine).root),
+                        dump(bnf.parse_input(source, engine=engine).root)
+                    )
+
+                for source in ko:
+                    self.assertIsNone(unpickled.parse_input(source, engine=engine))
+
+    def test_parse_many_workers(self):
+        """Test parsing many inputs in worker processes
+        """
+
+        expression, ok, ko = BNF_EXPRESSIONS[0]
+        bnf = core.parse(expression)
+        sources = (ok + ko) * 50
+        expected = [None if tree is None else dump(tree.root) for tree in bnf.parse_many(sources)]
+
+        batch = bnf.parse_many(iter(sources), workers=2)
+        trees = [None if tree is None else dump(tree.root) for tree in batch]
+
+        self.assertEqual(trees, expected)
+        self.assertEqual(batch.records, len(sources))
+
+        trees = bnf.parse_many(sources, True, workers=2, ordered=False)
+
+        self.assertCountEqual(
+            [None if tree is None else dump(tree.root) for tree in trees],
+            expected
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+"""test benchmarks module"""
+
+import random
+import unittest
+
+from bnfparser import core, Engine
+
+from benchmarks.corpus import CORPUS, synthetic_grammar, generate_keywords
+
+class TestBenchmarks(unittest.TestCase):
+    """Controller for the benchmark corpus tests
+    """
+
+    def test_corpus(self):
+        """Test that the generated inputs match their grammar
+        """
+
+        for corpus in CORPUS[:-1]:
+            bnf = core.parse(corpus.grammar)
+
+            for record in corpus.generate(100, random.Random(0)):
+                self.assertIsNotNone(bnf.parse_input(record, engine=Engine.EARLEY), corpus.name)
+
+    def test_synthetic(self):
+        """Test the synthetic grammar and its keywords
+        """
+
+        bnf = core.parse(synthetic_grammar(10))
+        records = generate_keywords(50, random.Random(0))
+
+        self.assertEqual(len(records), 1)
+        self.assertRegex(records[0], r"^(k\d+;)+$")
+        self.assertIsNotNone(bnf.parse_input("k0;k9;k3;", engine=Engine.EARLEY))
@@ -0,0 +1,100 @@
+"""test cache module"""
+
+import threading
+import unittest
+
+from bnfparser import core, error, grammar_cache, Engine
+from bnfparser.cache import GrammarCache, CacheStats
+
+from .test_input_parser import BNF_EXPRESSIONS, BNF_LL1
+
+class TestCache(unittest.TestCase):
+    """Controller for the grammars cache tests
+    """
+
+    def setUp(self):
+        self.addCleanup(grammar_cache.resize, grammar_cache.maxsize)
+        grammar_cache.clear()
+
+    def test_lru(self):
+        """Test the hits, misses and evictions
+        """
+
+        grammar_cache.resize(2)
+
+        first, second, third = (grammar for grammar, _, _ in BNF_EXPRESSIONS[:3])
+
+        core.parse(first)
+        core.parse(second)
+        core.parse(first)
+        # The second grammar is the least recently used
+        core.parse(third)
+        core.parse(first)
+        core.parse(second)
+
+        self.assertEqual(grammar_cache.stats(), CacheStats(2, 4, 2, 2, 2))
+
+        core.parse(first, cache=False)
+        grammar_cache.resize(1)
+
+        self.assertEqual(grammar_cache.stats(), CacheStats(2, 4, 3, 1, 1))
+
+        grammar_cache.clear()
+
+        self.assertEqual(grammar_cache.stats(), CacheStats(0, 0, 0, 0, 1))
+
+        grammar_cache.resize(0)
+        core.parse(first)
+
+        self.assertEqual(grammar_cache.stats(), CacheStats(0, 1, 0, 0, 0))
+
+        # A negative size is rejected, the cache is unchanged
+        self.assertRaises(ValueError, grammar_cache.resize, -1)
+        self.assertRaises(ValueError, GrammarCache, -1)
+        self.assertEqual(grammar_cache.maxsize, 0)
+
+    def test_shared(self):
+        """Test that the copies share the built members but not the start rule
+        """
+
+        grammar, valid, _ = BNF_LL1
+        bnf = core.parse(grammar)
+        other = core.parse(grammar)
+
+        self.assertIsNot(bnf, other)
+        self.assertIs(bnf.grammar, other.grammar)
+        self.assertIs(bnf.lalr_table, other.lalr_table)
+
+        other.set_start("<number>")
+
+        self.assertIsNotNone(bnf.parse_input(valid[0], engine=Engine.LL1))
+        self.assertIsNone(other.parse_input(valid[0], engine=Engine.LL1))
+        self.assertIsNotNone(core.parse(grammar).parse_input(valid[0], engine=Engine.LL1))
+
+        with self.assertRaises(error.LexerError):
+            core.parse('<a> ::= "a')
+
+    def test_threads(self):
+        """Test concurrent calls
+        """
+
+        cache = GrammarCache(4)
+        grammars = [grammar for grammar, _, _ in BNF_EXPRESSIONS] * 50
+        results = []
+
+        def worker():
+            for grammar in grammars:
+                results.append(cache.get(grammar, core.parse))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+
+        self.assertEqual(stats.hits + stats.misses, len(results))
+        self.assertEqual(stats.size, len(BNF_EXPRESSIONS))
@@ -0,0 +1,105 @@
+"""test codegen module"""
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from bnfparser import core, Engine
+
+BNF_EXPRESSIONS = (
+(
+'''
+<list> ::= ("[" <elements> "]") | "[" "]"
+<elements> ::= (<element> | <element> "," <elements>)
+<element> ::= <number> | <string> | <list>
+<number> ::= <digit> | <digit> <number>
+<string> ::= "\"" <characters> "\""
+<characters> ::= <character> | <character> <characters>
+<character> ::= <letter> | <digit> | <symbol>
+<letter> ::= "a" | "b" | "c" | "z" | "A" | "B" | "C" | "Z"
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+<symbol> ::= "!" | "@" | "#" | "$" | "%" | "^" | "&" | "*" | "(" | ")" | "-" | "_" | "=" | "+"
+''', (
+        '["1",[9,[["B&"]],[37]]]',
+        '[1,"bazazaazaz9","9Z-",5]',
+        '[]',
+    ), (
+        "[1,2,3,4,hello]",
+        "[1,2,3,4",
+    )
+),
+(
+'''
+<rule-name> ::= <letter> | <letter> <rule-chars>
+<rule-chars> ::= <rule-char> | <rule-char> <rule-chars>
+<rule-char> ::= <letter> | "-"
+<letter> ::= "a" | "b"
+''', (
+        "a",
+        "ab-a",
+    ), (
+        "a-c",
+        "-",
+    )
+),
+)
+
+def dump(node, depth=0):
+    """Flatten a tree to compare it"""
+
+    ret = [(depth, node.value)]
+
+    for children in node.childrens:
+        ret += dump(children, depth + 1)
+
+    return ret
+
+class TestCodegen(unittest.TestCase):
+    """Controller for the generated parsers tests
+    """
+
+    def test_expressions(self):
+        """Test the compiled parsers with and without packrat mode
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+
+            for memoize in (False, True):
+                for source in ok:
+                    tree = bnf.parse_input(source, memoize, Engine.COMPILED)
+
+                    self.assertIsNotNone(tree)
+
+                    # Same tree as the packrat backtracking engine
+                    self.assertEqual(
+                        dump(tree.root),
+                        dump(bnf.parse_input(source, True, Engine.BACKTRACKING).root)
+                    )
+
+                for source in ko:
+                    self.assertIsNone(bnf.parse_input(source, memoize, Engine.COMPILED))
+
+    def test_saved_module(self):
+        """Test importing a generated module from a file
+        """
+
+        bnf = core.parse(BNF_EXPRESSIONS[0][0])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "list_parser.py")
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(bnf.codegen())
+
+            spec = importlib.util.spec_from_file_location("list_parser", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+        self.assertEqual(module.match_length("[1,2]x"), 5)
+        self.assertIsNotNone(module.parse("[1,2]"))
+        self.assertIsNotNone(module.parse('"ab"', "<string>"))
+
+if __name__ == '__main__':
+    unittest.main()
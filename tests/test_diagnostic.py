@@ -0,0 +1,111 @@
+"""test diagnostic module"""
+
+import mmap
+import tempfile
+import unittest
+
+from bnfparser import core, Engine, ParseFailure
+from bnfparser.lexer import Lexer
+from bnfparser.parser import Parser
+from bnfparser.resolver import Resolver
+from bnfparser.grammar import GrammarBuilder
+from bnfparser.dispatch import DispatchBuilder
+from bnfparser.input.input_parser import InputParser
+from bnfparser.input.diagnostic import LineIndex
+
+from .test_input_parser import BNF_EXPRESSIONS, BNF_LL1, dump
+
+BNF_LINES = '''
+<lines> ::= <line> | <line> <EOL> <lines>
+<line> ::= "ab" | "ac" | "b"
+'''
+
+class TestDiagnostic(unittest.TestCase):
+    """Controller for the parse failures tests
+    """
+
+    def test_failure(self):
+        """Test the furthest failure of the backtracking engine
+        """
+
+        bnf = core.parse(BNF_LINES)
+        failure = bnf.parse_result("ab\nb\nad\nb", engine=Engine.BACKTRACKING)
+
+        self.assertIsInstance(failure, ParseFailure)
+        self.assertFalse(failure)
+        self.assertEqual((failure.offset, failure.line, failure.column), (5, 3, 1))
+        self.assertEqual(failure.expected, ("ab", "ac", "b"))
+        self.assertEqual(str(failure), "[line 3] Error at column 1: Expected 'ab', 'ac', 'b'")
+
+        # Only a prefix matched
+        failure = bnf.parse_result(b"ab\nbb", engine=Engine.BACKTRACKING)
+
+        self.assertEqual((failure.line, failure.column, failure.expected), (2, 2, ("", "\n")))
+        self.assertTrue(bnf.parse_result("ab\nac", engine=Engine.BACKTRACKING))
+
+    def test_dispatch(self):
+        """Test that the alternatives skipped by their first character are expected
+        """
+
+        for grammar, _, invalid in BNF_EXPRESSIONS:
+            expressions = Parser(Lexer(grammar).scan()).parse()
+            environment = Resolver().resolve(expressions)
+            dispatch = DispatchBuilder(GrammarBuilder().build(environment)).build(environment)
+
+            for input_source in invalid:
+                parser = InputParser(input_source, environment)
+                indexed_parser = InputParser(input_source, environment, dispatch=dispatch)
+
+                parser.parse_input(expressions[0])
+                indexed_parser.parse_input(expressions[0])
+
+                self.assertEqual(parser.failure, indexed_parser.failure)
+
+    def test_ll1(self):
+        """Test the failure of the predictive engine
+        """
+
+        grammar, valid, invalid = BNF_LL1
+        bnf = core.parse(grammar)
+
+        for input_source in valid:
+            self.assertEqual(
+                dump(bnf.parse_result(input_source).root),
+                dump(bnf.parse_input(input_source).root)
+            )
+
+        failures = [bnf.parse_result(input_source, engine=Engine.LL1) for input_source in invalid]
+
+        self.assertEqual([failure.offset for failure in failures], [3, 1, 2, 0])
+        self.assertIn("]", failures[1].expected)
+        self.assertIn("", failures[2].expected)
+
+        with self.assertRaises(core.CoreError):
+            bnf.parse_result("[1]", engine=Engine.EARLEY)
+
+    def test_line_index(self):
+        """Test the lines and columns
+        """
+
+        index = LineIndex("a\nbc\n\nd")
+
+        self.assertEqual(index.starts, [0, 2, 5, 6])
+        self.assertEqual(
+            [index.location(offset) for offset in range(8)],
+            [(1, 1), (1, 2), (2, 1), (2, 2), (2, 3), (3, 1), (4, 1), (4, 2)]
+        )
+        self.assertEqual(LineIndex(memoryview(b"a\nb")).location(2), (2, 1))
+
+        # A view on a part of its object, and the lines up to an offset
+        self.assertEqual(LineIndex(memoryview(b"a\nbc\nd")[2:]).starts, [0, 3])
+        self.assertEqual(LineIndex("a\nbc\n\nd", 5).starts, [0, 2, 5])
+
+        with tempfile.TemporaryFile() as f:
+            f.write(b"a\nbc\n\nd")
+            f.flush()
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    self.assertEqual(LineIndex(view).starts, index.starts)
+
+                self.assertEqual(LineIndex(mapped, 5).location(5), (3, 1))
@@ -0,0 +1,120 @@
+"""test events module"""
+
+import unittest
+
+from bnfparser import core, Engine, EventHandler, Budget
+from bnfparser.input.node import Nodekind
+
+from .test_input_parser import BNF_EXPRESSIONS, BNF_LEFT_RECURSIVE, BNF_LL1
+
+class Recorder(EventHandler):
+    """Records the received events"""
+
+    def __init__(self):
+        self.events = []
+
+    def on_enter(self, rule, position):
+        self.events.append(("enter", rule, position))
+
+    def on_exit(self, rule, start, end):
+        self.events.append(("exit", rule, start, end))
+
+    def on_terminal(self, value, start, end):
+        self.events.append(("terminal", value, start, end))
+
+def dump(node):
+    """Flatten a tree into the events it should produce"""
+
+    ret = []
+
+    for children in node.childrens:
+        if children.node_kind == Nodekind.VALUE:
+            ret.append(("terminal", children.value, children.start, children.end))
+        else:
+            ret.append(("enter", children.value, children.start))
+            ret += dump(children)
+            ret.append(("exit", children.value, children.start, children.end))
+
+    return ret
+
+class TestEvents(unittest.TestCase):
+    """Controller for the event callbacks tests
+    """
+
+    def assert_events(self, bnf, input_source, engine):
+        """Compare the events with the tree of the same engine"""
+
+        recorder = Recorder()
+        tree = bnf.parse_input(input_source, engine=engine)
+
+        self.assertEqual(bnf.parse_events(input_source, recorder, engine), tree is not None)
+
+        if tree is not None:
+            self.assertEqual(recorder.events, dump(tree.root))
+
+    def test_backtracking(self):
+        """Test that the backtracked alternatives send no event
+        """
+
+        for grammar, valid, invalid in BNF_EXPRESSIONS:
+            bnf = core.parse(grammar)
+
+            for input_source in valid + invalid:
+                self.assert_events(bnf, input_source, Engine.BACKTRACKING)
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE)
+
+        for input_source in ("1+2*3-4", "7", "1+"):
+            self.assert_events(bnf, input_source, Engine.BACKTRACKING)
+
+        # Byte offsets
+        bnf = core.parse('<s> ::= "é" <s> | "a"\n')
+        self.assert_events(bnf, "ééa".encode(), Engine.BACKTRACKING)
+
+    def test_ll1(self):
+        """Test the predictive engine events
+        """
+
+        grammar, valid, invalid = BNF_LL1
+        bnf = core.parse(grammar)
+
+        for input_source in valid + invalid:
+            self.assert_events(bnf, input_source, Engine.LL1)
+
+        recorder = Recorder()
+
+        self.assertTrue(bnf.parse_events("[1]", recorder))
+        self.assertEqual(recorder.events[0], ("enter", "<value>", 0))
+        self.assertEqual(recorder.events[-1], ("exit", "<value>", 0, 3))
+
+        with self.assertRaises(core.CoreError):
+            bnf.parse_events("[1]", recorder, Engine.LALR)
+
+    def test_streamed(self):
+        """Test that the backtracking engine sends the events before the
+        parse ends when a single alternative can match
+        """
+
+        # Not LL(1), the items share their first character
+        bnf = core.parse(
+            '<list> ::= "[" <items>\n'
+            '<items> ::= <item> <more>\n'
+            '<more> ::= "," <items> | "]"\n'
+            '<item> ::= "ab" | "ac"\n'
+        )
+        source = "[" + ",".join(["ab", "ac"] * 25) + "]"
+        budget = Budget()
+        steps = []
+
+        class Steps(Recorder):
+            """Records the parse steps when an item is sent"""
+
+            def on_exit(self, rule, start, end):
+                if rule == "<item>":
+                    steps.append(budget.steps)
+
+        self.assertTrue(bnf.parse_events(source, Steps(), Engine.BACKTRACKING, budget))
+        self.assertEqual(len(steps), 50)
+        # Sent along the parse, not when it ends
+        self.assertLess(steps[25], budget.steps * 3 // 4)
+        self.assert_events(bnf, source, Engine.BACKTRACKING)
@@ -0,0 +1,73 @@
+"""test forest module"""
+
+import math
+import unittest
+
+from bnfparser import core, Engine
+
+from .test_input_parser import BNF_EXPRESSIONS, BNF_LL1, dump
+
+BNF_AMBIGUOUS = '''
+<e> ::= <e> "+" <e> | <e> "*" <e> | <d>
+<d> ::= "1" | "2" | "3"
+'''
+
+class TestForest(unittest.TestCase):
+    """Controller for the shared packed parse forest tests
+    """
+
+    def test_ambiguous(self):
+        """Test the parses count and the lazy trees
+        """
+
+        bnf = core.parse(BNF_AMBIGUOUS)
+
+        # Catalan numbers, every way to group the operators
+        for input_source, count in (("1", 1), ("1+2*3", 2), ("1+2+3+1", 5), ("1+2*3+1+2", 14)):
+            forest = bnf.parse_forest(input_source)
+            trees = [dump(tree.root) for tree in forest.trees()]
+
+            self.assertEqual(forest.count(), count)
+            self.assertEqual(len(trees), count)
+            self.assertEqual(len(set(map(str, trees))), count)
+
+        forest = bnf.parse_forest("1+2*3")
+        tree = next(forest.trees())
+
+        self.assertEqual(tree.text(tree.root.childrens[0]), "1+2*3")
+        self.assertIsNone(bnf.parse_forest("1+"))
+
+        # Counted without building the 9694845 trees
+        self.assertEqual(bnf.parse_forest("1+2+3+1+2+3+1+2+3+1+2+3+1+2+3+1").count(), 9694845)
+
+    def test_unambiguous(self):
+        """Test that the single parse is the Earley engine tree
+        """
+
+        for grammar, valid, invalid in BNF_EXPRESSIONS + (BNF_LL1,):
+            bnf = core.parse(grammar)
+
+            for input_source in valid:
+                forest = bnf.parse_forest(input_source)
+                trees = list(forest.trees())
+
+                self.assertEqual(forest.count(), 1)
+                self.assertEqual(
+                    dump(trees[0].root),
+                    dump(bnf.parse_input(input_source, engine=Engine.EARLEY).root)
+                )
+
+            for input_source in invalid:
+                self.assertIsNone(bnf.parse_forest(input_source))
+
+    def test_cycle(self):
+        """Test a rule deriving itself
+        """
+
+        bnf = core.parse('<a> ::= <a> | "x" | <b>\n<b> ::= "" | <a>\n')
+        forest = bnf.parse_forest("x")
+
+        self.assertEqual(forest.count(), math.inf)
+        self.assertEqual([dump(tree.root) for tree in forest.trees()], [[
+            (0, ""), (1, "<a>"), (2, "x")
+        ]])
@@ -1,8 +1,20 @@
 """test input parser module"""
 
+import mmap
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
 
-from bnfparser import core
+from bnfparser import core, error, Engine, Budget
+from bnfparser.lexer import Lexer
+from bnfparser.parser import Parser
+from bnfparser.resolver import Resolver
+from bnfparser.grammar import GrammarBuilder
+from bnfparser.dispatch import DispatchBuilder
+from bnfparser.input.input_parser import InputParser
+from bnfparser.input.node import InputNode
 
 BNF_EXPRESSIONS = (
 (
@@ -73,7 +85,44 @@ BNF_EXPRESSIONS = (
 ),
 )
 
-class TestInputParser(unittest.TestCase):
+BNF_LEFT_RECURSIVE = '''
+<expr> ::= <expr> "+" <term> | <expr> "-" <term> | <term>
+<term> ::= <term> "*" <digit> | <digit>
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+'''
+
+BNF_LL1 = (
+'''
+<value> ::= <number> | <list>
+<list> ::= "[" <items> "]"
+<items> ::= "" | <value> <more>
+<more> ::= "" | "," <value> <more>
+<number> ::= <digit> <digits>
+<digits> ::= "" | <digit> <digits>
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+''', (
+        "[1,2,[0,12],[]]",
+        "1234",
+        "[]",
+    ), (
+        "[1,]",
+        "[",
+        "12a",
+        "",
+    )
+)
+
+def dump(node, depth=0):
+    """Flatten a tree to compare it"""
+
+    ret = [(depth, node.value)]
+
+    for children in node.childrens:
+        ret += dump(children, depth + 1)
+
+    return ret
+
+class TestInputParser(unittest.TestCase): # pylint: disable=too-many-public-methods
     """Controller for generated tree from inputs
     """
 
@@ -109,5 +158,428 @@ class TestInputParser(unittest.TestCase):
 
                 self.assertIsNone(bnf.parse_input(source))
 
+    def test_expressions_memoized(self):
+        """Test with expressions using the packrat mode
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+
+            for source in ok:
+                self.assertIsNotNone(bnf.parse_input(source, memoize=True))
+
+            for source in ko:
+                self.assertIsNone(bnf.parse_input(source, memoize=True))
+
+    def test_nested_memoized(self):
+        """Test a deeply nested input using the packrat mode
+        """
+
+        bnf = core.parse(BNF_EXPRESSIONS[1][0])
+        source = "[" * 10 + '1,"ab"' + "]" * 10
+
+        self.assertIsNotNone(bnf.parse_input(source, memoize=True))
+
+    def test_expressions_earley(self):
+        """Test with expressions using the Earley engine
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+
+            for source in ok:
+                self.assertIsNotNone(bnf.parse_input(source, engine=Engine.EARLEY))
+
+            for source in ko:
+                self.assertIsNone(bnf.parse_input(source, engine=Engine.EARLEY))
+
+    def test_left_recursive(self):
+        """Test the left recursive rules with the backtracking engine
+        """
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE)
+
+        for memoize in (False, True):
+            for source in ("1+2*3-4", "1", "2*3*4-5"):
+                self.assertEqual(
+                    dump(bnf.parse_input(source, memoize, Engine.BACKTRACKING).root),
+                    dump(bnf.parse_input(source, engine=Engine.EARLEY).root)
+                )
+
+            for source in ("1+", "+1", "12", ""):
+                self.assertIsNone(bnf.parse_input(source, memoize, Engine.BACKTRACKING))
+
+        self.assertEqual(bnf.match_length("1+2*3x"), 5)
+
+        # Deep trees without deep recursion
+        source = "+".join(["1*2-3"] * 2000)
+        tree = bnf.parse_input(source, engine=Engine.BACKTRACKING)
+
+        self.assertEqual(tree.root.childrens[0].end, len(source))
+
+        # Indirect left recursion
+        bnf = core.parse('<a> ::= <b> "x" | "y"\n<b> ::= <a> "z" | <a>\n')
+
+        for memoize in (False, True):
+            for source in ("y", "yx", "yzx", "yxzx"):
+                self.assertEqual(
+                    dump(bnf.parse_input(source, memoize, Engine.BACKTRACKING).root),
+                    dump(bnf.parse_input(source, engine=Engine.EARLEY).root)
+                )
+
+            self.assertIsNone(bnf.parse_input("yz", memoize, Engine.BACKTRACKING))
+
+        # The start rule is not nested twice
+        bnf = core.parse('<a> ::= <b>\n<b> ::= "x"\n').set_start("<b>")
+
+        self.assertEqual(dump(bnf.parse_input("x").root), [(0, ""), (1, "<b>"), (2, "x")])
+
+    def test_budget(self):
+        """Test aborting an exponential backtracking parse
+        """
+
+        bnf = core.parse('<s> ::= "a" <s> | "a" <s> "b" | ""\n')
+        source = "a" * 40
+
+        with self.assertRaises(error.ParseAbortedError) as context:
+            bnf.parse_input(source, budget=Budget(max_steps=1000))
+
+        self.assertEqual(context.exception.reason, "max_steps")
+        self.assertEqual(context.exception.steps, 1001)
+        self.assertGreater(context.exception.position, 0)
+
+        with self.assertRaises(error.ParseAbortedError) as context:
+            bnf.matches(source, budget=Budget(timeout=0.05))
+
+        self.assertEqual(context.exception.reason, "timeout")
+
+        budget = Budget()
+        budget.cancel()
+
+        self.assertRaises(error.ParseAbortedError, bnf.match_length, source, budget=budget)
+
+        # The budget is restarted by every parse
+        budget = Budget(max_steps=1000)
+
+        for _ in range(3):
+            self.assertIsNotNone(bnf.parse_input("aab", budget=budget))
+
+        self.assertRaises(
+            error.CoreError,
+            bnf.parse_input,
+            source,
+            engine=Engine.EARLEY,
+            budget=budget
+        )
+
+    def test_left_recursive_earley(self):
+        """Test a left recursive grammar using the Earley engine
+        """
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE)
+
+        tree = bnf.parse_input("1+2*3-4", engine=Engine.EARLEY)
+
+        self.assertIsNotNone(tree)
+
+        # (1+2*3)-4
+        expr = tree.root.childrens[0]
+        self.assertEqual(
+            [node.value for node in expr.childrens],
+            ["<expr>", "-", "<term>"]
+        )
+
+        self.assertIsNone(bnf.parse_input("1+", engine=Engine.EARLEY))
+
+    def test_ll1(self):
+        """Test a LL(1) grammar with the predictive engine
+        """
+
+        expression, ok, ko = BNF_LL1
+        bnf = core.parse(expression)
+
+        self.assertEqual(bnf.ll1_conflicts, [])
+
+        for source in ok:
+            self.assertIsNotNone(bnf.parse_input(source, engine=Engine.LL1))
+
+        for source in ko:
+            self.assertIsNone(bnf.parse_input(source, engine=Engine.LL1))
+
+    def test_ll1_conflicts(self):
+        """Test that a grammar that is not LL(1) reports its conflicts
+        """
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE)
+
+        self.assertNotEqual(bnf.ll1_conflicts, [])
+        self.assertRaises(error.CoreError, bnf.parse_input, "1+2", engine=Engine.LL1)
+
+        # Falling back on the backtracking engine
+        self.assertIsNotNone(bnf.parse_input("1"))
+
+    def test_left_recursive_compiled(self):
+        """Test that the compiled engines reject a left recursive grammar
+        """
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE)
+
+        for engine in (Engine.COMPILED, Engine.VM):
+            self.assertRaises(error.CoreError, bnf.parse_input, "1+2", engine=engine)
+            self.assertRaises(error.CoreError, bnf.matches, "1+2", engine=engine)
+
+    def test_lalr(self):
+        """Test with expressions using the LALR(1) engine
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS + (BNF_LL1,):
+            bnf = core.parse(expression)
+
+            self.assertEqual(bnf.lalr_conflicts, [])
+
+            for source in ok:
+                self.assertIsNotNone(bnf.parse_input(source, engine=Engine.LALR))
+
+            for source in ko:
+                self.assertIsNone(bnf.parse_input(source, engine=Engine.LALR))
+
+    def test_left_recursive_lalr(self):
+        """Test a long input on a left recursive grammar using the LALR(1) engine
+        """
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE)
+        source = "+".join(["1*2-3"] * 2000)
+
+        tree = bnf.parse_input(source, engine=Engine.LALR)
+
+        self.assertIsNotNone(tree)
+        self.assertEqual(tree.root.childrens[0].childrens[-1].value, "<term>")
+
+    def test_lalr_keywords(self):
+        """Test the LALR(1) tables of many terminals stay sparse
+        """
+
+        keywords = "".join(f'<k{i}> ::= "k{i};"\n' for i in range(2000))
+        alternatives = " | ".join(f"<k{i}>" for i in range(2000))
+        bnf = core.parse(
+            "<program> ::= <keyword> | <program> <keyword>\n"
+            f"<keyword> ::= {alternatives}\n{keywords}"
+        )
+
+        table = bnf.lalr_table
+
+        self.assertEqual(bnf.lalr_conflicts, [])
+        self.assertLess(sum(len(row) for row in table.actions), table.states * 4)
+        self.assertIsNotNone(bnf.parse_input("k12;k1999;k0;", engine=Engine.LALR))
+
+        for source in ("k12;k2000;", "k12;k1", ""):
+            with self.subTest(source=source):
+                self.assertIsNone(bnf.parse_input(source, engine=Engine.LALR))
+
+    def test_lalr_conflicts(self):
+        """Test that an ambiguous grammar reports its conflicts
+        """
+
+        bnf = core.parse('<e> ::= <e> "+" <e> | "1"\n')
+
+        self.assertEqual(
+            [conflict.kind for conflict in bnf.lalr_conflicts],
+            ["shift/reduce"]
+        )
+        self.assertRaises(error.CoreError, bnf.parse_input, "1+1", engine=Engine.LALR)
+
+    def test_matches(self):
+        """Test matching inputs without building the trees
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+
+            for engine in (Engine.AUTO, Engine.COMPILED, Engine.VM):
+                for source in ok:
+                    self.assertTrue(bnf.matches(source, engine=engine))
+
+                for source in ko:
+                    self.assertFalse(bnf.matches(source, engine=engine))
+
+            for source in ok:
+                self.assertTrue(bnf.matches(source, True))
+
+        # No node is allocated, even for the alternatives
+        bnf = core.parse(BNF_EXPRESSIONS[0][0])
+        init = InputNode.__init__
+
+        with mock.patch.object(InputNode, "__init__", autospec=True, side_effect=init) as spy:
+            self.assertTrue(bnf.matches(BNF_EXPRESSIONS[0][1][0], engine=Engine.BACKTRACKING))
+
+        # The root of the shared `NullTree`
+        self.assertEqual(spy.call_count, 1)
+
+        bnf = core.parse(BNF_LL1[0])
+
+        self.assertEqual(bnf.match_length("[1,2]]"), 5)
+        self.assertEqual(bnf.match_length("]"), -1)
+        self.assertRaises(error.CoreError, bnf.matches, "[1]", engine=Engine.LL1)
+
+    def test_spans(self):
+        """Test the nodes input offsets with every engine
+        """
+
+        bnf = core.parse(BNF_LL1[0])
+        source = "[12,[3]]"
+
+        for engine in (Engine.BACKTRACKING, Engine.EARLEY, Engine.LL1,
+                Engine.LALR, Engine.COMPILED, Engine.VM):
+            tree = bnf.parse_input(source, engine=engine)
+            value = tree.root.childrens[0]
+            items = value.childrens[0].childrens[1]
+
+            self.assertEqual((value.start, value.end), (0, len(source)))
+            self.assertEqual(tree.text(items), "12,[3]")
+            self.assertEqual(tree.text(items.childrens[0]), "12")
+
+    def test_same_trees(self):
+        """Test that every engine builds the backtracking engine tree,
+        the empty terminals included
+        """
+
+        bnf = core.parse(BNF_LL1[0])
+
+        for source in BNF_LL1[1]:
+            expected = bnf.parse_input(source, engine=Engine.BACKTRACKING)
+
+            self.assertIn("", [value for _, value in dump(expected.root)[1:]])
+
+            for engine in (Engine.EARLEY, Engine.LL1, Engine.LALR, Engine.COMPILED, Engine.VM):
+                tree = bnf.parse_input(source, engine=engine)
+
+                self.assertEqual(dump(tree.root), dump(expected.root))
+
+    def test_binary_inputs(self):
+        """Test bytes, bytearray, memoryview and mmap inputs
+        """
+
+        bnf = core.parse('<word> ::= <letter> | <letter> <word>\n<letter> ::= "a" | "é" | "\u20ac"\n')
+        source = "aé€a".encode()
+
+        with tempfile.TemporaryFile() as f:
+            f.write(source)
+            f.flush()
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for binary in (source, bytearray(source), memoryview(source), mapped):
+                    tree = bnf.parse_input(binary)
+
+                    self.assertIsNotNone(tree)
+                    self.assertEqual(tree.root.childrens[0].end, len(source))
+                    self.assertTrue(bnf.matches(binary))
+                    self.assertFalse(bnf.matches(binary[:-2]))
+
+                letter = tree.root.childrens[0].childrens[1].childrens[0].childrens[0]
+
+                self.assertEqual((letter.start, letter.end), (1, 3))
+                self.assertEqual(bytes(tree.text(letter)).decode(), "é")
+
+        self.assertRaises(error.CoreError, bnf.parse_input, source, engine=Engine.EARLEY)
+        self.assertRaises(error.CoreError, bnf.parse_compact, source)
+        self.assertRaises(error.CoreError, bnf.parse_forest, source)
+        self.assertRaises(error.CoreError, bnf.push_parser().feed, source)
+
+    def test_reparse(self):
+        """Test reparsing an edited input with the previous results
+        """
+
+        bnf = core.parse(BNF_LL1[0])
+        source = "[1,[2,3],45]"
+        tree = bnf.parse_input(source, True, Engine.BACKTRACKING)
+
+        edits = (
+            # Insertion, replacement, deletion then an invalid input
+            ("[1,[2,3],456]", (11, 11, 12)),
+            ("[1,[0,3],456]", (4, 5, 5)),
+            ("[1,[0],456]", (5, 7, 5)),
+            ("[1,[0],456", (10, 11, 10)),
+        )
+
+        for edited, edit in edits:
+            tree.edit(*edit)
+            new_tree = bnf.reparse(tree, edited)
+            expected = bnf.parse_input(edited, True, Engine.BACKTRACKING)
+
+            if expected is None:
+                self.assertIsNone(new_tree)
+                continue
+
+            self.assertEqual(dump(new_tree.root), dump(expected.root))
+            self.assertEqual(new_tree.text(new_tree.root.childrens[0]), edited)
+
+            tree = new_tree
+
+    def test_build_graph(self):
+        """Test the Graphviz export, graphviz is only imported by it
+        """
+
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, bnfparser; print('graphviz' in sys.modules)"],
+            capture_output=True,
+            check=True,
+            text=True
+        )
+
+        self.assertEqual(result.stdout.strip(), "False")
+
+        bnf = core.parse('<a> ::= "x" <b>\n<b> ::= "y" | "z"\n')
+
+        for engine in (Engine.AUTO, Engine.BACKTRACKING):
+            source = bnf.parse_input("xz", engine=engine).build_graph().source
+
+            self.assertEqual(source.count(" -- "), 3)
+            self.assertIn("label=z", source)
+
+        # Every tree edge, the `Or` alternatives are spliced from temporary trees
+        tree = core.parse(BNF_EXPRESSIONS[0][0]).parse_input(
+            BNF_EXPRESSIONS[0][1][0],
+            engine=Engine.BACKTRACKING
+        )
+        edges = len(dump(tree.root)) - 2
+
+        self.assertEqual(tree.build_graph().source.count(" -- "), edges)
+
+    def test_dispatch(self):
+        """Test that indexing the `Or` alternatives doesnt change the trees
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            expressions = Parser(Lexer(expression).scan()).parse()
+            environment = Resolver().resolve(expressions)
+            dispatch = DispatchBuilder(GrammarBuilder().build(environment))\
+                .build(environment)
+
+            for source in ok + ko:
+                tree = InputParser(source, environment).parse_input(expressions[0])
+                indexed_tree = InputParser(source, environment, dispatch=dispatch)\
+                    .parse_input(expressions[0])
+
+                self.assertEqual(tree is None, indexed_tree is None)
+
+                if tree is not None:
+                    self.assertEqual(dump(tree.root), dump(indexed_tree.root))
+
+    def test_dispatch_index(self):
+        """Test the alternatives of a character class rule
+        """
+
+        expressions = Parser(Lexer('<a> ::= "x" | <b> | "yz" | "y"\n<b> ::= "" | "x"\n').scan())\
+            .parse()
+        environment = Resolver().resolve(expressions)
+        dispatch = DispatchBuilder(GrammarBuilder().build(environment)).build(environment)
+
+        index = dispatch[id(expressions[0].expression)]
+        values = expressions[0].expression.values
+
+        self.assertEqual(index.alternatives("x"), (values[0], values[1]))
+        self.assertEqual(index.alternatives("y"), (values[1], values[2], values[3]))
+        self.assertEqual(index.alternatives(""), (values[1],))
+
 if __name__ == '__main__':
     unittest.main()
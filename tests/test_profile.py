@@ -0,0 +1,77 @@
+"""test profile module"""
+
+import unittest
+
+from bnfparser import core, Engine, Profile
+
+BNF_LEFT_RECURSIVE = '''
+<expr> ::= <expr> "+" <term> | <expr> "-" <term> | <term>
+<term> ::= <term> "*" <digit> | <digit>
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+'''
+
+class TestProfile(unittest.TestCase):
+    """Controller for the rules profiling tests
+    """
+
+    def test_report(self):
+        """Test the rules counters of the backtracking engine
+        """
+
+        bnf = core.parse(BNF_LEFT_RECURSIVE).set_profile(Profile())
+
+        self.assertIsNotNone(bnf.parse_input("1+2*3", engine=Engine.BACKTRACKING))
+
+        report = bnf.profile.report()
+        digit = report["<digit>"]
+
+        self.assertEqual(list(report)[0], "<expr>")
+        self.assertEqual(digit["invocations"], digit["matches"] + digit["failures"])
+        self.assertGreaterEqual(digit["matches"], 3)
+        self.assertEqual(digit["consumed"], digit["matches"])
+        self.assertEqual(digit["backtracked"], 0)
+        self.assertGreater(report["<expr>"]["backtracked"], 0)
+        self.assertGreater(report["<expr>"]["time"], report["<digit>"]["time"])
+
+        # The counters are accumulated
+        bnf.parse_input("1+2*3", engine=Engine.BACKTRACKING)
+
+        self.assertEqual(bnf.profile.report()["<digit>"]["matches"], 2 * digit["matches"])
+
+        table = bnf.profile.table().splitlines()
+
+        self.assertEqual(table[0].split()[:3], ["rule", "calls", "matches"])
+        self.assertEqual(len(table), 4)
+
+    def test_default_engine(self):
+        """Test that the default engine is profiled, even for a LL(1) grammar
+        """
+
+        bnf = core.parse('<list> ::= "[" <digits> "]"\n<digits> ::= "1" <digits> | ""\n')
+
+        self.assertEqual(bnf.ll1_conflicts, [])
+
+        bnf.set_profile(Profile())
+
+        self.assertIsNotNone(bnf.parse_input("[111]"))
+        self.assertEqual(bnf.profile.report()["<digits>"]["matches"], 4)
+
+    def test_disabled(self):
+        """Test that the other engines and the disabled profiling record nothing
+        """
+
+        profile = Profile()
+        bnf = core.parse(BNF_LEFT_RECURSIVE).set_profile(profile)
+
+        bnf.parse_input("1+2", engine=Engine.EARLEY)
+
+        self.assertEqual(profile.report(), {})
+
+        bnf.set_profile(None)
+        bnf.parse_input("1+2", engine=Engine.BACKTRACKING)
+
+        self.assertIsNone(bnf.profile)
+        self.assertEqual(profile.report(), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""test stream module"""
+
+import asyncio
+import io
+import subprocess
+import sys
+import unittest
+
+from bnfparser import core, error, Engine
+
+BNF_LOG = '''
+<log> ::= <log> <line> | <line>
+<line> ::= <word> ";"
+<word> ::= <letter> | <word> <letter>
+<letter> ::= "a" | "b" | "ab" | "abc"
+'''
+
+BNF_LIST = '''
+<list> ::= "[" <items> "]"
+<items> ::= <item> | <item> "," <items>
+<item> ::= "a" | <list>
+'''
+
+def dump(node, depth=0):
+    """Flatten a tree to compare it"""
+
+    ret = [(depth, node.value)]
+
+    for children in node.childrens:
+        ret += dump(children, depth + 1)
+
+    return ret
+
+class TestStream(unittest.TestCase):
+    """Controller for the push parser tests
+    """
+
+    def test_feed(self):
+        """Test the completed lines are emitted as soon as possible
+        """
+
+        bnf = core.parse(BNF_LOG)
+        parser = bnf.push_parser()
+
+        self.assertEqual(parser.feed("ab"), [])
+
+        lines = parser.feed("a;bab")
+
+        self.assertEqual([(n.start, n.end) for n in lines], [(0, 4)])
+        self.assertEqual(
+            dump(lines[0]),
+            dump(bnf.set_start("<line>").parse_input("aba;", engine=Engine.LALR).root.childrens[0])
+        )
+
+        # A line is reduced by default, without waiting for the next chunk
+        self.assertEqual([(n.start, n.end) for n in parser.feed("c;")], [(4, 9)])
+        self.assertEqual(parser.close(), [])
+        self.assertFalse(parser.failed)
+        self.assertEqual(parser.tree.root.end, 9)
+
+    def test_iterparse(self):
+        """Test parsing a file-like object by chunks
+        """
+
+        bnf = core.parse(BNF_LOG)
+        source = "ab;abca;b;" * 100
+        f = io.StringIO(source)
+
+        parser = bnf.push_parser(["<word>"])
+        words = list(parser.iterparse(iter(lambda: f.read(7), "")))
+
+        # "abca" is a word of two letters, its first letter is a word too
+        self.assertEqual(len(words), 400)
+        self.assertEqual([source[n.start:n.end] for n in words[:4]], ["ab", "abc", "abca", "b"])
+        self.assertIsNotNone(parser.tree)
+
+        parser = bnf.push_parser()
+
+        self.assertEqual(len(list(parser.iterparse(["ab;", "a"]))), 1)
+        self.assertIsNone(parser.tree)
+
+    def test_nested(self):
+        """Test the emitted rules nested in an emitted rule, with a right
+        recursive rule reduced at the end of its repetition
+        """
+
+        bnf = core.parse(BNF_LIST)
+        source = "[a,[a,a],a]"
+        items = bnf.parse_input(source, engine=Engine.LALR).root.childrens[0].childrens[1]
+
+        parser = bnf.push_parser()
+
+        # Reduced when the nested list is closed
+        self.assertEqual([(n.start, n.end) for n in parser.feed(source[:-1])], [(6, 7), (4, 7)])
+
+        nodes = parser.feed("]") + parser.close()
+
+        # The nested repetitions are complete, only the outermost one is replaced
+        self.assertEqual([(n.start, n.end) for n in nodes], [(9, 10), (3, 10), (1, 10)])
+        self.assertEqual(dump(nodes[-1]), dump(items))
+        self.assertEqual(parser.tree.root.childrens[0].childrens[1].childrens, [])
+
+        # The repeated rule is emitted as soon as it is reduced
+        parser = bnf.push_parser(["<item>"])
+
+        self.assertEqual([(n.start, n.end) for n in parser.feed("[a,[a,")], [(1, 2), (4, 5)])
+
+        nodes = parser.feed("a],a]")
+
+        self.assertEqual([(n.start, n.end) for n in nodes], [(6, 7), (3, 8), (9, 10)])
+        self.assertEqual(dump(nodes[1]), dump(items.childrens[2].childrens[0]))
+        self.assertEqual(parser.close(), [])
+
+    def test_errors(self):
+        """Test the mismatches and the invalid options
+        """
+
+        bnf = core.parse(BNF_LOG)
+        parser = bnf.push_parser()
+
+        parser.feed("ab;c")
+
+        self.assertTrue(parser.failed)
+        self.assertEqual(parser.close(), [])
+        self.assertIsNone(parser.tree)
+
+        self.assertRaises(error.CoreError, bnf.push_parser().feed, b"ab;")
+        self.assertRaises(error.CoreError, bnf.push_parser, ["<unknown>"])
+        self.assertRaises(error.CoreError, core.parse('<e> ::= <e> "+" <e> | "1"\n').push_parser)
+
+    def test_parse_stream(self):
+        """Test parsing the messages of an asyncio stream
+        """
+
+        bnf = core.parse(BNF_LOG).set_start("<line>")
+
+        async def parse(data, limit):
+            reader = asyncio.StreamReader(limit)
+            reader.feed_data(data)
+            reader.feed_eof()
+
+            return [tree async for tree in bnf.parse_stream(
+                reader, b"\r\n", Engine.LALR, max_pending=2
+            )]
+
+        data = b"ab;\r\nabc;\r\n\r\nbabbab;\r\na;\r\n\xff;"
+
+        for limit in (4, 2 ** 16):
+            trees = asyncio.run(parse(data, limit))
+
+            self.assertEqual(len(trees), 6)
+            self.assertIsNone(trees[2])
+            self.assertIsNone(trees[5])
+            self.assertEqual(
+                [dump(tree.root) for tree in trees if tree is not None],
+                [
+                    dump(bnf.parse_input(source, engine=Engine.LALR).root)
+                    for source in ("ab;", "abc;", "babbab;", "a;")
+                ]
+            )
+            self.assertEqual(trees[3].text(trees[3].root), "babbab;")
+
+    def test_lazy_imports(self):
+        """Test that asyncio and concurrent.futures are only imported by
+        the methods using them
+        """
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, bnfparser\n"
+                + "print('asyncio' in sys.modules, 'concurrent.futures' in sys.modules)"
+            ],
+            capture_output=True,
+            check=True,
+            text=True
+        )
+
+        self.assertEqual(result.stdout.strip(), "False False")
+
+if __name__ == '__main__':
+    unittest.main()
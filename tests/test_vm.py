@@ -0,0 +1,125 @@
+"""test vm module"""
+
+import pickle
+import unittest
+
+from bnfparser import core, error, Engine
+from bnfparser.vm import VirtualMachine
+from bnfparser.token import Token, TokenKind
+from bnfparser.expression import Variable
+
+BNF_EXPRESSIONS = (
+(
+'''
+<list> ::= ("[" <elements> "]") | "[" "]"
+<elements> ::= (<element> | <element> "," <elements>)
+<element> ::= <number> | <string> | <list>
+<number> ::= <digit> | <digit> <number>
+<string> ::= "\"" <characters> "\""
+<characters> ::= <character> | <character> <characters>
+<character> ::= <letter> | <digit> | <symbol>
+<letter> ::= "a" | "b" | "c" | "z" | "A" | "B" | "C" | "Z"
+<digit> ::= "0" | "1" | "2" | "3" | "4" | "5" | "6" | "7" | "8" | "9"
+<symbol> ::= "!" | "@" | "#" | "$" | "%" | "^" | "&" | "*" | "(" | ")" | "-" | "_" | "="
+''', (
+        '["1",[9,[["B&"]],[37]]]',
+        '[1,"bazazaazaz9","9Z-",5]',
+        '[]',
+    ), (
+        "[1,2,3,4,hello]",
+        "[1,2,3,4",
+    )
+),
+(
+'''
+<rule-name> ::= <letter> | <letter> <rule-chars>
+<rule-chars> ::= <rule-char> | <rule-char> <rule-chars>
+<rule-char> ::= <letter> | "-"
+<letter> ::= "a" | "b"
+''', (
+        "a",
+        "ab-a",
+    ), (
+        "a-c",
+        "-",
+    )
+),
+)
+
+def dump(node, depth=0):
+    """Flatten a tree to compare it"""
+
+    ret = [(depth, node.value)]
+
+    for children in node.childrens:
+        ret += dump(children, depth + 1)
+
+    return ret
+
+class TestVm(unittest.TestCase):
+    """Controller for the parsing machine tests
+    """
+
+    def test_expressions(self):
+        """Test the parsing machine against the backtracking engine
+        """
+
+        for expression, ok, ko in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+
+            for source in ok:
+                tree = bnf.parse_input(source, engine=Engine.VM)
+
+                self.assertIsNotNone(tree)
+                self.assertEqual(
+                    dump(tree.root),
+                    dump(bnf.parse_input(source, True, Engine.BACKTRACKING).root)
+                )
+
+            for source in ko:
+                self.assertIsNone(bnf.parse_input(source, engine=Engine.VM))
+
+    def test_compact_tree(self):
+        """Test the compact tree spans and its conversion
+        """
+
+        for expression, ok, _ in BNF_EXPRESSIONS:
+            bnf = core.parse(expression)
+
+            for source in ok:
+                tree = bnf.parse_compact(source)
+
+                self.assertEqual(tree.root.text, source)
+                self.assertEqual(
+                    dump(tree.to_input_tree().root),
+                    dump(bnf.parse_input(source, engine=Engine.VM).root)
+                )
+
+        bnf = core.parse(BNF_EXPRESSIONS[0][0])
+        tree = bnf.parse_compact('[12,"a"]')
+        number = tree.root.childrens[1].childrens[0].childrens[0]
+
+        self.assertEqual((number.value, number.start, number.end), ("<number>", 1, 3))
+        self.assertEqual([c.text for c in number.iter_childrens()], ["1", "2"])
+        self.assertIsNone(bnf.parse_compact("[12"))
+
+        # Rejected like with `parse_input`
+        bnf = core.parse('<sum> ::= <sum> "+" "1" | "1"\n')
+
+        self.assertRaises(error.CoreError, bnf.parse_compact, "1+1")
+
+    def test_pickled_program(self):
+        """Test running an unpickled program from another start rule
+        """
+
+        bnf = core.parse(BNF_EXPRESSIONS[0][0])
+        program = pickle.loads(pickle.dumps(bnf.program))
+        start = Variable(Token(TokenKind.IDENTIFIER, "<string>"))
+
+        self.assertEqual(program.code, bnf.program.code)
+        self.assertIn("<string>:", program.disassemble())
+        self.assertEqual(VirtualMachine('"ab"x', program).match_length(start), 4)
+        self.assertIsNotNone(VirtualMachine('"ab"', program).parse_input(start))
+
+if __name__ == '__main__':
+    unittest.main()